@@ -0,0 +1,88 @@
+"""Benchmark the PDF conversion tiers.
+
+Times ``convert_pdf`` for each tier over a corpus of PDFs and reports the
+median time per paper and the speedup of each tier relative to ``full``.
+
+Usage:
+    python benchmarks/bench_conversion.py [--corpus DIR] [--repeat N]
+
+Without ``--corpus`` a synthetic corpus of multi-page papers is generated in a
+temporary directory.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from arxiv_mcp_server.converters import TIERS, convert_pdf
+
+PARAGRAPH = (
+    "We study the convergence of stochastic optimisation methods in the "
+    "presence of heavy-tailed gradient noise and show that clipping restores "
+    "the optimal rate under mild assumptions on the objective. "
+) * 4
+
+
+def build_synthetic_corpus(directory: Path, papers: int, pages: int) -> list[Path]:
+    """Write ``papers`` PDFs of ``pages`` pages of headings and body text."""
+    import pymupdf
+
+    paths = []
+    for n in range(papers):
+        doc = pymupdf.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"{p + 1} Section {p + 1}", fontsize=16)
+            page.insert_textbox(
+                pymupdf.Rect(72, 90, 300, 760), PARAGRAPH * 2, fontsize=9
+            )
+            page.insert_textbox(
+                pymupdf.Rect(310, 90, 540, 760), PARAGRAPH * 2, fontsize=9
+            )
+        path = directory / f"paper-{n}.pdf"
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def bench(paths: list[Path], tier: str, repeat: int) -> float:
+    """Return the median seconds per paper for a tier."""
+    timings = []
+    for _ in range(repeat):
+        for path in paths:
+            started = time.perf_counter()
+            convert_pdf(path, tier)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of PDFs")
+    parser.add_argument("--papers", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.corpus:
+            paths = sorted(args.corpus.glob("*.pdf"))
+        else:
+            paths = build_synthetic_corpus(Path(tmpdir), args.papers, args.pages)
+
+        # Warm up imports so they are not charged to the first tier
+        for tier in TIERS:
+            convert_pdf(paths[0], tier)
+
+        results = {tier: bench(paths, tier, args.repeat) for tier in TIERS}
+
+    print(f"{len(paths)} papers, {args.repeat} repeats")
+    for tier, seconds in results.items():
+        speedup = results["full"] / seconds
+        print(f"{tier:>5}: {seconds * 1000:8.1f} ms/paper  ({speedup:.1f}x vs full)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark LaTeX-source conversion against PDF conversion.
+
+Times ``latex_to_markdown`` on each ``.tex`` file of a corpus and compares it
+with both PDF tiers on a PDF of the same length, rendered from the converted
+text with PyMuPDF (no TeX installation is needed to run the benchmark).
+
+Usage:
+    python benchmarks/bench_latex.py [--corpus DIR] [--repeat N]
+
+Without ``--corpus`` the fixtures in ``benchmarks/fixtures/latex`` are used.
+"""
+
+import argparse
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from arxiv_mcp_server.converters import TIERS, convert_pdf
+from arxiv_mcp_server.converters.latex import latex_to_markdown
+
+FIXTURES = Path(__file__).parent / "fixtures" / "latex"
+
+
+def render_pdf(text: str, path: Path) -> None:
+    """Lay ``text`` out as a two-column PDF of roughly paper length."""
+    import pymupdf
+
+    doc = pymupdf.open()
+    words = text.split()
+    per_column = 450
+    for start in range(0, len(words), per_column * 2):
+        page = doc.new_page()
+        for column, rect in enumerate(
+            (pymupdf.Rect(72, 72, 300, 760), pymupdf.Rect(310, 72, 540, 760))
+        ):
+            chunk = words[
+                start + column * per_column : start + (column + 1) * per_column
+            ]
+            page.insert_textbox(rect, " ".join(chunk), fontsize=9)
+    doc.save(path)
+
+
+def timed(fn, repeat: int) -> float:
+    """Return the median seconds of ``repeat`` calls to ``fn``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=FIXTURES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = sorted(args.corpus.glob("*.tex"))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for source in sources:
+            files = {source.name: source.read_text(encoding="utf-8")}
+            markdown = latex_to_markdown(files)
+            pdf_path = Path(tmpdir) / f"{source.stem}.pdf"
+            render_pdf(markdown, pdf_path)
+            for tier in TIERS:
+                convert_pdf(pdf_path, tier)  # warm up imports
+
+            results = {"latex": timed(lambda: latex_to_markdown(files), args.repeat)}
+            for tier in TIERS:
+                results[f"pdf-{tier}"] = timed(
+                    lambda: convert_pdf(pdf_path, tier), args.repeat
+                )
+
+            display = len(re.findall(r"^\$\$$", markdown, re.MULTILINE)) // 2
+            inline = len(re.findall(r"(?<!\$)\$[^$\n]+\$(?!\$)", markdown))
+            print(
+                f"{source.name}: {display} display / {inline} inline equations "
+                "kept as LaTeX"
+            )
+            for name, seconds in results.items():
+                speedup = results["pdf-full"] / seconds if seconds else float("inf")
+                print(f"  {name:<9} {seconds * 1000:9.1f} ms  {speedup:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
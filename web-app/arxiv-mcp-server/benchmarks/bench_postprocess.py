@@ -0,0 +1,134 @@
+"""Benchmark markdown post-processing.
+
+Converts each PDF of a corpus, post-processes the markdown and splits out its
+references, then reports per paper how many bytes that removed and how long a
+``read_paper`` style read (load the file and JSON-encode it) takes before and
+after.
+
+Usage:
+    python benchmarks/bench_postprocess.py [--corpus DIR] [--tier TIER]
+
+Without ``--corpus`` a synthetic corpus with running headers, page numbers,
+hyphenated line breaks and a long reference list is generated.
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from arxiv_mcp_server.converters import (
+    convert_pdf,
+    find_running_lines,
+    postprocess_markdown,
+    split_references_file,
+)
+
+SENTENCE = (
+    "We study the convergence of stochastic optimisation methods in the "
+    "presence of heavy-tailed gradient noise and show that gradient clipping "
+    "restores the optimal rate under mild assumptions on the objective."
+)
+
+
+def _hyphenated_lines(text: str, width: int) -> list[str]:
+    """Break text into lines of ``width`` characters, hyphenating long words."""
+    lines, line = [], ""
+    for word in text.split():
+        if len(line) + len(word) + 1 <= width:
+            line = f"{line} {word}".strip()
+        elif len(word) > 6 and len(line) + 5 <= width:
+            lines.append(f"{line} {word[:4]}-".strip())
+            line = word[4:]
+        else:
+            lines.append(line)
+            line = word
+    return lines + [line]
+
+
+def build_synthetic_corpus(directory: Path, papers: int, pages: int) -> list[Path]:
+    """Write ``papers`` PDFs of ``pages`` pages followed by references."""
+    import pymupdf
+
+    paths = []
+    body = _hyphenated_lines(" ".join([SENTENCE] * 40), 60)
+    references = [
+        f"[{n}] A. Author, B. Author and C. Author. A study of things, part {n}. "
+        f"In Proceedings of the Conference, pages {n}-{n + 9}, 2020."
+        for n in range(1, 61)
+    ]
+    for n in range(papers):
+        doc = pymupdf.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 40), "Preprint. Under review.", fontsize=8)
+            page.insert_text((72, 80), f"{p + 1} Section {p + 1}", fontsize=16)
+            for i, line in enumerate(body[:55]):
+                page.insert_text((72, 110 + i * 12), line, fontsize=9)
+            page.insert_text((300, 810), str(p + 1), fontsize=8)
+        for start in range(0, len(references), 30):
+            page = doc.new_page()
+            if start == 0:
+                page.insert_text((72, 80), "References", fontsize=16)
+            for i, ref in enumerate(references[start : start + 30]):
+                for j, line in enumerate(_hyphenated_lines(ref, 90)):
+                    page.insert_text((72, 110 + i * 22 + j * 10), line, fontsize=8)
+        path = directory / f"paper-{n}.pdf"
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def read_latency(path: Path, repeat: int) -> float:
+    """Return the median seconds to load and JSON-encode a stored paper."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.dumps({"content": path.read_text(encoding="utf-8")})
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of PDFs")
+    parser.add_argument("--tier", default="full")
+    parser.add_argument("--papers", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        if args.corpus:
+            paths = sorted(args.corpus.glob("*.pdf"))
+        else:
+            paths = build_synthetic_corpus(tmp, args.papers, args.pages)
+
+        print(f"{'paper':<20} {'raw':>9} {'cleaned':>9} {'split':>9} {'saved':>7}")
+        for path in paths:
+            raw = convert_pdf(path, args.tier)
+            raw_path = tmp / f"{path.stem}.raw.md"
+            raw_path.write_text(raw, encoding="utf-8")
+
+            cleaned = postprocess_markdown(raw, find_running_lines(path))
+            md_path = tmp / f"{path.stem}.md"
+            md_path.write_text(cleaned, encoding="utf-8")
+            cleaned_bytes = md_path.stat().st_size
+            stored_bytes, _ = split_references_file(md_path)
+
+            raw_bytes = raw_path.stat().st_size
+            saved = 1 - stored_bytes / raw_bytes
+            before = read_latency(raw_path, args.repeat) * 1e6
+            after = read_latency(md_path, args.repeat) * 1e6
+            print(
+                f"{path.stem:<20} {raw_bytes:>9} {cleaned_bytes:>9} "
+                f"{stored_bytes:>9} {saved:>6.1%}   "
+                f"read {before:.0f} -> {after:.0f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
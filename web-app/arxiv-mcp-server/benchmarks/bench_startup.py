@@ -0,0 +1,106 @@
+"""Benchmark the cold start of the stdio server.
+
+Starts the server in a fresh interpreter and times how long it takes to
+answer the client's ``initialize`` request, which is when a client can
+start using it. The same is timed with the heavy dependencies (the PDF
+converters, the arXiv API client and the HTTP client for downloads)
+imported up front, as the server used to, to show what loading them on
+first use saves.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_IMPORTS = "import pymupdf4llm, arxiv, aiohttp, aiofiles; "
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "bench", "version": "1"},
+    },
+}
+
+
+def time_to_ready(preload: str, storage: str) -> float:
+    """Start a server and return the seconds until it answered ``initialize``."""
+    code = f"{preload}import arxiv_mcp_server; arxiv_mcp_server.main()"
+    env = dict(
+        os.environ,
+        # Keep background work from competing with the startup
+        RECOVER_JOBS="false",
+        STORAGE_GC_INTERVAL="0",
+        STORAGE_INDEX_WATCH_INTERVAL="0",
+        FRESHNESS_CHECK_INTERVAL="0",
+    )
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-c", code, "--storage-path", storage],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+    try:
+        server.stdin.write(json.dumps(INITIALIZE) + "\n")
+        server.stdin.flush()
+        response = json.loads(server.stdout.readline())
+        elapsed = time.perf_counter() - started
+        assert response.get("id") == 1, response
+    finally:
+        server.stdin.close()
+        server.wait(timeout=30)
+    return elapsed
+
+
+def time_import(preload: str) -> float:
+    """Return the seconds a fresh interpreter takes to import the server."""
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"{preload}import arxiv_mcp_server.server; "
+        "print(time.perf_counter() - started)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as storage:
+        # Warm the OS file cache, so that every variant starts equally warm
+        time_to_ready(HEAVY_IMPORTS, storage)
+
+        print(f"{'imports':<10} {'import':>9} {'ready':>9}")
+        results = {}
+        for name, preload in (("eager", HEAVY_IMPORTS), ("lazy", "")):
+            imported = statistics.median(
+                time_import(preload) for _ in range(args.repeat)
+            )
+            ready = statistics.median(
+                time_to_ready(preload, storage) for _ in range(args.repeat)
+            )
+            results[name] = ready
+            print(f"{name:<10} {imported * 1000:>7.0f}ms {ready * 1000:>7.0f}ms")
+        print(f"ready {results['eager'] / results['lazy']:.2f}x faster when lazy")
+
+
+if __name__ == "__main__":
+    main()
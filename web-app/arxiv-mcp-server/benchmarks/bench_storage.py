@@ -0,0 +1,97 @@
+"""Benchmark compressed paper storage.
+
+Stores a corpus of converted papers plain and with each available codec, and
+reports the bytes on disk (what a cold read has to fetch from the device),
+the time to read a whole paper and the time to read its first 4 KiB.
+
+Usage:
+    python benchmarks/bench_storage.py [--corpus DIR] [--repeat N]
+
+``--corpus`` is a directory of markdown files, e.g. an existing paper store.
+Without it, papers of random text drawn from the vocabulary of the LaTeX
+fixture paper are generated, which compresses roughly like real prose.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from arxiv_mcp_server.storage import PaperStore, compression
+
+FIXTURE = Path(__file__).parent / "fixtures" / "latex" / "clipping.tex"
+
+
+def build_synthetic_corpus(papers: int, words: int) -> dict[str, bytes]:
+    """Generate ``papers`` markdown papers of ``words`` words each."""
+    vocabulary = sorted(set(re.findall(r"[A-Za-z]+", FIXTURE.read_text())))
+    rng = random.Random(0)
+    corpus = {}
+    for n in range(papers):
+        lines = []
+        for i in range(words // 100):
+            if i % 20 == 0:
+                lines.append(f"## {i // 20 + 1} {' '.join(rng.sample(vocabulary, 3))}")
+            sentence = rng.choices(
+                vocabulary, weights=range(len(vocabulary), 0, -1), k=100
+            )
+            lines.append(" ".join(sentence) + f" ({rng.randint(1, 99)}).")
+        corpus[f"2401.{n:05d}"] = "\n\n".join(lines).encode("utf-8")
+    return corpus
+
+
+def timed(fn, repeat: int) -> float:
+    """Return the median seconds of ``repeat`` calls to ``fn``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of markdown files")
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        if args.corpus:
+            papers = {p.stem: p.read_bytes() for p in args.corpus.glob("*.md")}
+        else:
+            papers = build_synthetic_corpus(args.papers, args.words)
+
+        print(f"{'codec':<6} {'on disk':>10} {'ratio':>6} {'read':>9} {'4 KiB':>9}")
+        for codec in (None,) + compression.available_codecs():
+            store = PaperStore(tmp / (codec or "plain"), codec)
+            for paper_id, data in papers.items():
+                store.path(paper_id).write_bytes(data)
+                store.finalize(paper_id)
+
+            disk = sum(store.disk_usage(paper_id) for paper_id in papers)
+            raw = sum(len(data) for data in papers.values())
+            full = timed(
+                lambda: [store.read_bytes(paper_id) for paper_id in papers],
+                args.repeat,
+            )
+            head = timed(
+                lambda: [
+                    store.read_range(paper_id, ".md", 0, 4096) for paper_id in papers
+                ],
+                args.repeat,
+            )
+            print(
+                f"{codec or 'none':<6} {disk:>10} {raw / disk:>5.1f}x "
+                f"{full / len(papers) * 1e3:>7.2f}ms {head / len(papers) * 1e3:>7.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,15 @@
 Arxiv MCP Server initialization
 """
 
-from . import server
 import asyncio
 
 
 def main():
     """Main entry point for the package."""
+    # Imported here, so that the conversion workers and the storage CLI,
+    # which live in this package too, start without the MCP server
+    from . import server
+
     asyncio.run(server.main())
 
 
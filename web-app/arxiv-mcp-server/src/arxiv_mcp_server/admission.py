@@ -0,0 +1,384 @@
+"""Admission control for tool calls.
+
+Each tool runs at most a configured number of calls at once. Calls beyond
+that wait in a bounded queue, and once the queue is full further calls
+are turned away at once with ``Busy``, which says when to retry. Work in
+progress therefore never piles up without limit: at saturation the server
+sheds load instead of slowing down for everyone.
+
+A network server has many clients, and one greedy client must not starve
+the others. Every call is therefore made on behalf of a client, named in
+``current_client``, and the queue is a weighted fair queue: each client
+is served in proportion to its weight, however many calls it queued. When
+the queue is full, a newcomer pushes out the newest call of the client
+holding the most places. Conversions, which run in the background after
+``download_paper`` returned, are queued in the same way, and clients may
+be given quotas of calls per time window. Usage is counted per client.
+
+Work that someone is waiting for right away, such as a paper read through
+its resource, is queued at a higher ``current_priority``: it is served
+before all work of lower priority, and fairly among its own.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from .config import get_settings
+
+settings = get_settings()
+
+# The client on whose behalf the current call runs. Background tasks
+# started by a call inherit it.
+current_client: ContextVar[str] = ContextVar("current_client", default="local")
+
+# Priority of the current call's queued work; higher is served first.
+# Background tasks started by a call inherit it.
+current_priority: ContextVar[int] = ContextVar("current_priority", default=0)
+
+# Priority of work a client is waiting for right away
+URGENT = 1
+
+# Name of the queue of background conversions
+CONVERSION = "conversion"
+
+# Weight of the latest call in the running mean of call durations
+_DURATION_WEIGHT = 0.2
+
+
+class Busy(Exception):
+    """A call was turned away because its tool's queue is full."""
+
+    status = "busy"
+
+    def __init__(self, tool: str, retry_after: int, reason: str = "is busy"):
+        super().__init__(f"{tool} {reason}, retry after {retry_after} seconds")
+        self.tool = tool
+        self.retry_after = retry_after
+
+
+class QuotaExceeded(Busy):
+    """A call was turned away because its client used up its quota."""
+
+    status = "quota_exceeded"
+
+    def __init__(self, tool: str, retry_after: int):
+        super().__init__(tool, retry_after, "quota exceeded")
+
+
+@dataclass
+class ClientUsage:
+    """What one client used of one tool."""
+
+    admitted: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+
+class ToolLimiter:
+    """Concurrency limit and weighted fair wait queue of one tool."""
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: float,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            name: The tool's name.
+            concurrency: How many calls may run at once.
+            queue_size: How many calls may wait for a slot.
+            weights: Share of each client, relative to the default of 1.
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.weights = weights or {}
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.mean_duration = 1.0
+        self.usage: Dict[str, ClientUsage] = defaultdict(ClientUsage)
+        # Waiters ordered by priority, then by virtual finish time
+        # (start-time fair queuing)
+        self._waiters: List[Tuple[int, float, int, str, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._virtual_time = 0.0
+        self._finish: Dict[str, float] = {}
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimate in whole seconds when a slot will be free for a new call."""
+        backlog = (self.waiting + 1) / self.concurrency
+        return max(1, math.ceil(backlog * self.mean_duration))
+
+    def _reject(self, client: str) -> Busy:
+        self.rejected += 1
+        self.usage[client].rejected += 1
+        return Busy(self.name, self.retry_after())
+
+    def _push_out(self, client: str) -> bool:
+        """Turn away the newest waiter of the client holding the most places.
+
+        Returns:
+            bool: True if a place was freed for ``client``.
+        """
+        if not self._waiters:
+            return False
+        queued: Dict[str, int] = defaultdict(int)
+        for _, _, _, waiter_client, _ in self._waiters:
+            queued[waiter_client] += 1
+        greedy = max(queued, key=queued.get)
+        if queued[greedy] <= queued.get(client, 0) + 1:
+            return False
+        # The least urgent of its calls, and of those the newest
+        newest = max(entry for entry in self._waiters if entry[3] == greedy)
+        self._waiters.remove(newest)
+        heapq.heapify(self._waiters)
+        newest[4].set_exception(self._reject(greedy))
+        return True
+
+    async def _acquire(self, client: str, priority: int = 0) -> None:
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+        if self.waiting >= self.queue_size and not self._push_out(client):
+            raise self._reject(client)
+        weight = self.weights.get(client, 1.0)
+        start = max(self._virtual_time, self._finish.get(client, 0.0))
+        self._finish[client] = finish = start + 1 / weight
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (-priority, finish, next(self._order), client, waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            else:
+                # Handed a slot just as the call was cancelled
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot to the waiter with the earliest finish time, if any
+        while self._waiters:
+            _, finish, _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Urgent work may have been served out of finish order
+                self._virtual_time = max(self._virtual_time, finish)
+                waiter.set_result(None)
+                return
+        self.active -= 1
+        if not self.active:
+            # Idle: forget the past, so that it earns no client credit
+            self._finish.clear()
+
+    @asynccontextmanager
+    async def slot(self, client: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold one of the tool's slots, waiting in the queue for it if needed.
+
+        Args:
+            client: The client the call is made for; defaults to
+                ``current_client``.
+
+        Raises:
+            Busy: If the queue is full.
+        """
+        client = client or current_client.get()
+        await self._acquire(client, current_priority.get())
+        self.admitted += 1
+        self.usage[client].admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - started
+            self.mean_duration += _DURATION_WEIGHT * (duration - self.mean_duration)
+            self.usage[client].seconds += duration
+            self._release()
+
+    def stats(self) -> Dict[str, float]:
+        """Get the limiter's state and counters."""
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_duration": round(self.mean_duration, 3),
+        }
+
+
+@dataclass
+class _Window:
+    """Calls of one client per tool in the current quota window."""
+
+    started: float
+    calls: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class AdmissionControl:
+    """The limiters of all tools, and the clients' quotas."""
+
+    def __init__(
+        self,
+        concurrency: int,
+        queue_size: int,
+        limits: Optional[Dict[str, int]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        quotas: Optional[Dict[str, int]] = None,
+        quota_window: float = 3600,
+        conversions: int = 0,
+    ):
+        """Initialize admission control.
+
+        Args:
+            concurrency: How many calls of each tool may run at once; 0
+                admits every call.
+            queue_size: How many calls of each tool may wait for a slot.
+            limits: Concurrency of individual tools, overriding
+                ``concurrency``; 0 admits every call of the tool.
+            weights: Share of each client, relative to the default of 1.
+            quotas: How many calls of each tool a client may make per
+                quota window.
+            quota_window: Length of the quota window, in seconds.
+            conversions: How many conversions may run at once; 0 runs
+                every conversion at once.
+        """
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.limits = limits or {}
+        self.weights = weights or {}
+        self.quotas = quotas or {}
+        self.quota_window = quota_window
+        self.limiters: Dict[str, ToolLimiter] = {}
+        self._windows: Dict[str, _Window] = {}
+        if conversions > 0:
+            # Conversions were admitted with their download call, so they
+            # are queued but never turned away
+            self.limiters[CONVERSION] = ToolLimiter(
+                CONVERSION, conversions, math.inf, self.weights
+            )
+
+    def limiter(self, tool: str) -> Optional[ToolLimiter]:
+        """Get a tool's limiter, or None if its calls are not limited."""
+        if tool not in self.limiters:
+            if tool == CONVERSION:
+                return None
+            concurrency = self.limits.get(tool, self.concurrency)
+            if concurrency <= 0:
+                return None
+            self.limiters[tool] = ToolLimiter(
+                tool, concurrency, self.queue_size, self.weights
+            )
+        return self.limiters[tool]
+
+    def _charge(self, tool: str, client: str) -> Optional[_Window]:
+        """Count a call against the client's quota.
+
+        Returns:
+            Optional[_Window]: The quota window charged, if the tool has a
+                quota.
+
+        Raises:
+            QuotaExceeded: If the client used up its quota of the tool.
+        """
+        quota = self.quotas.get(tool)
+        if not quota:
+            return None
+        now = time.monotonic()
+        window = self._windows.get(client)
+        if window is None or now - window.started >= self.quota_window:
+            window = self._windows[client] = _Window(now)
+        if window.calls[tool] >= quota:
+            limiter = self.limiter(tool)
+            if limiter:
+                limiter.usage[client].rejected += 1
+            raise QuotaExceeded(
+                tool, math.ceil(window.started + self.quota_window - now)
+            )
+        window.calls[tool] += 1
+        return window
+
+    def _refund(self, tool: str, client: str, window: Optional[_Window]) -> None:
+        """Give back the charge of a call that was never admitted."""
+        # A charge made in an earlier window has expired with it
+        if window is not None and self._windows.get(client) is window:
+            window.calls[tool] -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self, tool: str, client: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot of a tool for one call of a client.
+
+        Args:
+            tool: The tool called, or ``CONVERSION``.
+            client: The client the call is made for; defaults to
+                ``current_client``.
+
+        Only admitted calls count against the client's quota: the charge
+        of a call that is turned away, or cancelled while it waits, is
+        given back.
+
+        Raises:
+            QuotaExceeded: If the client used up its quota of the tool.
+            Busy: If the tool's queue is full.
+        """
+        client = client or current_client.get()
+        # Charged up front, so that waiting calls cannot overrun the quota
+        window = self._charge(tool, client)
+        limiter = self.limiter(tool)
+        if limiter is None:
+            yield
+            return
+        admitted = False
+        try:
+            async with limiter.slot(client):
+                admitted = True
+                yield
+        finally:
+            if not admitted:
+                self._refund(tool, client, window)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the state and counters of each tool's limiter."""
+        return {tool: limiter.stats() for tool, limiter in self.limiters.items()}
+
+    def client_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get what each client used of each tool, and of its quotas."""
+        clients: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for tool, limiter in self.limiters.items():
+            for client, usage in limiter.usage.items():
+                clients[client][tool] = asdict(usage)
+        for client, window in self._windows.items():
+            for tool, calls in window.calls.items():
+                clients[client].setdefault(tool, {})["quota_used"] = calls
+                clients[client][tool]["quota"] = self.quotas[tool]
+        return dict(clients)
+
+
+admission = AdmissionControl(
+    settings.TOOL_CONCURRENCY,
+    settings.TOOL_QUEUE_SIZE,
+    settings.TOOL_CONCURRENCY_LIMITS,
+    settings.CLIENT_WEIGHTS,
+    settings.CLIENT_QUOTAS,
+    settings.CLIENT_QUOTA_WINDOW,
+    settings.CONVERSION_CONCURRENCY,
+)
@@ -0,0 +1,166 @@
+"""Lookups in the arXiv catalog (the export API).
+
+arXiv asks API clients to leave a few seconds between requests. Every query
+made by this server goes through ``api_limiter``, which spaces requests out
+across threads and tasks, and lookups of many papers are batched into few
+queries.
+
+The ``arxiv`` client blocks, so it runs in threads. Its requests are
+bounded by ``REQUEST_TIMEOUT``, or by what is left of the deadline of the
+tool call they are made for, and batched lookups stop between batches
+once the call was given up.
+
+``arxiv`` and ``requests`` are imported on first use, as servers that
+never query the catalog need not load them.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from .config import get_settings
+from .deadlines import check_deadline, remaining
+from .identity import PaperId
+
+if TYPE_CHECKING:
+    import arxiv
+    import requests
+
+logger = logging.getLogger("arxiv-mcp-server")
+settings = get_settings()
+
+
+class RateLimiter:
+    """Spaces out calls at least ``interval`` seconds apart, process-wide."""
+
+    def __init__(self, interval: float):
+        """Initialize the limiter."""
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def _reserve(self) -> float:
+        """Reserve the next slot, returning how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+    def wait(self) -> None:
+        """Block until the next request may be made."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        """Wait, without blocking the event loop, until the next request."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+api_limiter = RateLimiter(settings.ARXIV_API_INTERVAL)
+
+
+def _timeout_session(timeout: float) -> "requests.Session":
+    """Create a session whose requests time out, within the current call's deadline."""
+    import requests
+
+    session = requests.Session()
+    request = session.request
+
+    def request_with_timeout(*args, **kwargs):
+        kwargs.setdefault("timeout", remaining(timeout))
+        return request(*args, **kwargs)
+
+    session.request = request_with_timeout
+    return session
+
+
+def arxiv_client(page_size: int = 100) -> "arxiv.Client":
+    """Create an arXiv API client whose requests time out."""
+    import arxiv
+
+    client = arxiv.Client(page_size=page_size)
+    # The client offers no timeout of its own
+    client._session = _timeout_session(settings.REQUEST_TIMEOUT)
+    return client
+
+
+def fetch_results(
+    paper_ids: Iterable[str], batch_size: Optional[int] = None
+) -> List["arxiv.Result"]:
+    """Fetch the catalog entries of papers, one rate-limited query per batch.
+
+    Args:
+        paper_ids: IDs of the papers, with or without version.
+        batch_size: IDs per query; defaults to ``BATCH_SIZE``.
+    """
+    import arxiv
+
+    paper_ids = list(paper_ids)
+    batch_size = batch_size or settings.BATCH_SIZE
+    client = arxiv_client(page_size=batch_size)
+    results = []
+    for start in range(0, len(paper_ids), batch_size):
+        batch = paper_ids[start : start + batch_size]
+        api_limiter.wait()
+        check_deadline()
+        search = arxiv.Search(id_list=batch, max_results=len(batch))
+        results += client.results(search)
+    return results
+
+
+def latest_versions(
+    bases: Iterable[str], batch_size: Optional[int] = None
+) -> Dict[str, PaperId]:
+    """Look up the latest version of papers.
+
+    Args:
+        bases: Base IDs (without version) of the papers.
+        batch_size: IDs per query; defaults to ``BATCH_SIZE``.
+
+    Returns:
+        Dict[str, PaperId]: The latest version of each paper found, by base ID.
+    """
+    return {
+        paper_id.base: paper_id
+        for paper_id, _ in latest_entries(bases, batch_size).values()
+    }
+
+
+def latest_entries(
+    bases: Iterable[str], batch_size: Optional[int] = None
+) -> Dict[str, tuple]:
+    """Look up the latest version of papers and when it was posted.
+
+    Returns:
+        Dict[str, tuple]: ``(PaperId, updated)`` of each paper found, by base
+        ID, where ``updated`` is the timezone-aware time of the latest
+        version.
+    """
+    entries = {}
+    for result in fetch_results(bases, batch_size):
+        paper_id = PaperId.parse(result.entry_id)
+        entries[paper_id.base] = (paper_id, result.updated)
+    return entries
+
+
+async def resolve_latest(paper_id: PaperId) -> PaperId:
+    """Pin a paper requested without version to its latest version.
+
+    Returns:
+        PaperId: The latest version, or ``paper_id`` unchanged if it has a
+        version already, is not an arXiv ID, or the catalog cannot be
+        reached.
+    """
+    if paper_id.version is not None or not paper_id.known:
+        return paper_id
+    try:
+        found = await asyncio.to_thread(latest_versions, [paper_id.base])
+    except Exception as e:
+        logger.warning(f"Could not look up the latest version of {paper_id}: {e}")
+        return paper_id
+    return found.get(paper_id.base, paper_id)
@@ -1,6 +1,7 @@
 """Configuration settings for the arXiv MCP server."""
 
 import sys
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 import logging
@@ -15,15 +16,64 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.3.1"
     MAX_RESULTS: int = 50
     BATCH_SIZE: int = 20
+    STREAM_BATCH_SIZE: int = 10
+    RESOURCE_PAGE_SIZE: int = 100
+    RESOURCE_READ_TIMEOUT: int = 120
     REQUEST_TIMEOUT: int = 60
+    TOOL_TIMEOUTS: dict[str, float] = {}
+    ARXIV_API_INTERVAL: float = 3.0
+    DOWNLOAD_RETRIES: int = 3
+    DOWNLOAD_WAIT_TIMEOUT: int = 300
+    TRANSPORT: str = "stdio"
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    TOOL_CONCURRENCY: int = 8
+    TOOL_CONCURRENCY_LIMITS: dict[str, int] = {}
+    TOOL_QUEUE_SIZE: int = 32
+    CLIENT_WEIGHTS: dict[str, float] = {}
+    CLIENT_QUOTAS: dict[str, int] = {}
+    CLIENT_QUOTA_WINDOW: int = 3600
+    CONVERSION_TIMEOUT: int = 300
+    CONVERSION_MEMORY_LIMIT_MB: int = 4096
+    CONVERSION_CONCURRENCY: int = 4
+    DEFAULT_CONVERSION_TIER: str = "full"
+    PREFER_LATEX_SOURCE: bool = False
+    POSTPROCESS_MARKDOWN: bool = True
+    SPLIT_REFERENCES: bool = False
+    STORAGE_COMPRESSION: str = "none"
+    STORAGE_LAYOUT: str = "yymm"
+    STORAGE_INDEX_WATCH_INTERVAL: int = 30
+    STORAGE_QUOTA_MB: int = 0
+    STORAGE_GC_INTERVAL: int = 3600
+    STORAGE_GC_GRACE_PERIOD: int = 3600
+    STORAGE_BACKEND: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    PEERS: str = ""
+    PEER_URL: str = ""
+    PEER_HOST: str = "0.0.0.0"
+    PEER_PORT: int = 0
+    PEER_TOKEN: str = ""
+    PEER_FANOUT: int = 2
+    PEER_TIMEOUT: float = 10.0
+    JOB_STATUS_TTL: int = 86400
+    RECOVER_JOBS: bool = True
+    FRESHNESS_CHECK_INTERVAL: int = 86400
+    FRESHNESS_BATCH_SIZE: int = 100
+    FRESHNESS_AUTO_REFRESH: bool = False
+    CONVERSION_CACHE: bool = True
+    CONVERSION_CACHE_PATH: Path | None = None
     model_config = SettingsConfigDict(extra="allow")
 
-    @property
+    @cached_property
     def STORAGE_PATH(self) -> Path:
         """Get the resolved storage path and ensure it exists.
 
+        Resolved once per settings object, from the command line or the
+        default location.
+
         Returns:
             Path: The absolute storage path.
         """
@@ -35,6 +85,22 @@ class Settings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    @cached_property
+    def CACHE_PATH(self) -> Path:
+        """Get the resolved conversion cache path and ensure it exists.
+
+        The cache lives outside the paper storage by default so that it
+        survives a wiped store; point it at a shared volume to share
+        conversions between machines.
+
+        Returns:
+            Path: The absolute conversion cache path.
+        """
+        path = self.CONVERSION_CACHE_PATH or Path.home() / ".arxiv-mcp-server" / "cache"
+        path = path.resolve()
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
     def _get_storage_path_from_args(self) -> Path | None:
         """Extract storage path from command line arguments.
 
@@ -70,3 +136,9 @@ class Settings(BaseSettings):
             logger.warning(f"Invalid storage path: {e}")
 
         return None
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Get the settings shared by all modules, read once from the environment."""
+    return Settings()
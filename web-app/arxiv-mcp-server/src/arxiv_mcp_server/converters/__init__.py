@@ -0,0 +1,35 @@
+"""Converters that turn downloaded papers into markdown."""
+
+from .pdf import TIERS, DEFAULT_TIER, PageCallback, convert_pdf, converter_version
+from .latex import (
+    LATEX_CONVERTER_VERSION,
+    SourceUnavailableError,
+    latex_source_to_markdown,
+)
+from .postprocess import (
+    POSTPROCESS_VERSION,
+    REFERENCES_SUFFIX,
+    find_running_lines,
+    find_title,
+    join_references,
+    postprocess_markdown,
+    split_references_file,
+)
+
+__all__ = [
+    "TIERS",
+    "DEFAULT_TIER",
+    "PageCallback",
+    "convert_pdf",
+    "converter_version",
+    "LATEX_CONVERTER_VERSION",
+    "SourceUnavailableError",
+    "latex_source_to_markdown",
+    "POSTPROCESS_VERSION",
+    "REFERENCES_SUFFIX",
+    "find_running_lines",
+    "find_title",
+    "join_references",
+    "postprocess_markdown",
+    "split_references_file",
+]
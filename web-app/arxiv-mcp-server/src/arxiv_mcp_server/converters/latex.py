@@ -0,0 +1,538 @@
+"""LaTeX source to markdown conversion.
+
+arXiv serves the TeX source of most papers as an "e-print": a gzipped tar
+archive, or a single gzipped ``.tex`` file. Converting the source is far
+cheaper than PDF layout analysis and keeps equations verbatim. Archives are
+read in memory; nothing is ever extracted to disk.
+"""
+
+import gzip
+import io
+import posixpath
+import re
+import tarfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Bump when the converter's output changes, to invalidate cached results
+LATEX_REVISION = 1
+LATEX_CONVERTER_VERSION = f"latex{LATEX_REVISION}"
+
+_SOURCE_SUFFIXES = (".tex", ".bbl", ".ltx")
+_MAX_INPUT_DEPTH = 10
+
+_DISPLAY_MATH_ENVS = {
+    "equation": None,
+    "displaymath": None,
+    "math": None,
+    "align": "aligned",
+    "flalign": "aligned",
+    "alignat": "aligned",
+    "eqnarray": "aligned",
+    "gather": "gathered",
+    "multline": None,
+}
+
+_HEADINGS = {
+    "part": "#",
+    "chapter": "##",
+    "section": "##",
+    "subsection": "###",
+    "subsubsection": "####",
+}
+
+_INLINE_STYLES = {
+    "textbf": "**",
+    "bf": "**",
+    "emph": "*",
+    "textit": "*",
+    "it": "*",
+    "textsl": "*",
+    "texttt": "`",
+}
+
+# Commands removed together with their two arguments
+_DROPPED_DEFINITIONS = {
+    "newcommand",
+    "renewcommand",
+    "providecommand",
+    "DeclareMathOperator",
+    "setlength",
+    "addtolength",
+}
+
+# Commands removed together with their argument
+_DROPPED_COMMANDS = {
+    "label",
+    "vspace",
+    "hspace",
+    "includegraphics",
+    "bibliographystyle",
+    "thanks",
+    "pagestyle",
+    "thispagestyle",
+    "addbibresource",
+    "usepackage",
+    "documentclass",
+    "graphicspath",
+    "acknowledgments",
+    "keywords",
+}
+
+_TEXT_REPLACEMENTS = (
+    ("``", '"'),
+    ("''", '"'),
+    ("\\&", "&"),
+    ("\\%", "%"),
+    ("\\_", "_"),
+    ("\\#", "#"),
+    ("\\$", "$"),
+    ("\\{", "{"),
+    ("\\}", "}"),
+    ("~", " "),
+)
+
+
+class SourceUnavailableError(ValueError):
+    """Raised when an e-print holds no usable TeX source."""
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def read_source_files(path: Path) -> Dict[str, str]:
+    """Read the TeX files of an e-print into memory.
+
+    Args:
+        path: The downloaded e-print (tar.gz, gzipped TeX or plain TeX).
+
+    Returns:
+        Dict[str, str]: Mapping of archive member name to file contents.
+
+    Raises:
+        SourceUnavailableError: If the e-print is a PDF or holds no TeX.
+    """
+    data = Path(path).read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    if data.startswith(b"%PDF"):
+        raise SourceUnavailableError("No TeX source available, e-print is a PDF")
+
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:") as tar:
+            files = {
+                posixpath.normpath(member.name): _decode(tar.extractfile(member).read())
+                for member in tar.getmembers()
+                if member.isfile() and member.name.lower().endswith(_SOURCE_SUFFIXES)
+            }
+    except tarfile.ReadError:
+        files = {"main.tex": _decode(data)}
+
+    if not any(name.endswith((".tex", ".ltx")) for name in files):
+        raise SourceUnavailableError("No TeX files found in e-print")
+    return files
+
+
+def _strip_comments(text: str) -> str:
+    """Remove TeX comments, dropping lines that held nothing else."""
+    lines = []
+    for line in text.splitlines():
+        stripped = re.sub(r"(?<!\\)%.*$", "", line)
+        if stripped.strip() or not line.strip():
+            lines.append(stripped.rstrip())
+    text = "\n".join(lines)
+    text = re.sub(r"\\begin\{comment\}.*?\\end\{comment\}", "", text, flags=re.S)
+    return re.sub(r"\\iffalse\b.*?\\fi\b", "", text, flags=re.S)
+
+
+def _find_main_file(files: Dict[str, str]) -> str:
+    """Pick the root TeX file of a source archive."""
+    candidates = [
+        name
+        for name, text in files.items()
+        if re.search(r"^\s*\\documentclass", _strip_comments(text), re.M)
+    ]
+    if not candidates:
+        candidates = [name for name in files if name.endswith((".tex", ".ltx"))]
+    candidates.sort(
+        key=lambda name: (
+            "\\begin{document}" not in files[name],
+            Path(name).stem not in ("main", "ms", "paper"),
+            -len(files[name]),
+        )
+    )
+    return candidates[0]
+
+
+def _expand_inputs(text: str, files: Dict[str, str], base: str, depth: int = 0) -> str:
+    """Inline ``\\input``/``\\include`` files found in the archive."""
+    if depth > _MAX_INPUT_DEPTH:
+        return text
+
+    def resolve(match: re.Match) -> str:
+        name = posixpath.normpath(posixpath.join(base, match.group(1).strip()))
+        for candidate in (name, name + ".tex"):
+            if candidate in files:
+                included = _strip_comments(files[candidate])
+                return _expand_inputs(included, files, base, depth + 1)
+        return ""
+
+    return re.sub(r"\\(?:input|include|subfile)\s*\{([^}]+)\}", resolve, text)
+
+
+def _read_group(text: str, start: int, open_char: str = "{") -> Tuple[str, int]:
+    """Read a balanced group starting at ``text[start]``.
+
+    Returns:
+        Tuple[str, int]: The group's contents and the index just past it.
+    """
+    close_char = "}" if open_char == "{" else "]"
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start + 1 : i], i + 1
+        i += 1
+    return text[start + 1 :], len(text)
+
+
+def _skip_spaces(text: str, i: int) -> int:
+    while i < len(text) and text[i] in " \t\n":
+        i += 1
+    return i
+
+
+def _replace_command(
+    text: str,
+    names: List[str],
+    render: Callable[[str, List[str]], str],
+    nargs: int = 1,
+) -> str:
+    """Replace ``\\name*[opt]{arg}...`` with ``render(name, args)``.
+
+    Arguments may contain nested groups. Commands given fewer brace groups
+    than ``nargs`` receive only the groups that are present.
+    """
+    pattern = re.compile(r"\\(" + "|".join(map(re.escape, names)) + r")\*?(?![A-Za-z])")
+    pos = 0
+    while True:
+        match = pattern.search(text, pos)
+        if not match:
+            return text
+        i = _skip_spaces(text, match.end())
+        while i < len(text) and text[i] == "[":
+            _, i = _read_group(text, i, "[")
+            i = _skip_spaces(text, i)
+        args = []
+        for _ in range(nargs):
+            j = _skip_spaces(text, i)
+            if j >= len(text) or text[j] != "{":
+                break
+            arg, i = _read_group(text, j)
+            args.append(arg)
+        replacement = render(match.group(1), args)
+        text = text[: match.start()] + replacement + text[i:]
+        pos = match.start()
+
+
+class _MathStore:
+    """Stash math away so that text rewriting never touches it."""
+
+    def __init__(self):
+        self.items: List[str] = []
+
+    def put(self, markdown: str) -> str:
+        self.items.append(markdown)
+        return f"\x00{len(self.items) - 1}\x00"
+
+    def restore(self, text: str) -> str:
+        return re.sub(r"\x00(\d+)\x00", lambda m: self.items[int(m.group(1))], text)
+
+
+def _protect_math(text: str, store: _MathStore) -> str:
+    """Replace display and inline math with placeholders."""
+
+    def display(body: str, wrapper: Optional[str] = None) -> str:
+        body = re.sub(r"\\(?:label|tag)\{[^}]*\}|\\nonumber|\\notag", "", body).strip()
+        if wrapper:
+            body = f"\\begin{{{wrapper}}}\n{body}\n\\end{{{wrapper}}}"
+        return "\n\n" + store.put(f"$$\n{body}\n$$") + "\n\n"
+
+    def environment(match: re.Match) -> str:
+        body = match.group(3)
+        if match.group(1) == "alignat":
+            _, end = _read_group(body, _skip_spaces(body, 0))
+            body = body[end:]
+        return display(body, _DISPLAY_MATH_ENVS[match.group(1)])
+
+    envs = "|".join(_DISPLAY_MATH_ENVS)
+    text = re.sub(
+        rf"\\begin\{{({envs})(\*?)\}}(.*?)\\end\{{\1\2\}}",
+        environment,
+        text,
+        flags=re.S,
+    )
+    text = re.sub(r"\\\[(.*?)\\\]", lambda m: display(m.group(1)), text, flags=re.S)
+    text = re.sub(r"\$\$(.*?)\$\$", lambda m: display(m.group(1)), text, flags=re.S)
+    text = re.sub(
+        r"\\\((.*?)\\\)",
+        lambda m: store.put(f"${m.group(1).strip()}$"),
+        text,
+        flags=re.S,
+    )
+    return re.sub(
+        r"(?<!\\)\$(.+?)(?<!\\)\$",
+        lambda m: store.put(f"${m.group(1).strip()}$"),
+        text,
+        flags=re.S,
+    )
+
+
+def _tabular_to_markdown(body: str) -> str:
+    """Render the body of a tabular environment as a markdown table."""
+    body = re.sub(
+        r"\\(?:hline|toprule|midrule|bottomrule|cline\{[^}]*\}|cmidrule(?:\([^)]*\))?\{[^}]*\})",
+        "",
+        body,
+    )
+    body = _replace_command(body, ["multicolumn"], lambda _, args: args[-1], nargs=3)
+    rows = [row.strip() for row in re.split(r"\\\\(?:\[[^\]]*\])?", body)]
+    cells = [
+        [" ".join(cell.split()) for cell in re.split(r"(?<!\\)&", row)]
+        for row in rows
+        if row
+    ]
+    if not cells:
+        return ""
+    width = max(len(row) for row in cells)
+    cells = [row + [""] * (width - len(row)) for row in cells]
+    lines = ["| " + " | ".join(cells[0]) + " |", "|" + " --- |" * width]
+    lines += ["| " + " | ".join(row) + " |" for row in cells[1:]]
+    return "\n\n" + "\n".join(lines) + "\n\n"
+
+
+def _convert_tabulars(text: str) -> str:
+    pattern = re.compile(r"\\begin\{(tabular\*?|tabularx)\}")
+    while match := pattern.search(text):
+        i = _skip_spaces(text, match.end())
+        if i < len(text) and text[i] == "[":
+            _, i = _read_group(text, i, "[")
+        for _ in range(2 if match.group(1) != "tabular" else 1):
+            _, i = _read_group(text, _skip_spaces(text, i))
+        end = text.find(f"\\end{{{match.group(1)}}}", i)
+        if end == -1:
+            end = len(text)
+        table = _tabular_to_markdown(text[i:end])
+        text = text[: match.start()] + table + text[end + len(match.group(1)) + 6 :]
+    return text
+
+
+def _caption(body: str) -> str:
+    captions = []
+    _replace_command(body, ["caption"], lambda _, args: captions.extend(args) or "")
+    return " ".join(" ".join(c.split()) for c in captions)
+
+
+def _convert_floats(text: str) -> str:
+    """Keep captions (and tables) of figure and table environments."""
+
+    def render(match: re.Match) -> str:
+        kind, body = match.group(1), match.group(3)
+        caption = _caption(body)
+        label = "Figure" if kind.startswith("figure") else "Table"
+        parts = [f"*{label}: {caption}*"] if caption else []
+        if label == "Table":
+            parts += re.findall(r"\n\n\|.*?\|\n\n", body, flags=re.S)
+        return "\n\n" + "\n\n".join(p.strip() for p in parts) + "\n\n"
+
+    return re.sub(
+        r"\\begin\{(figure|table|wrapfigure|wraptable)(\*?)\}(.*?)\\end\{\1\2\}",
+        render,
+        text,
+        flags=re.S,
+    )
+
+
+def _convert_lists(text: str) -> str:
+    tokens = re.split(
+        r"(\\begin\{(?:itemize|enumerate|description)\}"
+        r"|\\end\{(?:itemize|enumerate|description)\}"
+        r"|\\item\b(?:\s*\[[^\]]*\])?)",
+        text,
+    )
+    out: List[str] = []
+    stack: List[str] = []
+    for token in tokens:
+        begin = re.match(r"\\begin\{(\w+)\}", token)
+        if begin:
+            stack.append(begin.group(1))
+            out.append("\n")
+        elif token.startswith("\\end{"):
+            if stack:
+                stack.pop()
+            out.append("\n\n")
+        elif token.startswith("\\item") and stack:
+            indent = "  " * (len(stack) - 1)
+            marker = "1." if stack[-1] == "enumerate" else "-"
+            label = re.search(r"\[([^\]]*)\]", token)
+            label_text = f"**{label.group(1).strip()}** " if label else ""
+            out.append(f"\n{indent}{marker} {label_text}")
+        elif stack:
+            out.append(" ".join(token.split()))
+        else:
+            out.append(token)
+    return "".join(out)
+
+
+def _convert_bibliography(text: str, files: Dict[str, str]) -> str:
+    """Render thebibliography (inline or from a .bbl file) as a list."""
+    if "\\begin{thebibliography}" not in text:
+        bbl = next((t for n, t in files.items() if n.endswith(".bbl")), "")
+        text = re.sub(
+            r"\\(?:bibliography|printbibliography)\b(?:\{[^}]*\})?",
+            lambda _: _strip_comments(bbl),
+            text,
+        )
+
+    text = re.sub(r"\\begin\{thebibliography\}\{[^}]*\}", "\n\n## References\n\n", text)
+    text = text.replace("\\end{thebibliography}", "\n\n")
+    text = text.replace("\\newblock", " ")
+    return _replace_command(text, ["bibitem"], lambda _, args: f"\n- [{args[0]}] ")
+
+
+def _typeset_dashes(line: str) -> str:
+    """Turn TeX em and en dashes into their unicode characters."""
+    return line.replace("---", "\u2014").replace("--", "\u2013")
+
+
+def _title_block(document: str) -> str:
+    titles: List[str] = []
+    authors: List[str] = []
+    _replace_command(document, ["title"], lambda _, a: titles.extend(a) or "")
+    _replace_command(document, ["author"], lambda _, a: authors.extend(a) or "")
+    parts = []
+    if titles:
+        parts.append("# " + " ".join(titles[0].replace("\\\\", " ").split()))
+    if authors:
+        names = _replace_command(authors[0], ["thanks"], lambda *_: "")
+        names = re.sub(r"\\and\b|\\\\", ",", names)
+        names = ", ".join(n.strip() for n in names.split(",") if n.strip())
+        parts.append(names)
+    return "\n\n".join(parts)
+
+
+def latex_to_markdown(files: Dict[str, str]) -> str:
+    """Convert an in-memory TeX source tree to markdown.
+
+    Args:
+        files: Mapping of file name to contents, as returned by
+            ``read_source_files``.
+
+    Returns:
+        str: The paper as markdown, with math kept as ``$...$``/``$$...$$``.
+    """
+    main = _find_main_file(files)
+    text = _expand_inputs(_strip_comments(files[main]), files, posixpath.dirname(main))
+
+    header = _title_block(text)
+    body_match = re.search(
+        r"\\begin\{document\}(.*?)(?:\\end\{document\}|$)", text, re.S
+    )
+    body = body_match.group(1) if body_match else text
+    body = _replace_command(body, ["title", "author", "date"], lambda *_: "")
+
+    store = _MathStore()
+    body = _protect_math(body, store)
+    body = _convert_bibliography(body, files)
+    body = _convert_tabulars(body)
+    body = _convert_floats(body)
+    body = re.sub(r"\\begin\{abstract\}", "\n\n## Abstract\n\n", body)
+    body = _convert_lists(body)
+
+    body = _replace_command(
+        body,
+        list(_HEADINGS),
+        lambda name, args: (
+            f"\n\n{_HEADINGS[name]} {' '.join(''.join(args).split())}\n\n"
+            if args
+            else ""
+        ),
+    )
+    body = _replace_command(
+        body,
+        ["paragraph", "subparagraph"],
+        lambda _, args: (
+            f"\n\n**{' '.join(''.join(args).split())}** " if args else "\n\n"
+        ),
+    )
+    body = _replace_command(
+        body,
+        list(_INLINE_STYLES),
+        lambda name, args: (
+            f"{_INLINE_STYLES[name]}{''.join(args)}{_INLINE_STYLES[name]}"
+            if args
+            else ""
+        ),
+    )
+    body = _replace_command(
+        body,
+        ["cite", "citep", "citet", "citealp", "citeauthor", "parencite", "textcite"],
+        lambda _, args: f"[{', '.join(k.strip() for k in ''.join(args).split(','))}]",
+    )
+    body = _replace_command(body, ["eqref"], lambda _, args: f"({''.join(args)})")
+    body = _replace_command(
+        body,
+        ["ref", "autoref", "cref", "Cref", "pageref"],
+        lambda _, args: f"[{''.join(args)}]",
+    )
+    body = _replace_command(body, ["url"], lambda _, args: f"<{''.join(args)}>")
+    body = _replace_command(
+        body,
+        ["href"],
+        lambda _, args: f"[{args[1]}]({args[0]})" if len(args) == 2 else "",
+        nargs=2,
+    )
+    body = _replace_command(
+        body, ["footnote"], lambda _, args: f" ({''.join(args).strip()})"
+    )
+    body = _replace_command(body, sorted(_DROPPED_DEFINITIONS), lambda *_: "", nargs=2)
+    body = _replace_command(body, sorted(_DROPPED_COMMANDS), lambda *_: "")
+
+    # Whatever markup is left: drop environment markers and command names,
+    # keep their text, then undo TeX escapes
+    body = re.sub(r"\\(?:begin|end)\{[^}]*\}(?:\[[^\]]*\])?", "\n", body)
+    body = body.replace("\\\\", "\n")
+    body = re.sub(r"\\[A-Za-z]+\*?(?:\[[^\]]*\])?", "", body)
+    body = re.sub(r"(?<!\\)[{}]", "", body)
+    for old, new in _TEXT_REPLACEMENTS:
+        body = body.replace(old, new)
+    body = "\n".join(
+        line if line.startswith("|") else _typeset_dashes(line)
+        for line in body.split("\n")
+    )
+    body = re.sub(r"(?<=\S)[ \t]{2,}", " ", body)
+
+    markdown = store.restore("\n\n".join(p for p in (header, body) if p))
+    markdown = "\n".join(line.rstrip() for line in markdown.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", markdown).strip() + "\n"
+
+
+def latex_source_to_markdown(path: Path) -> str:
+    """Convert a downloaded e-print to markdown.
+
+    Raises:
+        SourceUnavailableError: If the e-print holds no usable TeX source.
+    """
+    return latex_to_markdown(read_source_files(path))
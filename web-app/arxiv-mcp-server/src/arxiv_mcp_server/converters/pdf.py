@@ -0,0 +1,178 @@
+"""PDF to markdown conversion tiers.
+
+``full`` runs pymupdf4llm's layout analysis and keeps tables and structure.
+``fast`` extracts raw text with PyMuPDF and only detects headings from font
+sizes, which is enough to skim or search a paper at a fraction of the cost.
+Both import their PDF libraries lazily so that importing this module is cheap.
+"""
+
+from collections import Counter
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+TIERS = ("fast", "full")
+DEFAULT_TIER = "full"
+
+# Called with the number of pages converted and the number of pages in all
+PageCallback = Callable[[int, int], None]
+
+# Bump when the fast converter's output changes, to invalidate cached results
+FAST_REVISION = 1
+
+# Font size ratios (relative to body text) for heading levels in the fast tier
+_HEADING_RATIOS = ((1.6, "#"), (1.35, "##"), (1.15, "###"))
+_MAX_HEADING_CHARS = 120
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def converter_version(tier: str = DEFAULT_TIER) -> str:
+    """Identify the converter that produces a tier's output.
+
+    Args:
+        tier: The conversion tier.
+
+    Returns:
+        str: A version string that changes whenever the tier's output may.
+    """
+    if tier == "fast":
+        return f"fast{FAST_REVISION}-pymupdf-{_package_version('pymupdf')}"
+    return f"pymupdf4llm-{_package_version('pymupdf4llm')}"
+
+
+def _open_pdf(pdf_path: Path):
+    try:
+        import pymupdf
+    except ImportError:  # PyMuPDF < 1.24 only ships the legacy module name
+        import fitz as pymupdf
+    return pymupdf, pymupdf.open(pdf_path)
+
+
+def _block_text(block: Dict) -> str:
+    """Join a text block's lines, undoing hyphenation at line ends."""
+    text = ""
+    for line in block.get("lines", []):
+        line_text = "".join(span["text"] for span in line["spans"]).strip()
+        if not line_text:
+            continue
+        if text.endswith("-") and line_text[:1].islower():
+            text = text[:-1] + line_text
+        elif text:
+            text += " " + line_text
+        else:
+            text = line_text
+    return text
+
+
+def _block_style(block: Dict) -> Tuple[float, bool]:
+    """Return a block's largest font size and whether it is entirely bold."""
+    spans = [
+        span
+        for line in block.get("lines", [])
+        for span in line["spans"]
+        if span["text"].strip()
+    ]
+    if not spans:
+        return 0.0, False
+    return max(span["size"] for span in spans), all(
+        span["flags"] & 16 for span in spans
+    )
+
+
+def _body_font_size(pages: List[List[Dict]]) -> float:
+    """Find the font size used by most characters, i.e. the body text."""
+    sizes: Counter = Counter()
+    for blocks in pages:
+        for block in blocks:
+            for line in block.get("lines", []):
+                for span in line["spans"]:
+                    sizes[round(span["size"], 1)] += len(span["text"])
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def _heading_prefix(size: float, bold: bool, body_size: float, text: str) -> str:
+    """Return the markdown heading prefix for a block, or "" for body text."""
+    if not body_size or len(text) > _MAX_HEADING_CHARS:
+        return ""
+    for ratio, prefix in _HEADING_RATIOS:
+        if size >= body_size * ratio:
+            return prefix
+    if bold and len(text) <= _MAX_HEADING_CHARS // 2:
+        return "###"
+    return ""
+
+
+def to_markdown_fast(pdf_path: Path, on_page: Optional[PageCallback] = None) -> str:
+    """Extract a paper's text with light heading detection.
+
+    Images and tables are skipped entirely; each text block becomes a
+    paragraph, and short blocks set in a larger or bold font become headings.
+    ``on_page`` is called after each page.
+    """
+    pymupdf, doc = _open_pdf(pdf_path)
+    with doc:
+        pages = []
+        for page in doc:
+            pages.append(page.get_text("dict", flags=pymupdf.TEXTFLAGS_TEXT)["blocks"])
+            if on_page:
+                on_page(len(pages), doc.page_count)
+
+    body_size = _body_font_size(pages)
+    parts = []
+    for blocks in pages:
+        for block in blocks:
+            text = _block_text(block)
+            if not text:
+                continue
+            size, bold = _block_style(block)
+            prefix = _heading_prefix(size, bold, body_size, text)
+            parts.append(f"{prefix} {text}" if prefix else text)
+    return "\n\n".join(parts) + "\n"
+
+
+def to_markdown_full(pdf_path: Path, on_page: Optional[PageCallback] = None) -> str:
+    """Convert a paper with pymupdf4llm's full layout analysis.
+
+    The layout analysis runs over the whole document at once, so
+    ``on_page`` is only called before it starts and after it finished.
+    """
+    import pymupdf4llm
+
+    if on_page:
+        _, doc = _open_pdf(pdf_path)
+        with doc:
+            page_count = doc.page_count
+        on_page(0, page_count)
+    markdown = pymupdf4llm.to_markdown(pdf_path, show_progress=False)
+    if on_page:
+        on_page(page_count, page_count)
+    return markdown
+
+
+def convert_pdf(
+    pdf_path: Path,
+    tier: str = DEFAULT_TIER,
+    on_page: Optional[PageCallback] = None,
+) -> str:
+    """Convert a PDF to markdown using the given tier.
+
+    Args:
+        pdf_path: The PDF to convert.
+        tier: The conversion tier, one of ``TIERS``.
+        on_page: Called with the number of pages converted so far and
+            the number of pages in all.
+
+    Raises:
+        ValueError: If ``tier`` is not one of ``TIERS``.
+    """
+    if tier == "fast":
+        return to_markdown_fast(pdf_path, on_page)
+    if tier == "full":
+        return to_markdown_full(pdf_path, on_page)
+    raise ValueError(f"Unknown conversion tier: {tier}")
@@ -0,0 +1,303 @@
+"""Post-processing of converted markdown.
+
+PDF conversions carry a lot of layout debris into the markdown: running
+headers and footers, page numbers and words hyphenated across line breaks.
+All of it is sent to the model on every read, so it is stripped once after
+conversion. The references section, often a fifth of a paper, can also be
+split into its own file and only served on request.
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+from .pdf import _open_pdf
+
+# Bump when the post-processed output changes, to invalidate cached results
+POSTPROCESS_VERSION = "pp2"
+
+# Stored next to ``<paper_id>.md`` when references are split out
+REFERENCES_SUFFIX = ".references.md"
+
+# Replaces the references section in the stored paper once it is split out
+REFERENCES_NOTE = (
+    "*References are stored separately; call read_paper with "
+    "include_references=true to read them.*"
+)
+
+# Share of the page height, at the top and at the bottom, searched for
+# running headers and footers
+_MARGIN = 0.1
+
+# Share of pages a margin line must appear on to count as running
+_MIN_PAGE_SHARE = 0.4
+_MIN_PAGES = 3
+
+_MAX_RUNNING_CHARS = 120
+
+# Keys of lines of nothing but numbers, such as page numbers
+_NUMBERS_ONLY = re.compile(r"[^a-z]*#[^a-z]*")
+
+# Pages in a row that may go without a page number, e.g. full-page figures
+_MAX_PAGE_SKIP = 3
+
+# "hetero-\ngeneous", but not suspended hyphens such as "pre-\nand post-"
+_HYPHENATED = re.compile(r"\b([A-Za-z]{2,})-\n(?!(?:and|or|nor|to|vs)\b)([a-z]{2,})")
+
+# First parts of compounds that keep their hyphen when split across lines
+_COMPOUND_PREFIXES = {
+    "co",
+    "cross",
+    "end",
+    "high",
+    "long",
+    "low",
+    "multi",
+    "non",
+    "post",
+    "pre",
+    "real",
+    "self",
+    "semi",
+    "state",
+    "well",
+}
+
+# Code and math, which are never dehyphenated: fenced blocks (to the end
+# of the paper if unclosed), code spans, and display and inline math; spans
+# may wrap, but not across paragraphs
+_VERBATIM = re.compile(
+    r"^(`{3,}|~{3,})[^\n]*\n.*?(?:^\1[ \t]*$|\Z)"
+    r"|`(?:[^`\n]|\n(?!\n))+`"
+    r"|\$\$.+?\$\$"
+    r"|\$(?:[^$\n]|\n(?!\n))+\$",
+    re.MULTILINE | re.DOTALL,
+)
+
+_REFERENCES_HEADING = re.compile(
+    r"^(?P<marks>#{1,6})?[ \t]*(?:\*\*|__)?[ \t]*(?:[0-9IVX]+\.?[ \t]+)?"
+    r"(?:references|bibliography|literature cited|works cited)"
+    r"[ \t]*(?:\*\*|__)?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADING = re.compile(r"^(#{1,6})\s", re.MULTILINE)
+
+# A paper's title is its first heading, within its first lines
+_TITLE_LINES = 40
+_MAX_TITLE_CHARS = 300
+
+
+def line_key(text: str) -> str:
+    """Normalize a line so that repeats of a running header compare equal.
+
+    Markdown decoration and case are ignored and digits are folded, so that
+    "Page 3 of 12" and "**Page 4 of 12**" share a key.
+    """
+    text = re.sub(r"[*_#`>]", "", text).strip().lower()
+    text = re.sub(r"\d+", "#", text)
+    return re.sub(r"\s+", " ", text)
+
+
+def find_running_lines(pdf_path: Path) -> Dict[str, int]:
+    """Find the running headers, footers and page numbers of a PDF.
+
+    A line counts as running when it sits in the top or bottom margin of at
+    least ``_MIN_PAGE_SHARE`` of the pages, compared by ``line_key``.
+
+    Returns:
+        Dict[str, int]: The number of pages each running line is on, by
+        key; empty for very short documents.
+    """
+    pymupdf, doc = _open_pdf(pdf_path)
+    counts: Counter = Counter()
+    with doc:
+        pages = len(doc)
+        for page in doc:
+            top = page.rect.height * _MARGIN
+            bottom = page.rect.height * (1 - _MARGIN)
+            keys = set()
+            for block in page.get_text("dict", flags=pymupdf.TEXTFLAGS_TEXT)["blocks"]:
+                for line in block.get("lines", []):
+                    _, y0, _, y1 = line["bbox"]
+                    if top < y1 and y0 < bottom:
+                        continue
+                    text = "".join(span["text"] for span in line["spans"])
+                    key = line_key(text)
+                    if key and len(key) <= _MAX_RUNNING_CHARS:
+                        keys.add(key)
+            counts.update(keys)
+
+    if pages < _MIN_PAGES:
+        return {}
+    threshold = max(2, pages * _MIN_PAGE_SHARE)
+    return {key: count for key, count in counts.items() if count >= threshold}
+
+
+def strip_running_lines(markdown: str, running: Mapping[str, int]) -> str:
+    """Drop the running headers, footers and page numbers of a paper.
+
+    Each running line is dropped at most as often as it ran in the PDF's
+    margins, and headings and table rows are always kept, so that a running
+    header repeating the paper's title does not take the title with it.
+    Lines of nothing but numbers are only taken for page numbers where they
+    count up page by page, as page numbers between pages do; other numbers
+    in the body are kept.
+
+    Args:
+        markdown: The converted paper.
+        running: Pages each running line is on, by key, from
+            ``find_running_lines``.
+    """
+    if not running:
+        return markdown
+    left = dict(running)
+    page = 0
+    kept = []
+    for line in markdown.split("\n"):
+        key = line_key(line)
+        if (
+            left.get(key, 0) > 0
+            and not line.lstrip().startswith("|")
+            and not _HEADING.match(line)
+        ):
+            if not _NUMBERS_ONLY.fullmatch(key):
+                left[key] -= 1
+                continue
+            number = int(re.search(r"\d+", line).group())
+            if page < number <= page + _MAX_PAGE_SKIP:
+                page = number
+                left[key] -= 1
+                continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def find_title(markdown: str) -> Optional[str]:
+    """Find a paper's title, the first heading near the top of its markdown."""
+    for line in markdown.split("\n", _TITLE_LINES)[:_TITLE_LINES]:
+        if _HEADING.match(line):
+            title = re.sub(r"[*_`]", "", line.lstrip("#")).strip()
+            if title and len(title) <= _MAX_TITLE_CHARS:
+                return title
+    return None
+
+
+def _dehyphenate_text(text: str, compounds: set) -> str:
+    """Rejoin the words hyphenated across the line breaks of prose."""
+
+    def join(match: re.Match) -> str:
+        first, second = match.groups()
+        if first.lower() in _COMPOUND_PREFIXES or f"{first}-{second}" in compounds:
+            # A compound broken after its own hyphen
+            return f"{first}-{second}"
+        return first + second
+
+    return _HYPHENATED.sub(join, text)
+
+
+def dehyphenate(markdown: str) -> str:
+    """Rejoin words hyphenated across line breaks.
+
+    Only hyphens at the end of a line are taken for hyphenation; code and
+    math are left alone. Compounds, such as "self-supervised", keep their
+    hyphen when they are written with one elsewhere in the paper or start
+    with a common compound prefix.
+    """
+    compounds = set(re.findall(r"\b[A-Za-z]{2,}-[a-z]{2,}\b", markdown))
+    parts = []
+    end = 0
+    for verbatim in _VERBATIM.finditer(markdown):
+        parts.append(_dehyphenate_text(markdown[end : verbatim.start()], compounds))
+        parts.append(verbatim.group())
+        end = verbatim.end()
+    parts.append(_dehyphenate_text(markdown[end:], compounds))
+    return "".join(parts)
+
+
+def normalize_whitespace(markdown: str) -> str:
+    """Strip trailing spaces and collapse runs of blank lines."""
+    markdown = "\n".join(line.rstrip() for line in markdown.split("\n"))
+    return re.sub(r"\n{3,}", "\n\n", markdown).strip() + "\n"
+
+
+def postprocess_markdown(
+    markdown: str, running: Optional[Mapping[str, int]] = None
+) -> str:
+    """Strip layout boilerplate from converted markdown.
+
+    Args:
+        markdown: The converter's output.
+        running: Pages each running header and footer is on, by key, from
+            ``find_running_lines``.
+
+    Returns:
+        str: The cleaned markdown.
+    """
+    markdown = strip_running_lines(markdown, running or {})
+    markdown = dehyphenate(markdown)
+    return normalize_whitespace(markdown)
+
+
+def split_references(markdown: str) -> Tuple[str, Optional[str]]:
+    """Split the references section out of a paper.
+
+    The section runs from its heading to the next heading of the same or a
+    higher level (usually an appendix), or to the end of the paper. Its
+    heading stays in the paper, followed by ``REFERENCES_NOTE``.
+
+    Returns:
+        Tuple[str, Optional[str]]: The paper without its references, and the
+        references; ``(markdown, None)`` if no references section was found.
+    """
+    matches = list(_REFERENCES_HEADING.finditer(markdown))
+    if not matches or REFERENCES_NOTE in markdown:
+        return markdown, None
+
+    # The last match is the section itself rather than a table of contents
+    heading = matches[-1]
+    level = len(heading.group("marks") or "######")
+    end = len(markdown)
+    for match in _HEADING.finditer(markdown, heading.end()):
+        if len(match.group(1)) <= level:
+            end = match.start()
+            break
+
+    references = markdown[heading.end() : end].strip()
+    if not references:
+        return markdown, None
+    body = (
+        markdown[: heading.end()].rstrip()
+        + f"\n\n{REFERENCES_NOTE}\n\n"
+        + markdown[end:].lstrip()
+    )
+    return normalize_whitespace(body), references + "\n"
+
+
+def join_references(body: str, references: str) -> str:
+    """Put a split-out references section back into its paper."""
+    return body.replace(REFERENCES_NOTE, references.strip(), 1)
+
+
+def split_references_file(md_path: Path) -> Tuple[int, int]:
+    """Move a stored paper's references into ``REFERENCES_SUFFIX``.
+
+    Returns:
+        Tuple[int, int]: Sizes in bytes of the stored paper and of its
+        references (0 when the paper has no references section).
+    """
+    references_path = md_path.with_name(md_path.stem + REFERENCES_SUFFIX)
+    text = md_path.read_text(encoding="utf-8")
+    if REFERENCES_NOTE in text and references_path.exists():
+        # Already split
+        return len(text.encode("utf-8")), references_path.stat().st_size
+
+    body, references = split_references(text)
+    if references is None:
+        references_path.unlink(missing_ok=True)
+        return len(body.encode("utf-8")), 0
+
+    for path, text in ((references_path, references), (md_path, body)):
+        tmp_path = path.with_name(path.name + ".part")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(path)
+    return len(body.encode("utf-8")), len(references.encode("utf-8"))
@@ -0,0 +1,115 @@
+"""Deadlines of tool calls.
+
+Every tool call must finish within ``REQUEST_TIMEOUT`` seconds, or the
+tool's own limit in ``TOOL_TIMEOUTS``. When the deadline passes, the call
+is cancelled and answered with ``ToolTimeout``.
+
+Cancelling a task does not stop the threads it waits for, such as the
+blocking arXiv API client. The call's ``Deadline`` is therefore kept in
+``current_deadline``, which ``asyncio.to_thread`` hands on to the thread:
+blocking code bounds its network requests by ``remaining`` and calls
+``check_deadline`` between steps, so that it stops soon after the call
+was given up.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+# Extra time granted to blocking requests, so that the call's own timeout
+# fires first and the caller gets a ToolTimeout rather than an I/O error
+_GRACE = 1.0
+
+
+class ToolTimeout(Exception):
+    """A tool call did not finish before its deadline."""
+
+    def __init__(self, tool: str, timeout: float):
+        super().__init__(f"{tool} did not finish within {timeout:g} seconds")
+        self.tool = tool
+        self.timeout = timeout
+
+
+class CallAbandoned(Exception):
+    """The call that work was done for has timed out or was cancelled."""
+
+
+class Deadline:
+    """The deadline of one call, shared with the threads working for it."""
+
+    def __init__(self, timeout: float):
+        """Initialize a deadline ``timeout`` seconds from now."""
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.abandoned = threading.Event()
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self) -> None:
+        """Stop the work if the call was given up.
+
+        Raises:
+            CallAbandoned: If the call timed out or was cancelled.
+        """
+        if self.abandoned.is_set():
+            raise CallAbandoned(f"Call abandoned after {self.timeout:g} seconds")
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+def check_deadline() -> None:
+    """Stop the work if the call it is done for was given up.
+
+    Raises:
+        CallAbandoned: If the call timed out or was cancelled.
+    """
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def remaining(default: float) -> float:
+    """Get the timeout for a blocking request made for the current call.
+
+    Args:
+        default: The timeout outside of calls, or if it is shorter.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return default
+    return min(default, deadline.remaining() + _GRACE)
+
+
+@asynccontextmanager
+async def deadline(tool: str, timeout: float) -> AsyncIterator[None]:
+    """Run a tool call within a deadline.
+
+    Args:
+        tool: The tool called.
+        timeout: Seconds the call may take; 0 sets no deadline.
+
+    Raises:
+        ToolTimeout: If the call did not finish in time.
+    """
+    if timeout <= 0:
+        yield
+        return
+    call_deadline = Deadline(timeout)
+    token = current_deadline.set(call_deadline)
+    try:
+        async with asyncio.timeout(timeout):
+            yield
+    except TimeoutError as e:
+        raise ToolTimeout(tool, timeout) from e
+    finally:
+        # Stop the threads still working for the call
+        call_deadline.abandoned.set()
+        current_deadline.reset(token)
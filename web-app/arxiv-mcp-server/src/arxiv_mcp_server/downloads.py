@@ -0,0 +1,247 @@
+"""Network downloads from arXiv.
+
+``aiohttp`` and ``aiofiles`` are imported on the first download, so that
+servers that only search start without them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+PDF_URL = "https://arxiv.org/pdf/{paper_id}"
+EPRINT_URL = "https://arxiv.org/e-print/{paper_id}"
+CHUNK_SIZE = 64 * 1024
+
+# Seconds to wait before the first retry of an interrupted download; doubled
+# for each further attempt
+RETRY_BACKOFF = 1.0
+
+# Called with the bytes received so far and the full size, if known
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+# A PDF must end with an end-of-file marker, give or take trailing whitespace
+_PDF_TAIL_BYTES = 1024
+
+
+class DownloadError(Exception):
+    """Raised when a download fails or its result does not verify."""
+
+
+class PaperNotFoundError(DownloadError):
+    """Raised when arXiv has no PDF for a paper."""
+
+
+def _partial_paths(dest: Path) -> tuple[Path, Path]:
+    """Get the partial file and its resume state for a download target."""
+    return dest.with_name(dest.name + ".part"), dest.with_name(dest.name + ".part.json")
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _discard(*paths: Path) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _total_size(response: "aiohttp.ClientResponse") -> Optional[int]:
+    """Get the full size of the resource a response is (part of)."""
+    if response.status == 206:
+        match = re.search(r"/(\d+)\s*$", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    return response.content_length
+
+
+def verify_pdf(path: Path) -> None:
+    """Check that a file looks like a complete PDF.
+
+    Raises:
+        DownloadError: If the header or the end-of-file marker is missing,
+            e.g. because arXiv served an HTML error page.
+    """
+    with open(path, "rb") as f:
+        header = f.read(5)
+        f.seek(max(0, path.stat().st_size - _PDF_TAIL_BYTES))
+        tail = f.read()
+    if header != b"%PDF-" or b"%%EOF" not in tail:
+        raise DownloadError(f"{path.name} is not a complete PDF")
+
+
+async def _fetch(
+    session: "aiohttp.ClientSession",
+    url: str,
+    dest: Path,
+    on_progress: Optional[ProgressCallback] = None,
+) -> None:
+    """Fetch ``url`` into the partial file for ``dest``, resuming if possible."""
+    import aiofiles
+    import aiohttp
+
+    part_path, state_path = _partial_paths(dest)
+    state = _read_state(state_path)
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if state.get("url") != url:
+        offset = 0
+
+    headers = {}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if state.get("validator"):
+            # Only resume if the file has not changed since the first attempt
+            headers["If-Range"] = state["validator"]
+
+    async with session.get(url, headers=headers) as response:
+        if response.status == 404:
+            raise PaperNotFoundError(f"{url} not found")
+        if response.status == 416 and offset:
+            if offset == state.get("total"):
+                return  # The partial file is already complete
+            # The partial file does not fit the resource; start over
+            _discard(part_path, state_path)
+            return await _fetch(session, url, dest, on_progress)
+        response.raise_for_status()
+
+        total = _total_size(response)
+        if response.status == 206:
+            logger.info(f"Resuming download of {url} at byte {offset}")
+            mode = "ab"
+        else:
+            mode = "wb"
+            offset = 0
+        state_path.write_text(
+            json.dumps(
+                {
+                    "url": url,
+                    "validator": response.headers.get("ETag")
+                    or response.headers.get("Last-Modified"),
+                    "total": total,
+                }
+            ),
+            encoding="utf-8",
+        )
+        received = offset
+        async with aiofiles.open(part_path, mode) as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await f.write(chunk)
+                received += len(chunk)
+                if on_progress:
+                    on_progress(received, total)
+
+    size = part_path.stat().st_size
+    if total is not None and size < total:
+        # The connection closed early; keep the partial file to resume from
+        raise aiohttp.ClientPayloadError(f"Received {size} of {total} bytes")
+    if total is not None and size > total:
+        _discard(part_path, state_path)
+        raise DownloadError(f"Downloaded {size} bytes of {url}, expected {total}")
+
+
+async def download_pdf(
+    paper_id: str,
+    dest: Path,
+    url: Optional[str] = None,
+    timeout: float = 60,
+    retries: int = 3,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Stream a paper's PDF to ``dest``, resuming after interruptions.
+
+    Chunks are written to ``<dest>.part``. If the transfer breaks off, it is
+    resumed with an HTTP Range request, both on the next retry and on a
+    later call for the same paper. The file is checked against the size the
+    server announced and for a PDF header and end-of-file marker, and only
+    then renamed to ``dest``. Readers therefore never see a partial PDF.
+
+    Args:
+        paper_id: The arXiv ID of the paper.
+        dest: Where to store the PDF.
+        url: The PDF URL; defaults to the paper's arxiv.org PDF link.
+        timeout: Connect and read timeout, in seconds.
+        retries: How often to resume an interrupted transfer.
+        on_progress: Called after each chunk received, with the bytes of
+            the PDF received so far and its full size, if known.
+
+    Returns:
+        int: The size of the PDF in bytes.
+
+    Raises:
+        PaperNotFoundError: If arXiv has no PDF for the paper.
+        DownloadError: If the download fails or does not verify.
+    """
+    import aiohttp
+
+    url = url or PDF_URL.format(paper_id=paper_id)
+    part_path, state_path = _partial_paths(dest)
+    client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(timeout=client_timeout) as session:
+        for attempt in range(retries + 1):
+            try:
+                await _fetch(session, url, dest, on_progress)
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, aiohttp.ClientResponseError) and e.status < 500:
+                    raise DownloadError(f"Failed to download {url}: {e}") from e
+                if attempt == retries:
+                    raise DownloadError(
+                        f"Failed to download {url} after {attempt + 1} attempts: {e}"
+                    ) from e
+                logger.warning(f"Download of {paper_id} interrupted, retrying: {e}")
+                await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+
+    try:
+        verify_pdf(part_path)
+    except DownloadError:
+        _discard(part_path, state_path)
+        raise
+    os.replace(part_path, dest)
+    _discard(state_path)
+    return dest.stat().st_size
+
+
+async def fetch_eprint(paper_id: str, dest: Path, timeout: float = 60) -> bool:
+    """Download a paper's e-print (its TeX source archive) to ``dest``.
+
+    Args:
+        paper_id: The arXiv ID of the paper.
+        dest: Where to store the e-print.
+        timeout: Total timeout for the request, in seconds.
+
+    Returns:
+        bool: False if arXiv has no source for the paper (only a PDF).
+
+    Raises:
+        aiohttp.ClientError: If the request fails for another reason.
+    """
+    import aiofiles
+    import aiohttp
+
+    url = EPRINT_URL.format(paper_id=paper_id)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(timeout=client_timeout) as session:
+        async with session.get(url) as response:
+            if response.status == 404:
+                return False
+            response.raise_for_status()
+            if response.content_type == "application/pdf":
+                logger.info(f"No TeX source available for {paper_id}")
+                return False
+
+            tmp_path = dest.with_name(dest.name + ".part")
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+            os.replace(tmp_path, dest)
+    return True
@@ -0,0 +1,231 @@
+"""Background checks for new versions of stored papers.
+
+Authors keep posting new versions of papers after we stored one. The
+freshness check looks up the latest version of every stored paper in a few
+large catalog queries (``catalog.latest_entries``, under the shared API rate
+limit) and records it in the paper's metadata sidecar, where
+``download_paper`` and ``read_paper`` report it. If configured, newer
+versions are then downloaded one at a time, whenever no other download or
+conversion is running.
+
+Each paper is checked once it was last checked, or else converted, more
+than an interval ago. The check therefore also runs for servers that live
+shorter than an interval, as stdio servers started per session do.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from . import catalog
+from .identity import PaperId, version_of
+from .storage import METADATA_SUFFIX, read_metadata, update_metadata
+from .storage.store import PaperStore
+from .tools.download import active_paper_ids, conversion_tasks, handle_download
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Seconds to wait before looking again whether the server is idle
+IDLE_POLL_INTERVAL = 5.0
+
+# Seconds to wait after a failed check before trying again
+RETRY_INTERVAL = 600.0
+
+
+def newest_stored(store: PaperStore) -> Dict[str, str]:
+    """Get the newest stored version of each paper.
+
+    Returns:
+        Dict[str, str]: Storage keys by base ID, for arXiv papers only.
+    """
+    newest = {}
+    for key in store.paper_ids():
+        paper_id = PaperId.from_key(key)
+        if not paper_id.known:
+            continue
+        current = newest.get(paper_id.base)
+        if current is None or (version_of(key) or 0) > (version_of(current) or 0):
+            newest[paper_id.base] = key
+    return newest
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a time recorded in metadata; naive times are local."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return moment if moment.tzinfo else moment.astimezone()
+
+
+def last_checked(metadata: Dict[str, str]) -> Optional[datetime]:
+    """Get when a paper was last known to be up to date.
+
+    That is its last check, or else its conversion, which fetched the
+    latest version at the time.
+    """
+    return _timestamp(metadata.get("checked_at")) or _timestamp(
+        metadata.get("converted_at")
+    )
+
+
+def _is_stale(metadata: Dict[str, str], max_age: float, now: datetime) -> bool:
+    """Check whether a paper is due for a check."""
+    checked = last_checked(metadata)
+    return checked is None or (now - checked).total_seconds() >= max_age
+
+
+def next_check_delay(
+    store: PaperStore, interval: float, now: Optional[datetime] = None
+) -> float:
+    """Get the seconds until the paper checked longest ago is due again.
+
+    Returns:
+        float: 0 if a paper is due now, ``interval`` if nothing is stored.
+    """
+    now = now or datetime.now(timezone.utc)
+    delay = interval
+    for key in newest_stored(store).values():
+        checked = last_checked(read_metadata(store.path(key, METADATA_SUFFIX)))
+        if checked is None:
+            return 0.0
+        delay = min(delay, interval - (now - checked).total_seconds())
+    return max(0.0, delay)
+
+
+def _is_newer(
+    key: str, latest: PaperId, updated: datetime, metadata: Dict[str, str]
+) -> bool:
+    """Check whether arXiv has a newer version than the stored one.
+
+    Papers stored without version are compared by date: the latest version
+    is newer if it was posted after the paper was converted.
+    """
+    stored = version_of(key)
+    if stored is not None:
+        return latest.version is not None and latest.version > stored
+    converted = _timestamp(metadata.get("converted_at"))
+    return converted is not None and updated > converted
+
+
+def check_freshness(
+    store: PaperStore,
+    batch_size: int = 100,
+    now: Optional[datetime] = None,
+    max_age: Optional[float] = None,
+) -> List[Tuple[str, PaperId]]:
+    """Look up the latest version of every stored paper and record it.
+
+    The metadata of the newest stored version of each paper gets
+    ``latest_version``, ``arxiv_updated`` and ``checked_at``, and
+    ``newer_version`` names the latest version if it is not stored.
+    Papers the catalog does not know get ``checked_at`` only.
+
+    Args:
+        store: The store to check.
+        batch_size: Papers per catalog query.
+        now: The time of the check; defaults to now.
+        max_age: If given, only papers last checked at least this many
+            seconds ago are checked.
+
+    Returns:
+        List[Tuple[str, PaperId]]: The storage key of each outdated paper
+        and its latest version.
+    """
+    now = now or datetime.now(timezone.utc)
+    newest = newest_stored(store)
+    if max_age is not None:
+        newest = {
+            base: key
+            for base, key in newest.items()
+            if _is_stale(read_metadata(store.path(key, METADATA_SUFFIX)), max_age, now)
+        }
+    if not newest:
+        return []
+    entries = catalog.latest_entries(list(newest), batch_size)
+    for base in newest.keys() - entries.keys():
+        update_metadata(
+            store.path(newest[base], METADATA_SUFFIX), checked_at=now.isoformat()
+        )
+
+    outdated = []
+    for base, (latest, updated) in entries.items():
+        key = newest.get(base)
+        if key is None:
+            continue
+        path = store.path(key, METADATA_SUFFIX)
+        newer = _is_newer(key, latest, updated, read_metadata(path))
+        update_metadata(
+            path,
+            latest_version=latest.canonical,
+            arxiv_updated=updated.isoformat(),
+            checked_at=now.isoformat(),
+            newer_version=latest.canonical if newer else None,
+        )
+        if newer:
+            outdated.append((key, latest))
+    logger.info(
+        f"Checked {len(newest)} papers for new versions, {len(outdated)} outdated"
+    )
+    return outdated
+
+
+async def refresh_outdated(
+    store: PaperStore, outdated: List[Tuple[str, PaperId]]
+) -> int:
+    """Download the latest versions of outdated papers, at low priority.
+
+    Papers are refreshed one at a time, each at its stored tier, and only
+    while no other download or conversion is running, so that requests
+    from clients always come first. The stored versions are kept.
+
+    Returns:
+        int: The number of papers refreshed.
+    """
+    refreshed = 0
+    for key, latest in outdated:
+        while active_paper_ids():
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+        if store.resolve(latest):
+            continue
+        tier = read_metadata(store.path(key, METADATA_SUFFIX)).get("tier", "full")
+        logger.info(f"Refreshing {PaperId.from_key(key)} to {latest}")
+        await handle_download({"paper_id": latest.canonical, "tier": tier})
+        task = conversion_tasks.get(latest.key)
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+        if store.resolve(latest):
+            refreshed += 1
+    return refreshed
+
+
+async def freshness_loop(
+    store: PaperStore,
+    interval: float,
+    batch_size: int = 100,
+    auto_refresh: bool = False,
+) -> None:
+    """Check papers for new versions every ``interval`` seconds, until cancelled.
+
+    Papers are checked when they are due, which at startup may be at once.
+
+    Args:
+        store: The store to check.
+        interval: Seconds between checks of a paper.
+        batch_size: Papers per catalog query.
+        auto_refresh: Whether to download newer versions.
+    """
+    while True:
+        try:
+            delay = await asyncio.to_thread(next_check_delay, store, interval)
+            await asyncio.sleep(delay)
+            outdated = await asyncio.to_thread(
+                check_freshness, store, batch_size, None, interval
+            )
+            if auto_refresh and outdated:
+                await refresh_outdated(store, outdated)
+        except Exception as e:
+            logger.warning(f"Freshness check failed: {str(e)}")
+            await asyncio.sleep(min(interval, RETRY_INTERVAL))
@@ -0,0 +1,98 @@
+"""Canonical identity of arXiv papers.
+
+Users name papers in many ways: ``2103.12345``, ``2103.12345v2``,
+``arXiv:2103.12345``, an abs or PDF URL, or an old-style ID such as
+``hep-th/9901001``. ``PaperId`` parses all of them into a base ID and an
+optional version, and gives each paper version a storage key that is safe
+to use as a file name (old-style IDs contain a slash).
+
+A paper without a version stands for its latest version.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Prefixes and URL forms wrapped around an ID
+_PREFIX = re.compile(
+    r"^(?:arxiv:|https?://(?:export\.|www\.)?arxiv\.org/(?:abs|pdf)/)",
+    re.IGNORECASE,
+)
+_NEW_STYLE = re.compile(r"^(\d{4}\.\d{4,5})(?:v(\d+))?$")
+_OLD_STYLE = re.compile(r"^([a-z][a-z-]*(?:\.[A-Z]{2})?/\d{7})(?:v(\d+))?$")
+_VERSION = re.compile(r"v\d+$")
+
+# Stands in for the slash of old-style IDs in storage keys
+_KEY_SEPARATOR = "_"
+
+
+@dataclass(frozen=True)
+class PaperId:
+    """An arXiv paper, optionally at a specific version."""
+
+    base: str
+    version: Optional[int] = None
+    # False for IDs that do not look like arXiv IDs; they are used as given
+    known: bool = True
+
+    @classmethod
+    def parse(cls, text: str) -> "PaperId":
+        """Parse a paper ID in any of the forms users give.
+
+        Strings that are not recognizable arXiv IDs are kept as an opaque
+        base ID without version, so that arXiv gets to decide about them.
+        """
+        text = _PREFIX.sub("", text.strip())
+        if text.endswith(".pdf"):
+            text = text[: -len(".pdf")]
+        for pattern in (_NEW_STYLE, _OLD_STYLE):
+            match = pattern.match(text)
+            if match:
+                version = int(match.group(2)) if match.group(2) else None
+                return cls(match.group(1), version)
+        return cls(text, known=False)
+
+    @classmethod
+    def from_key(cls, key: str) -> "PaperId":
+        """Get the paper a storage key belongs to."""
+        paper_id = cls.parse(key)
+        if not paper_id.known and _KEY_SEPARATOR in key:
+            old_style = cls.parse(key.replace(_KEY_SEPARATOR, "/", 1))
+            if old_style.known:
+                return old_style
+        return paper_id
+
+    @property
+    def canonical(self) -> str:
+        """The ID as arXiv writes it, e.g. ``2103.12345v2``."""
+        if self.version is None:
+            return self.base
+        return f"{self.base}v{self.version}"
+
+    @property
+    def key(self) -> str:
+        """The storage key: the canonical ID, safe as a file name."""
+        return self.canonical.replace("/", _KEY_SEPARATOR)
+
+    @property
+    def base_key(self) -> str:
+        """The storage key shared by all versions of the paper."""
+        return self.base.replace("/", _KEY_SEPARATOR)
+
+    def at_version(self, version: Optional[int]) -> "PaperId":
+        """Get the same paper at another version."""
+        return PaperId(self.base, version, self.known)
+
+    def __str__(self) -> str:
+        return self.canonical
+
+
+def base_key(key: str) -> str:
+    """Strip the version off a storage key."""
+    return _VERSION.sub("", key)
+
+
+def version_of(key: str) -> Optional[int]:
+    """Get the version in a storage key, or None if it has none."""
+    match = _VERSION.search(key)
+    return int(match.group()[1:]) if match else None
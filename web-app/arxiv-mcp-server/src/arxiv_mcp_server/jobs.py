@@ -0,0 +1,252 @@
+"""Status of download and conversion jobs, optionally persisted in SQLite.
+
+``JobTable`` is a mapping from storage keys to ``ConversionStatus``. It
+starts out in memory only; once ``open`` is called with a database path,
+every saved status is also written to a small SQLite table. The table is
+shared by all server processes using the same storage directory: a
+status that this process does not know is looked up there, which is how
+jobs of other processes, and of an earlier run that a restart
+interrupted, are found. Finished jobs are dropped after a TTL, which
+keeps the table bounded.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Statuses for which a paper is still being worked on
+ACTIVE_STATUSES = ("downloading", "converting")
+
+JOBS_FILE = "jobs.sqlite3"
+
+# Identifies this process in the shared table
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    paper_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    error TEXT,
+    tier TEXT NOT NULL,
+    owner TEXT
+)
+"""
+
+_FIELDS = (
+    "paper_id",
+    "status",
+    "started_at",
+    "completed_at",
+    "error",
+    "tier",
+    "owner",
+)
+
+
+@dataclass
+class ConversionStatus:
+    """Track the status of a PDF to Markdown conversion."""
+
+    paper_id: str
+    status: str  # 'downloading', 'converting', 'success', 'error', 'cancelled'
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    tier: str = "full"
+    owner: Optional[str] = OWNER  # The process working on the paper
+
+    @property
+    def active(self) -> bool:
+        """Whether the paper is still being worked on."""
+        return self.status in ACTIVE_STATUSES
+
+    def _row(self) -> tuple:
+        row = asdict(self)
+        for field in ("started_at", "completed_at"):
+            if row[field] is not None:
+                row[field] = row[field].isoformat()
+        return tuple(row[field] for field in _FIELDS)
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> "ConversionStatus":
+        fields = dict(zip(_FIELDS, row))
+        for field in ("started_at", "completed_at"):
+            if fields[field] is not None:
+                fields[field] = datetime.fromisoformat(fields[field])
+        return cls(**fields)
+
+
+class JobTable(MutableMapping):
+    """Job statuses by storage key, persisted once opened.
+
+    Iterating the table lists the jobs of this process only; lookups also
+    find the jobs of other processes once the table is opened.
+    """
+
+    def __init__(self, ttl: float = 86400):
+        """Initialize an empty, in-memory table.
+
+        Args:
+            ttl: Seconds to keep finished jobs; 0 keeps them forever.
+        """
+        self.ttl = ttl
+        self._jobs: Dict[str, ConversionStatus] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def open(self, path: Path) -> List[ConversionStatus]:
+        """Persist the table in a SQLite database shared between processes.
+
+        Returns:
+            List[ConversionStatus]: The jobs recorded as active by other
+            processes, i.e. work that is either still running elsewhere or
+            was interrupted by a restart.
+        """
+        # Waits for other processes' writes instead of failing
+        db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(_SCHEMA)
+        columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        db.commit()
+        with self._lock:
+            self._db = db
+        # Also write jobs started before the table was opened
+        for status in self._jobs.values():
+            self.save(status)
+        self.evict_expired()
+        return [
+            status
+            for status in self._select("status IN (?, ?)", *ACTIVE_STATUSES)
+            if status.owner != OWNER
+        ]
+
+    def _select(self, where: str, *params) -> List[ConversionStatus]:
+        """Read the jobs matching a condition from the shared table."""
+        with self._lock:
+            if self._db is None:
+                return []
+            rows = self._db.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE {where}", params
+            ).fetchall()
+        return [ConversionStatus._from_row(row) for row in rows]
+
+    def active_ids(self) -> List[str]:
+        """List the papers recorded as active by any process."""
+        if self._db is None:
+            return [
+                paper_id for paper_id, status in self._jobs.items() if status.active
+            ]
+        return [
+            status.paper_id
+            for status in self._select("status IN (?, ?)", *ACTIVE_STATUSES)
+        ]
+
+    def close(self) -> None:
+        """Stop persisting the table."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def save(self, status: ConversionStatus) -> None:
+        """Persist a status after it changed."""
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO jobs ({', '.join(_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * len(_FIELDS))})",
+                    status._row(),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not save job {status.paper_id}: {str(e)}")
+
+    def update_status(self, paper_id: str, **fields) -> Optional[ConversionStatus]:
+        """Change a job's status fields and persist it.
+
+        A status leaving the active ones is stamped as completed.
+
+        Returns:
+            Optional[ConversionStatus]: The job, or None if it is unknown.
+        """
+        status = self._jobs.get(paper_id)
+        if status is None:
+            return None
+        for field, value in fields.items():
+            setattr(status, field, value)
+        if not status.active and status.completed_at is None:
+            status.completed_at = datetime.now()
+        self.save(status)
+        return status
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        """Drop finished jobs that completed more than ``ttl`` seconds ago.
+
+        Returns:
+            int: The number of jobs dropped.
+        """
+        if not self.ttl:
+            return 0
+        cutoff = (now or datetime.now()) - timedelta(seconds=self.ttl)
+        expired = [
+            paper_id
+            for paper_id, status in self._jobs.items()
+            if not status.active
+            and status.completed_at is not None
+            and status.completed_at < cutoff
+        ]
+        for paper_id in expired:
+            del self[paper_id]
+        with self._lock:
+            if self._db is not None:
+                # Including the jobs of other processes
+                self._db.execute(
+                    "DELETE FROM jobs WHERE status NOT IN (?, ?) AND completed_at < ?",
+                    (*ACTIVE_STATUSES, cutoff.isoformat()),
+                )
+                self._db.commit()
+        return len(expired)
+
+    def __getitem__(self, paper_id: str) -> ConversionStatus:
+        if paper_id in self._jobs:
+            return self._jobs[paper_id]
+        # Fresh from the shared table, as another process may be updating it
+        found = self._select("paper_id = ?", paper_id)
+        if not found:
+            raise KeyError(paper_id)
+        return found[0]
+
+    def __setitem__(self, paper_id: str, status: ConversionStatus) -> None:
+        # New jobs are when the table grows, so that is when it is trimmed
+        self.evict_expired()
+        self._jobs[paper_id] = status
+        self.save(status)
+
+    def __delitem__(self, paper_id: str) -> None:
+        if self._jobs.pop(paper_id, None) is None and paper_id not in self:
+            raise KeyError(paper_id)
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM jobs WHERE paper_id = ?", (paper_id,))
+                self._db.commit()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._jobs))
+
+    def __len__(self) -> int:
+        return len(self._jobs)
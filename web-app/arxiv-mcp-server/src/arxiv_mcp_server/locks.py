@@ -0,0 +1,106 @@
+"""Per-paper locks shared by the server processes of one host.
+
+Several servers may share a storage directory, e.g. one per agent. Before
+downloading or converting a paper, a server takes the paper's lock, an
+advisory lock on a file in ``<storage>/.locks``, and holds it until the
+paper is stored or the work failed. Other servers find the lock taken and
+leave the paper alone, so the work happens once per host. The operating
+system releases the locks of a process that dies, so a crashed server
+never blocks a paper for good.
+
+Locks are ``flock`` locks on POSIX and ``msvcrt`` byte locks on Windows;
+both are local to one host.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCKS_DIR = ".locks"
+
+
+def _try_lock(fd: int) -> bool:
+    """Take an exclusive lock on an open file without waiting."""
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class PaperLocks:
+    """The locks of the papers in one storage directory."""
+
+    def __init__(self, root: Path):
+        """Initialize the locks kept in ``root``."""
+        self.root = Path(root)
+        self._held: Dict[str, int] = {}
+        self._mutex = threading.Lock()
+
+    def _open(self, paper_id: str) -> int:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return os.open(self.root / f"{paper_id}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+
+    def acquire(self, paper_id: str) -> bool:
+        """Take a paper's lock, unless it is held already.
+
+        The lock is exclusive within this process as well, so that it also
+        keeps two tasks of one server from doing the same work.
+
+        Returns:
+            bool: True if the lock was taken.
+        """
+        with self._mutex:
+            if paper_id in self._held:
+                return False
+            fd = self._open(paper_id)
+            if not _try_lock(fd):
+                os.close(fd)
+                return False
+            self._held[paper_id] = fd
+            return True
+
+    def release(self, paper_id: str) -> None:
+        """Release a paper's lock, if this process holds it."""
+        with self._mutex:
+            fd = self._held.pop(paper_id, None)
+        if fd is not None:
+            _unlock(fd)
+            os.close(fd)
+
+    def held(self, paper_id: str) -> bool:
+        """Check whether this process holds a paper's lock."""
+        return paper_id in self._held
+
+    def locked(self, paper_id: str) -> bool:
+        """Check whether any process holds a paper's lock."""
+        if self.held(paper_id):
+            return True
+        if not (self.root / f"{paper_id}.lock").exists():
+            return False
+        fd = self._open(paper_id)
+        try:
+            if not _try_lock(fd):
+                return True
+            _unlock(fd)
+            return False
+        finally:
+            os.close(fd)
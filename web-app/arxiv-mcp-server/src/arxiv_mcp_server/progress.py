@@ -0,0 +1,162 @@
+"""Progress of long-running work, and progress notifications to clients.
+
+Downloads and conversions report how far they got to ``progress_board``,
+by paper. A tool call that wants to follow a paper watches the board, and
+passes changes on to its client as MCP progress notifications, if the
+client asked for them by sending a progress token with the call. The
+call's notifier is kept in ``current_progress``.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Set
+from .identity import base_key
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Sends a progress notification: progress, total and message
+ProgressNotifier = Callable[[float, Optional[float], str], Awaitable[None]]
+
+# The notifier of the current call, if its client asked for progress
+current_progress: ContextVar[Optional[ProgressNotifier]] = ContextVar(
+    "current_progress", default=None
+)
+
+# Range of the overall progress, in percent, that each stage of a paper covers
+STAGES = {
+    "downloading": (0.0, 20.0),
+    "converting": (20.0, 95.0),
+    "done": (100.0, 100.0),
+}
+
+# Stages after which no more progress is made
+FINAL_STAGES = ("done", "error", "cancelled")
+
+# Papers whose progress is remembered; the oldest are forgotten first
+_MAX_PAPERS = 1024
+
+
+@dataclass
+class PaperProgress:
+    """How far the work on a paper got."""
+
+    stage: str
+    percent: float
+    message: str
+
+    @property
+    def final(self) -> bool:
+        """Whether the work has ended."""
+        return self.stage in FINAL_STAGES
+
+
+class ProgressBoard:
+    """The latest progress of the work on each paper."""
+
+    def __init__(self):
+        """Initialize an empty board."""
+        self._papers: "OrderedDict[str, PaperProgress]" = OrderedDict()
+        self._waiters: Set[asyncio.Future] = set()
+
+    def report(
+        self,
+        paper_id: str,
+        stage: str,
+        done: float = 0,
+        total: Optional[float] = None,
+        message: str = "",
+    ) -> PaperProgress:
+        """Record the progress of a paper and wake those watching.
+
+        Args:
+            paper_id: The storage key of the paper version.
+            stage: ``downloading``, ``converting``, or one of
+                ``FINAL_STAGES``.
+            done: Units of the stage done, e.g. bytes or pages.
+            total: Units of the stage in all, if known.
+            message: A description of the progress for people.
+        """
+        key = base_key(paper_id)
+        previous = self._papers.pop(key, None)
+        if stage in STAGES:
+            start, end = STAGES[stage]
+            percent = start
+            if total:
+                percent += (end - start) * min(done, total) / total
+            if previous and not previous.final and stage != "downloading":
+                # Never go back within a job
+                percent = max(percent, previous.percent)
+        else:
+            percent = previous.percent if previous else 0.0
+        progress = self._papers[key] = PaperProgress(stage, round(percent, 1), message)
+        while len(self._papers) > _MAX_PAPERS:
+            self._papers.popitem(last=False)
+
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+        return progress
+
+    def get(self, paper_id: str) -> Optional[PaperProgress]:
+        """Get the latest progress of any version of a paper."""
+        return self._papers.get(base_key(paper_id))
+
+    async def changed(self, timeout: Optional[float] = None) -> None:
+        """Wait until any progress is reported, or ``timeout`` seconds pass."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters.discard(waiter)
+
+
+progress_board = ProgressBoard()
+
+
+async def report_progress(
+    progress: float, total: Optional[float] = None, message: str = ""
+) -> None:
+    """Send a progress notification for the current call, if it wants them."""
+    notify = current_progress.get()
+    if notify is None:
+        return
+    try:
+        await notify(progress, total, message)
+    except Exception as e:
+        # The client may have gone; the call goes on regardless
+        logger.debug(f"Could not send progress notification: {e}")
+
+
+async def follow(paper_id: str, interval: float = 1.0) -> None:
+    """Pass the progress of a paper on to the client of the current call.
+
+    Runs until cancelled, or until the work on the paper ended.
+
+    Args:
+        paper_id: The storage key of any version of the paper.
+        interval: Seconds between checks when no progress is reported.
+    """
+    # Progress left by earlier work on the paper is not news
+    sent = progress_board.get(paper_id)
+    if sent is not None and not sent.final:
+        sent = None
+    stage, percent = None, 0.0
+    while True:
+        progress = progress_board.get(paper_id)
+        if progress is not None and progress is not sent:
+            sent = progress
+            # Notify of new stages and of each further percent; the
+            # progress sent never goes back
+            if progress.stage != stage or progress.percent >= percent + 1:
+                stage, percent = progress.stage, max(percent, progress.percent)
+                await report_progress(percent, 100, progress.message)
+            if progress.final:
+                return
+        await progress_board.changed(interval)
@@ -1,5 +1,18 @@
 """Resource management for the arXiv MCP server."""
 
+from .listing import (
+    ResourceListNotifier,
+    list_paper_resources,
+    read_paper_resource,
+)
 from .papers import PaperManager
+from .readthrough import paper_template, read_through
 
-__all__ = ["PaperManager"]
+__all__ = [
+    "PaperManager",
+    "ResourceListNotifier",
+    "list_paper_resources",
+    "paper_template",
+    "read_paper_resource",
+    "read_through",
+]
@@ -0,0 +1,162 @@
+"""Stored papers as MCP resources.
+
+Each stored paper version is a resource ``arxiv://<id>``, e.g.
+``arxiv://2401.12345v2``. The list is answered from the store's index and
+the papers' metadata sidecars, without asking arXiv, and is paginated by
+storage key. Paper paths handed out as ``file://`` URIs can be read too.
+
+Clients that listed the resources are sent ``resources/list_changed``
+whenever a paper is stored or removed, so that they can cache the list
+instead of polling it.
+"""
+
+import asyncio
+import bisect
+import logging
+import weakref
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+import mcp.types as types
+from ..identity import PaperId
+from ..storage import METADATA_SUFFIX, read_metadata
+from ..storage.store import PaperStore, classify, default_store
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+SCHEME = "arxiv"
+
+# Seconds to gather changes of the store into one notification
+NOTIFY_DELAY = 0.5
+
+
+def resource_uri(paper_id: str) -> str:
+    """Get the URI of a stored paper version, by storage key."""
+    return f"{SCHEME}://{PaperId.from_key(paper_id).canonical}"
+
+
+def uri_paper_id(uri: str) -> PaperId:
+    """Get the paper, and possibly its version, an ``arxiv://`` URI names."""
+    return PaperId.parse(uri[len(SCHEME) + 3 :])
+
+
+def paper_resource(store: PaperStore, paper_id: str) -> types.Resource:
+    """Describe a stored paper version as a resource, from its metadata."""
+    metadata = read_metadata(store.path(paper_id, METADATA_SUFFIX))
+    canonical = PaperId.from_key(paper_id).canonical
+    description = f"arXiv paper {canonical}"
+    if metadata.get("tier"):
+        source = " of the LaTeX source" if metadata.get("source") == "latex" else ""
+        description += f", {metadata['tier']} conversion{source}"
+    return types.Resource(
+        uri=resource_uri(paper_id),
+        name=canonical,
+        title=metadata.get("title"),
+        description=description,
+        mimeType="text/markdown",
+        size=metadata.get("stored_bytes"),
+    )
+
+
+def list_paper_resources(
+    cursor: Optional[str] = None, page_size: int = 100
+) -> types.ListResourcesResult:
+    """List one page of the stored papers as resources.
+
+    Pages come from the local index, which also holds the metadata that
+    describes each paper; the shared backend is not listed.
+
+    Args:
+        cursor: The ``nextCursor`` of the previous page, if any.
+        page_size: Resources per page.
+    """
+    store = default_store()
+    paper_ids = store.paper_ids()
+    start = bisect.bisect_right(paper_ids, cursor) if cursor else 0
+    page = paper_ids[start : start + page_size]
+    more = start + page_size < len(paper_ids)
+    return types.ListResourcesResult(
+        resources=[paper_resource(store, paper_id) for paper_id in page],
+        nextCursor=page[-1] if more and page else None,
+    )
+
+
+def stored_key(uri: str) -> Optional[str]:
+    """Get the storage key of the stored paper a resource URI names.
+
+    Returns:
+        Optional[str]: The key, or None if no stored version fits.
+
+    Raises:
+        ValueError: If the URI names no paper.
+    """
+    store = default_store()
+    parsed = urlparse(uri)
+    if parsed.scheme == SCHEME:
+        return store.resolve(uri_paper_id(uri))
+    if parsed.scheme == "file":
+        path = Path(unquote(parsed.path))
+        kind, paper_id = classify(path.name)
+        if kind == "markdown" and store.path(paper_id) == path:
+            return paper_id if store.exists(paper_id) else None
+    raise ValueError(f"Unknown resource {uri}")
+
+
+def read_paper_resource(uri: str) -> str:
+    """Read the markdown of the stored paper a resource URI names.
+
+    Raises:
+        ValueError: If the URI names no paper, or the paper is not stored.
+    """
+    paper_id = stored_key(uri)
+    if paper_id is None:
+        raise ValueError(f"Paper {uri} is not stored; download it first")
+    store = default_store()
+    content = store.read_text(paper_id)
+    store.touch(paper_id)
+    return content
+
+
+class ResourceListNotifier:
+    """Tells the sessions that listed the resources when the list changes."""
+
+    def __init__(self, delay: float = NOTIFY_DELAY):
+        """Initialize the notifier.
+
+        Args:
+            delay: Seconds to gather changes into one notification.
+        """
+        self.delay = delay
+        self._sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[asyncio.Task] = None
+
+    def watch(self, session: Any) -> None:
+        """Notify a session of changes from now on."""
+        self._sessions.add(session)
+
+    def attach(self, store: PaperStore, loop: asyncio.AbstractEventLoop) -> None:
+        """Listen for changes of a store, notifying from ``loop``."""
+        self._loop = loop
+        store.listeners.append(self.changed)
+
+    def changed(self) -> None:
+        """Note that the list changed; may be called from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self) -> None:
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        await asyncio.sleep(self.delay)
+        # Changes from now on need another notification
+        self._pending = None
+        for session in list(self._sessions):
+            try:
+                await session.send_resource_list_changed()
+            except Exception as e:
+                # The client went away
+                logger.debug(f"Could not notify a session of new resources: {e}")
+                self._sessions.discard(session)
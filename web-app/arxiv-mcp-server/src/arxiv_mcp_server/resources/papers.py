@@ -1,14 +1,17 @@
 """Resource management and storage for arXiv papers."""
 
+import asyncio
+import json
 from pathlib import Path
-from typing import List
-import arxiv
-import pymupdf4llm
-import aiofiles
+from typing import List, Optional
 import logging
-from pydantic import AnyUrl
 import mcp.types as types
-from ..config import Settings
+from ..catalog import arxiv_client
+from ..config import get_settings
+from ..identity import PaperId
+from ..storage.store import default_store
+from ..tools.download import handle_download
+from .listing import paper_resource
 
 logger = logging.getLogger("arxiv-mcp-server")
 
@@ -18,84 +21,97 @@ class PaperManager:
 
     def __init__(self):
         """Initialize the paper management system."""
-        settings = Settings()
+        settings = get_settings()
         self.storage_path = Path(settings.STORAGE_PATH)
-        self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.client = arxiv.Client()
+        # Shared with the tools, and so is its index
+        self.store = default_store()
+        self.client = arxiv_client()
+        self.prefer_source = settings.PREFER_LATEX_SOURCE
+        self.tier = settings.DEFAULT_CONVERSION_TIER
+        self.wait_timeout = settings.DOWNLOAD_WAIT_TIMEOUT
 
     def _get_paper_path(self, paper_id: str) -> Path:
-        """Get the absolute file path for a paper."""
-        return self.storage_path / f"{paper_id}.md"
-
-    async def store_paper(self, paper_id: str, pdf_url: str) -> bool:
-        """Download and store a paper from arXiv."""
-        paper_md_path = self._get_paper_path(paper_id)
-        paper_pdf_path = paper_md_path.with_suffix(".pdf")
-
-        if paper_md_path.exists():
+        """Get the absolute file path for a paper version's storage key."""
+        return self.store.path(paper_id)
+
+    def _resolve(self, paper_id: str) -> Optional[str]:
+        """Get the storage key of the stored version that serves a request."""
+        return self.store.resolve(PaperId.parse(paper_id))
+
+    async def store_paper(
+        self, paper_id: str, pdf_url: str, prefer_source: Optional[bool] = None
+    ) -> bool:
+        """Download and store a paper from arXiv.
+
+        The paper goes through the same download and conversion as the
+        ``download_paper`` tool, so it shares the tool's conversion cache,
+        worker limits, paper locks and job status. In source-first mode
+        (``prefer_source``, defaulting to the ``PREFER_LATEX_SOURCE``
+        setting) the paper's LaTeX source is converted when arXiv has it,
+        and the PDF is only used as a fallback.
+
+        A stored version that fits the request is not downloaded again. A
+        request without version is stored as the version ``pdf_url`` names.
+
+        Raises:
+            ValueError: If the paper could not be stored, or was not ready
+                within ``DOWNLOAD_WAIT_TIMEOUT`` seconds.
+        """
+        if await asyncio.to_thread(self._resolve, paper_id):
             return True
 
-        try:
-            paper = next(self.client.results(arxiv.Search(id_list=[paper_id])))
-            paper.download_pdf(dirpath=self.storage_path, filename=paper_pdf_path)
-            markdown = pymupdf4llm.to_markdown(paper_pdf_path, show_progress=False)
-
-            async with aiofiles.open(paper_md_path, "w", encoding="utf-8") as f:
-                await f.write(markdown)
-
-            return True
-
-        except StopIteration:
-            raise ValueError(f"Paper with ID {paper_id} not found on arXiv.")
-        except arxiv.ArxivError as e:
-            raise ValueError(
-                f"Error: Failed to download paper {paper_id} from arXiv. Details: {str(e)}"
-            )
-        except Exception as e:
+        requested = PaperId.parse(paper_id)
+        if requested.version is None:
+            pinned = PaperId.parse(pdf_url)
+            if pinned.base == requested.base:
+                requested = pinned
+
+        if prefer_source is None:
+            prefer_source = self.prefer_source
+        response = await handle_download(
+            {
+                "paper_id": requested.canonical,
+                "tier": self.tier,
+                "prefer_source": prefer_source,
+                "wait": True,
+                "timeout": self.wait_timeout,
+            }
+        )
+        status = json.loads(response[0].text)
+        if status.get("status") != "success":
+            details = status.get("error") or status["message"]
             raise ValueError(
-                f"Error: An unexpected error occurred while storing paper {paper_id}. Details: {str(e)}"
+                f"Error: Could not store paper {requested}. Details: {details}"
             )
+        return True
 
     async def has_paper(self, paper_id: str) -> bool:
-        """Check if a paper is available in storage."""
-        return self._get_paper_path(paper_id).exists()
+        """Check if a paper is available in storage, in a version that fits."""
+        return self._resolve(paper_id) is not None
 
     async def list_papers(self) -> list[str]:
-        """List all stored paper IDs."""
+        """List all stored paper IDs, with their version."""
         logger.info(f"Listing papers in {self.storage_path}")
-        paper_ids = [p.stem for p in self.storage_path.glob("*.md")]
+        paper_ids = [PaperId.from_key(key).canonical for key in self.store.paper_ids()]
         logger.info(f"Found {len(paper_ids)} papers")
         return paper_ids
 
     async def list_resources(self) -> List[types.Resource]:
-        """List all papers as MCP resources with metadata."""
-        paper_ids = await self.list_papers()
-        resources = []
-
-        for paper_id in paper_ids:
-            search = arxiv.Search(id_list=[paper_id])
-            papers = list(self.client.results(search))
-
-            if papers:
-                paper = papers[0]
-                paper_path = self._get_paper_path(paper_id)
-                resources.append(
-                    types.Resource(
-                        uri=AnyUrl(f"file://{str(paper_path)}"),
-                        name=paper.title,
-                        description=paper.summary,
-                        mimeType="text/markdown",
-                    )
-                )
-
+        """List all papers as MCP resources, from their local metadata."""
+        resources = [
+            paper_resource(self.store, paper_id) for paper_id in self.store.paper_ids()
+        ]
         logger.info(f"Found {len(resources)} resources")
         return resources
 
     async def get_paper_content(self, paper_id: str) -> str:
         """Get the markdown content of a stored paper."""
-        paper_path = self._get_paper_path(paper_id)
-        if not paper_path.exists():
+        key = self._resolve(paper_id)
+        if key is None:
             raise ValueError(f"Paper {paper_id} not found in storage")
+        paper_id = key
 
-        async with aiofiles.open(paper_path, "r", encoding="utf-8") as f:
-            return await f.read()
+        # Stored papers may be compressed
+        content = await asyncio.to_thread(self.store.read_text, paper_id)
+        self.store.touch(paper_id)
+        return content
@@ -0,0 +1,107 @@
+"""Reading papers through the ``arxiv://{paper_id}`` resource template.
+
+Reading ``arxiv://<id>`` for a paper that is not stored downloads and
+converts it first, at ``URGENT`` priority so that the conversion goes
+ahead of queued background work, and answers once the paper is ready.
+Readers of the same paper share one fetch. A reader that gives up waiting
+leaves the fetch running, so that a later read finds the paper.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict
+from urllib.parse import urlparse
+import mcp.types as types
+from ..admission import URGENT, current_priority
+from ..config import get_settings
+from ..identity import PaperId
+from ..tools.download import handle_download
+from .listing import SCHEME, read_paper_resource, stored_key, uri_paper_id
+
+logger = logging.getLogger("arxiv-mcp-server")
+settings = get_settings()
+
+paper_template = types.ResourceTemplate(
+    uriTemplate=f"{SCHEME}://{{paper_id}}",
+    name="arxiv-paper",
+    title="arXiv paper",
+    description="The markdown of an arXiv paper, e.g. arxiv://2401.12345v2; without a version, the newest stored or else the latest version. Papers that are not stored are downloaded and converted on first read.",
+    mimeType="text/markdown",
+)
+
+# Fetches of the papers being read, by requested storage key
+_fetches: Dict[str, asyncio.Task] = {}
+
+
+async def _fetch(requested: PaperId) -> Dict[str, Any]:
+    """Download and convert a paper, and wait until the work on it ended.
+
+    Returns:
+        Dict[str, Any]: The status the download answered with.
+    """
+    # The conversion task started below inherits the priority
+    current_priority.set(URGENT)
+    response = await handle_download(
+        {
+            "paper_id": requested.canonical,
+            "wait": True,
+            "timeout": settings.DOWNLOAD_WAIT_TIMEOUT,
+        }
+    )
+    return json.loads(response[0].text)
+
+
+def _forget(key: str, fetch: asyncio.Task) -> None:
+    """Drop a finished fetch, so that the next miss starts a new one."""
+    if _fetches.get(key) is fetch:
+        del _fetches[key]
+    if not fetch.cancelled() and fetch.exception():
+        logger.warning(f"Could not fetch {key}: {fetch.exception()}")
+
+
+async def fetch_paper(requested: PaperId, timeout: float) -> None:
+    """Fetch a paper that is not stored, sharing the fetch between readers.
+
+    Args:
+        requested: The paper, and possibly its version, to fetch.
+        timeout: The most seconds to wait for the paper.
+
+    Raises:
+        ValueError: If the paper could not be fetched, or was not ready in
+            time.
+    """
+    key = requested.key
+    fetch = _fetches.get(key)
+    if fetch is None:
+        fetch = _fetches[key] = asyncio.create_task(_fetch(requested))
+        fetch.add_done_callback(lambda task: _forget(key, task))
+    try:
+        # Giving up waiting does not cancel the fetch for the other readers
+        status = await asyncio.wait_for(asyncio.shield(fetch), timeout)
+    except asyncio.TimeoutError:
+        raise ValueError(
+            f"Paper {requested} is not ready after {timeout:g} seconds; it is still being converted, read it again later"
+        ) from None
+    if status.get("status") in ("downloading", "converting"):
+        raise ValueError(
+            f"Paper {requested} is not ready yet; it is still being converted, read it again later"
+        )
+    if status.get("status") != "success":
+        raise ValueError(f"Could not fetch paper {requested}: {status['message']}")
+
+
+async def read_through(uri: str, timeout: float) -> str:
+    """Read the markdown of a paper resource, fetching the paper if needed.
+
+    Args:
+        uri: An ``arxiv://`` URI, or the ``file://`` URI of a stored paper.
+        timeout: The most seconds to wait for a paper that is not stored.
+
+    Raises:
+        ValueError: If the URI names no paper, or the paper could not be
+            fetched in time.
+    """
+    if urlparse(uri).scheme == SCHEME and not await asyncio.to_thread(stored_key, uri):
+        await fetch_paper(uri_paper_id(uri), timeout)
+    return await asyncio.to_thread(read_paper_resource, uri)
@@ -3,26 +3,70 @@ Arxiv MCP Server
 ===============
 
 This module implements an MCP server for interacting with arXiv.
+
+The server talks to one client over stdio, or, with ``TRANSPORT=sse``,
+to any number of clients over HTTP with server-sent events on
+``HOST``:``PORT``. A network server is a single long-lived process, so
+all its clients share its warm store index, caches and workers.
 """
 
+import asyncio
+import itertools
+import json
 import logging
+import weakref
 import mcp.types as types
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
+from pydantic import AnyUrl
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions
 from mcp.server.stdio import stdio_server
-from .config import Settings
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from .admission import Busy, admission, current_client
+from .config import get_settings
+from .deadlines import ToolTimeout, deadline
+from .freshness import freshness_loop
+from .progress import ProgressNotifier, current_progress
+from .resources import (
+    ResourceListNotifier,
+    list_paper_resources,
+    paper_template,
+    read_through,
+)
 from .tools import handle_search, handle_download, handle_list_papers, handle_read_paper
-from .tools import search_tool, download_tool, list_tool, read_tool
+from .tools import handle_storage_stats, handle_usage_stats
+from .tools import search_tool, download_tool, list_tool, read_tool, storage_stats_tool
+from .tools import usage_stats_tool
+from .tools.download import (
+    active_paper_ids,
+    conversion_statuses,
+    open_job_table,
+    plan_recovery,
+    recover,
+    wait_timeout,
+)
+from .storage import default_store
+from .storage.index import watch_loop
+from .storage.maintenance import maintenance_loop
+from .storage.peers import start_peer_server
 from .prompts.handlers import list_prompts as handler_list_prompts
 from .prompts.handlers import get_prompt as handler_get_prompt
 
-settings = Settings()
+settings = get_settings()
 logger = logging.getLogger("arxiv-mcp-server")
 logger.setLevel(logging.INFO)
 server = Server(settings.APP_NAME)
 
+TRANSPORTS = ("stdio", "sse")
+
+# Tells the clients that listed the resources when papers come and go
+resource_notifier = ResourceListNotifier()
+
 
 @server.list_prompts()
 async def list_prompts() -> List[types.Prompt]:
@@ -38,44 +82,276 @@ async def get_prompt(
     return await handler_get_prompt(name, arguments)
 
 
+@server.list_resources()
+async def list_resources(
+    request: types.ListResourcesRequest,
+) -> types.ListResourcesResult:
+    """List the stored papers, one page at a time."""
+    try:
+        resource_notifier.watch(server.request_context.session)
+    except LookupError:
+        pass
+    cursor = request.params.cursor if request.params else None
+    return await asyncio.to_thread(
+        list_paper_resources, cursor, settings.RESOURCE_PAGE_SIZE
+    )
+
+
+@server.list_resource_templates()
+async def list_resource_templates() -> List[types.ResourceTemplate]:
+    """List the templates of paper resources."""
+    return [paper_template]
+
+
+@server.read_resource()
+async def read_resource(uri: AnyUrl) -> Iterable[ReadResourceContents]:
+    """Read a paper's markdown, downloading the paper if it is not stored."""
+    # A paper fetched for the read is converted on behalf of the client
+    current_client.set(client_id())
+    content = await read_through(str(uri), settings.RESOURCE_READ_TIMEOUT)
+    return [ReadResourceContents(content=content, mime_type="text/markdown")]
+
+
 @server.list_tools()
 async def list_tools() -> List[types.Tool]:
     """List available arXiv research tools."""
-    return [search_tool, download_tool, list_tool, read_tool]
+    return [
+        search_tool,
+        download_tool,
+        list_tool,
+        read_tool,
+        storage_stats_tool,
+        usage_stats_tool,
+    ]
+
+
+TOOL_HANDLERS = {
+    "search_papers": handle_search,
+    "download_paper": handle_download,
+    "list_papers": handle_list_papers,
+    "read_paper": handle_read_paper,
+    "storage_stats": handle_storage_stats,
+    "usage_stats": handle_usage_stats,
+}
+
+# Names of the connected clients, by session
+_client_ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+_sessions = itertools.count(1)
+
+
+def client_id() -> str:
+    """Name the client of the current request.
+
+    Clients are known by the name they gave when connecting, so that all
+    sessions of one client share its weight, quotas and counters. Clients
+    without a name are told apart by session.
+    """
+    try:
+        session = server.request_context.session
+    except LookupError:
+        return current_client.get()
+    if session not in _client_ids:
+        params = session.client_params
+        name = params.clientInfo.name if params else ""
+        _client_ids[session] = name or f"session-{next(_sessions)}"
+    return _client_ids[session]
+
+
+def progress_notifier() -> Optional[ProgressNotifier]:
+    """Get a sender of progress notifications for the current request.
+
+    Returns:
+        Optional[ProgressNotifier]: None if the client sent no progress
+        token with the request.
+    """
+    try:
+        context = server.request_context
+    except LookupError:
+        return None
+    token = context.meta.progressToken if context.meta else None
+    if token is None:
+        return None
+
+    async def notify(progress: float, total: float | None, message: str) -> None:
+        await context.session.send_progress_notification(
+            token,
+            progress,
+            total,
+            message or None,
+            related_request_id=context.request_id,
+        )
+
+    return notify
+
+
+def _status(status: str, message: str, **fields: Any) -> List[types.TextContent]:
+    """Answer a call that the tool did not handle with a status object."""
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps({"status": status, "message": message, **fields}),
+        )
+    ]
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls for arXiv research functionality."""
     logger.debug(f"Calling tool {name} with arguments {arguments}")
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        return [types.TextContent(type="text", text=f"Error: Unknown tool {name}")]
+    client = client_id()
+    # Background work started by the call is done on behalf of the client
+    current_client.set(client)
+    current_progress.set(progress_notifier())
+    timeout = settings.TOOL_TIMEOUTS.get(name, settings.REQUEST_TIMEOUT)
+    if timeout > 0 and name == "download_paper":
+        # Waiting for the conversion does not count against the deadline
+        timeout += wait_timeout(arguments)
     try:
-        if name == "search_papers":
-            return await handle_search(arguments)
-        elif name == "download_paper":
-            return await handle_download(arguments)
-        elif name == "list_papers":
-            return await handle_list_papers(arguments)
-        elif name == "read_paper":
-            return await handle_read_paper(arguments)
-        else:
-            return [types.TextContent(type="text", text=f"Error: Unknown tool {name}")]
+        # The deadline covers the wait for a slot as well
+        async with deadline(name, timeout):
+            async with admission.slot(name, client):
+                return await handler(arguments)
+    except Busy as e:
+        logger.warning(f"Turned away a {name} call of {client}: {e}")
+        return _status(e.status, str(e), retry_after=e.retry_after)
+    except ToolTimeout as e:
+        logger.warning(f"Gave up a {name} call of {client}: {e}")
+        return _status("timeout", str(e), timeout=e.timeout)
     except Exception as e:
         logger.error(f"Tool error: {str(e)}")
         return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+def initialization_options() -> InitializationOptions:
+    """Get the options announced to each client that connects."""
+    return InitializationOptions(
+        server_name=settings.APP_NAME,
+        server_version=settings.APP_VERSION,
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(resources_changed=True),
+            experimental_capabilities={},
+        ),
+    )
+
+
+def sse_app() -> Starlette:
+    """Build the application serving clients over HTTP with server-sent events.
+
+    Clients open an event stream at ``/sse`` and post their messages to the
+    ``/messages/`` endpoint it names; each stream is one MCP session.
+    """
+    # Loads the HTTP server too, which stdio sessions do without
+    from mcp.server.sse import SseServerTransport
+
+    transport = SseServerTransport("/messages/")
+
+    async def handle_sse(request: Request) -> Response:
+        async with transport.connect_sse(
+            request.scope, request.receive, request._send
+        ) as streams:
+            await server.run(streams[0], streams[1], initialization_options())
+        return Response()
+
+    return Starlette(
+        routes=[
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=transport.handle_post_message),
+        ]
+    )
+
+
+async def serve() -> None:
+    """Serve clients over the configured ``TRANSPORT``."""
+    if settings.TRANSPORT == "sse":
+        import uvicorn
+
+        logger.info(f"Serving MCP over SSE on {settings.HOST}:{settings.PORT}")
+        config = uvicorn.Config(
+            sse_app(), host=settings.HOST, port=settings.PORT, log_level="warning"
+        )
+        await uvicorn.Server(config).serve()
+    else:
+        async with stdio_server() as streams:
+            await server.run(streams[0], streams[1], initialization_options())
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    """Log the error of a failed background task."""
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background task failed: {task.exception()}")
+
+
 async def main():
     """Run the server async context."""
-    async with stdio_server() as streams:
-        await server.run(
-            streams[0],
-            streams[1],
-            InitializationOptions(
-                server_name=settings.APP_NAME,
-                server_version=settings.APP_VERSION,
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(resources_changed=True),
-                    experimental_capabilities={},
-                ),
-            ),
+    if settings.TRANSPORT not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport {settings.TRANSPORT}; use one of {', '.join(TRANSPORTS)}"
+        )
+    # Index the stored papers, and move those stored by an earlier layout
+    # into their shards
+    store = await asyncio.to_thread(default_store)
+    resource_notifier.attach(store, asyncio.get_running_loop())
+    if store.layout != "flat":
+        migration = asyncio.create_task(asyncio.to_thread(store.migrate))
+        migration.add_done_callback(_log_failure)
+
+    # Persist job statuses, and resume the work a restart interrupted. The
+    # papers to resume are marked active first, so that garbage collection
+    # leaves their downloads alone
+    interrupted = await asyncio.to_thread(open_job_table)
+    recovery = None
+    if settings.RECOVER_JOBS:
+        plan = await asyncio.to_thread(plan_recovery, interrupted)
+        if plan:
+            recovery = asyncio.create_task(recover(plan))
+            recovery.add_done_callback(_log_failure)
+
+    # Collect leftovers of interrupted work and keep the store within quota
+    maintenance = None
+    if settings.STORAGE_GC_INTERVAL > 0:
+        maintenance = asyncio.create_task(
+            maintenance_loop(
+                store,
+                settings.STORAGE_GC_INTERVAL,
+                settings.STORAGE_QUOTA_MB * 1024 * 1024,
+                active_paper_ids,
+                settings.STORAGE_GC_GRACE_PERIOD,
+            )
+        )
+    # Pick up papers added to or removed from the storage from outside
+    watch = None
+    if settings.STORAGE_INDEX_WATCH_INTERVAL > 0:
+        watch = asyncio.create_task(
+            watch_loop(store, settings.STORAGE_INDEX_WATCH_INTERVAL)
         )
+    # Look for new versions of stored papers
+    freshness = None
+    if settings.FRESHNESS_CHECK_INTERVAL > 0:
+        freshness = asyncio.create_task(
+            freshness_loop(
+                store,
+                settings.FRESHNESS_CHECK_INTERVAL,
+                settings.FRESHNESS_BATCH_SIZE,
+                settings.FRESHNESS_AUTO_REFRESH,
+            )
+        )
+    # Answer other servers asking for the papers converted here
+    peer_server = None
+    if settings.PEER_PORT and not settings.PEER_TOKEN:
+        logger.error("Not serving papers to peers: PEER_TOKEN is not set")
+    elif settings.PEER_PORT:
+        peer_server = await start_peer_server(
+            store, settings.PEER_HOST, settings.PEER_PORT, settings.PEER_TOKEN
+        )
+    try:
+        await serve()
+    finally:
+        for task in (recovery, maintenance, watch, freshness):
+            if task:
+                task.cancel()
+        if peer_server:
+            await peer_server.cleanup()
+        conversion_statuses.close()
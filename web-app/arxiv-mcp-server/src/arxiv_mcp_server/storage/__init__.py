@@ -0,0 +1,23 @@
+"""Storage layer for downloaded and converted arXiv papers."""
+
+from .backends import StorageBackend, open_backend
+from .cache import ConversionCache, CONVERTER_VERSION
+from .metadata import METADATA_SUFFIX, read_metadata, update_metadata
+from .store import PaperStore, default_store
+from .maintenance import collect_garbage, enforce_quota, maintain, storage_stats
+
+__all__ = [
+    "StorageBackend",
+    "open_backend",
+    "ConversionCache",
+    "CONVERTER_VERSION",
+    "METADATA_SUFFIX",
+    "read_metadata",
+    "update_metadata",
+    "PaperStore",
+    "default_store",
+    "collect_garbage",
+    "enforce_quota",
+    "maintain",
+    "storage_stats",
+]
@@ -0,0 +1,231 @@
+"""Backends for a converted-paper corpus shared between servers.
+
+Every server keeps its papers in a local ``PaperStore``, where they are
+downloaded, converted, compressed and evicted. A shared backend, chosen
+with the ``STORAGE_BACKEND`` setting, sits behind it: converted papers are
+published to the backend, and a paper missing locally is looked up there
+before it is downloaded and converted again. A fleet of servers thus
+converts each paper once.
+
+A backend is a flat key-value store of files named ``<paper_id><suffix>``:
+
+- ``file:///path`` keeps them in a directory, e.g. on a network mount.
+- ``sqlite:///path/papers.db`` keeps them in a single SQLite file.
+- ``s3://bucket/prefix`` keeps them in an S3-compatible object store, see
+  ``storage.s3``.
+
+Other servers can also be asked directly for the papers they converted,
+see ``storage.peers``. ``LayeredBackend`` combines both.
+"""
+
+import abc
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional
+from urllib.parse import urlsplit
+
+BACKEND_SCHEMES = ("file", "sqlite", "s3")
+
+
+class StorageBackend(abc.ABC):
+    """A flat store of files, by key."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a file, or return None if it does not exist."""
+
+    @abc.abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Write a file, replacing it atomically if it exists."""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a file; deleting a missing file is not an error."""
+
+    def exists(self, key: str) -> bool:
+        """Check whether a file exists."""
+        return self.get(key) is not None
+
+    @abc.abstractmethod
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the keys starting with ``prefix``."""
+
+
+class LocalBackend(StorageBackend):
+    """Files in a directory, e.g. on a volume mounted by every server."""
+
+    def __init__(self, root: Path):
+        """Initialize the backend in ``root``, creating it if needed."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key.replace("/", "_")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a file, or return None if it does not exist."""
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write a file, replacing it atomically if it exists."""
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{path.name}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        """Delete a file; deleting a missing file is not an error."""
+        self._path(key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        """Check whether a file exists."""
+        return self._path(key).exists()
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the keys starting with ``prefix``."""
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(prefix) and not entry.name.startswith("."):
+                yield entry.name
+
+
+class SQLiteBackend(StorageBackend):
+    """Files as blobs in a single SQLite database."""
+
+    def __init__(self, path: Path):
+        """Initialize the backend in the database at ``path``."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files (key TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a file, or return None if it does not exist."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM files WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write a file, replacing it atomically if it exists."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (key, data) VALUES (?, ?)", (key, data)
+            )
+            self._db.commit()
+
+    def delete(self, key: str) -> None:
+        """Delete a file; deleting a missing file is not an error."""
+        with self._lock:
+            self._db.execute("DELETE FROM files WHERE key = ?", (key,))
+            self._db.commit()
+
+    def exists(self, key: str) -> bool:
+        """Check whether a file exists."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM files WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the keys starting with ``prefix``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM files WHERE substr(key, 1, ?) = ? ORDER BY key",
+                (len(prefix), prefix),
+            ).fetchall()
+        for (key,) in rows:
+            yield key
+
+
+class LayeredBackend(StorageBackend):
+    """Several backends, read in order and written together."""
+
+    def __init__(self, layers: List[StorageBackend]):
+        """Initialize the backend from its layers, in the order to read them."""
+        self.layers = layers
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a file from the first layer that has it."""
+        for layer in self.layers:
+            data = layer.get(key)
+            if data is not None:
+                return data
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write a file to every layer, even if writing to one fails."""
+        error = None
+        for layer in self.layers:
+            try:
+                layer.put(key, data)
+            except Exception as e:
+                error = error or e
+        if error:
+            raise error
+
+    def delete(self, key: str) -> None:
+        """Delete a file from every layer."""
+        for layer in self.layers:
+            layer.delete(key)
+
+    def exists(self, key: str) -> bool:
+        """Check whether any layer has a file."""
+        return any(layer.exists(key) for layer in self.layers)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the keys starting with ``prefix`` in any layer."""
+        seen = set()
+        for layer in self.layers:
+            for key in layer.list_keys(prefix):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+
+def open_backend(url: str, settings=None) -> Optional[StorageBackend]:
+    """Open the shared backend a ``STORAGE_BACKEND`` URL names.
+
+    Args:
+        url: The backend URL, or an empty string for none.
+        settings: Settings with the ``S3_*`` credentials, for ``s3://``.
+
+    Returns:
+        Optional[StorageBackend]: The backend, or None if ``url`` is empty.
+
+    Raises:
+        ValueError: If the URL scheme is not one of ``BACKEND_SCHEMES``.
+    """
+    if not url or url == "none":
+        return None
+    parts = urlsplit(url)
+    if parts.scheme == "file":
+        return LocalBackend(Path(parts.netloc + parts.path))
+    if parts.scheme == "sqlite":
+        return SQLiteBackend(Path(parts.netloc + parts.path))
+    if parts.scheme == "s3":
+        from .s3 import S3Backend
+
+        return S3Backend(
+            parts.netloc,
+            prefix=parts.path,
+            endpoint=getattr(settings, "S3_ENDPOINT_URL", ""),
+            region=getattr(settings, "S3_REGION", "us-east-1"),
+            access_key=getattr(settings, "S3_ACCESS_KEY_ID", ""),
+            secret_key=getattr(settings, "S3_SECRET_ACCESS_KEY", ""),
+        )
+    raise ValueError(
+        f"Unknown storage backend {url}; use a {', '.join(BACKEND_SCHEMES)} URL"
+    )
@@ -0,0 +1,167 @@
+"""Content-addressed cache of converted papers.
+
+Converted artifacts are stored under the SHA-256 of the source PDF plus
+the converter version, so an identical PDF is never converted twice,
+whatever paper ID or version alias it was requested under. Paper IDs are
+mapped onto source hashes (PDF, and LaTeX e-print where used) through
+small ref files, which lets a cache hit skip the download as well. Every
+write is published with an atomic rename, so one cache directory can be
+shared between processes and machines.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+from ..converters import converter_version
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Converter version of the default tier, used when callers do not pass one
+CONVERTER_VERSION = converter_version()
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Ref file keys for each kind of downloaded input
+_REF_KEYS = {"pdf": "sha256", "latex": "source_sha256"}
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_copy(src: Path, dest: Path) -> None:
+    """Copy ``src`` to ``dest`` so that readers never see a partial file."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ConversionCache:
+    """Content-addressed store of converted artifacts keyed by PDF hash."""
+
+    def __init__(self, root: Path):
+        """Initialize the cache rooted at ``root``."""
+        self.root = Path(root)
+        self.objects_path = self.root / "objects"
+        self.refs_path = self.root / "refs"
+
+    def _entry_path(self, digest: str, converter: str) -> Path:
+        """Get the directory holding the artifacts for one PDF and converter."""
+        return self.objects_path / digest[:2] / digest / converter
+
+    def _ref_path(self, paper_id: str) -> Path:
+        """Get the ref file mapping a paper ID onto a PDF hash."""
+        return self.refs_path / f"{quote(paper_id, safe='')}.json"
+
+    def get(self, digest: str, converter: str = CONVERTER_VERSION) -> Optional[Path]:
+        """Return the artifact directory for a PDF hash, or None on a miss."""
+        entry = self._entry_path(digest, converter)
+        return entry if entry.is_dir() else None
+
+    def put(
+        self,
+        digest: str,
+        artifacts: Dict[str, Path],
+        converter: str = CONVERTER_VERSION,
+    ) -> Path:
+        """Store converted artifacts for a PDF hash.
+
+        Args:
+            digest: SHA-256 of the source PDF.
+            artifacts: Mapping of artifact name (e.g. ``paper.md``) to the file
+                holding it.
+            converter: Converter version that produced the artifacts.
+
+        Returns:
+            Path: The artifact directory in the cache.
+        """
+        entry = self._entry_path(digest, converter)
+        if entry.is_dir():
+            return entry
+
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".staging-"))
+        try:
+            for name, src in artifacts.items():
+                shutil.copyfile(src, staging / name)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another writer published the same entry first
+                if not entry.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return entry
+
+    def restore(
+        self,
+        digest: str,
+        destinations: Dict[str, Path],
+        converter: str = CONVERTER_VERSION,
+    ) -> bool:
+        """Copy cached artifacts for a PDF hash into place.
+
+        Args:
+            digest: SHA-256 of the source PDF.
+            destinations: Mapping of artifact name to its destination path.
+                Artifacts missing from the entry are skipped.
+            converter: Converter version whose output is wanted.
+
+        Returns:
+            bool: True if the entry exists and was restored.
+        """
+        entry = self.get(digest, converter)
+        if entry is None:
+            return False
+
+        for name, dest in destinations.items():
+            src = entry / name
+            if src.exists():
+                _atomic_copy(src, dest)
+        return True
+
+    def _read_ref(self, paper_id: str) -> Dict[str, str]:
+        try:
+            with open(self._ref_path(paper_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def link(self, paper_id: str, digest: str, kind: str = "pdf") -> None:
+        """Record that ``paper_id`` resolved to the input with ``digest``.
+
+        Args:
+            paper_id: The requested paper ID.
+            digest: SHA-256 of the downloaded input.
+            kind: The input kind, ``pdf`` or ``latex``.
+        """
+        ref = self._ref_path(paper_id)
+        data = self._read_ref(paper_id)
+        data.update({"paper_id": paper_id, _REF_KEYS[kind]: digest})
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=ref.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, ref)
+
+    def lookup(self, paper_id: str, kind: str = "pdf") -> Optional[str]:
+        """Return the input hash of a given kind recorded for ``paper_id``."""
+        return self._read_ref(paper_id).get(_REF_KEYS[kind])
@@ -0,0 +1,100 @@
+"""Maintenance commands for the paper store.
+
+Usage:
+    arxiv-mcp-storage compress [--codec gzip|zstd|none] [--storage-path PATH]
+    arxiv-mcp-storage stats [--storage-path PATH]
+    arxiv-mcp-storage gc [--quota-mb MB] [--storage-path PATH]
+    arxiv-mcp-storage migrate [--layout flat|yymm|hash] [--storage-path PATH]
+
+``compress`` migrates an existing library to a compression codec, defaulting
+to ``STORAGE_COMPRESSION``; ``--codec none`` decompresses it again. Each file
+is rewritten before its old variant is removed, so the server may keep
+running meanwhile.
+
+``stats`` prints what the store holds. ``gc`` removes leftovers of
+interrupted downloads and failed conversions, then evicts least recently
+read files down to the quota (``STORAGE_QUOTA_MB`` by default). Files
+modified within ``STORAGE_GC_GRACE_PERIOD`` are kept, so that work in
+progress in a running server is not disturbed.
+
+``migrate`` moves every file into its shard directory under a layout,
+defaulting to ``STORAGE_LAYOUT``. The server also does this at startup, and
+finds files at either location meanwhile. After migrating to another layout
+than the configured one, update ``STORAGE_LAYOUT`` to match.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+from ..config import get_settings
+from .maintenance import maintain, storage_stats
+from .store import LAYOUTS, PaperStore
+
+
+def _compress(store: PaperStore, codec: Optional[str]) -> None:
+    before, after = store.compress_all(codec)
+    saved = 1 - after / before if before else 0
+    print(
+        f"{store.root}: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+        f"({saved:.0%} saved)"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a storage maintenance command."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="arxiv-mcp-storage", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--storage-path", help="paper storage location (default: ARXIV_STORAGE_PATH)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    compress = commands.add_parser("compress", help="re-encode stored papers")
+    compress.add_argument(
+        "--codec",
+        choices=("gzip", "zstd", "none"),
+        default=settings.STORAGE_COMPRESSION,
+    )
+    commands.add_parser("stats", help="show what the store holds")
+    gc = commands.add_parser("gc", help="collect garbage and enforce the quota")
+    gc.add_argument(
+        "--quota-mb",
+        type=int,
+        default=settings.STORAGE_QUOTA_MB,
+        help="size limit in MB; 0 for none (default: STORAGE_QUOTA_MB)",
+    )
+    migrate = commands.add_parser("migrate", help="move files into shard directories")
+    migrate.add_argument("--layout", choices=LAYOUTS, default=settings.STORAGE_LAYOUT)
+    args = parser.parse_args(argv)
+
+    store = PaperStore(
+        args.storage_path or settings.STORAGE_PATH,
+        layout=getattr(args, "layout", settings.STORAGE_LAYOUT),
+    )
+    if args.command == "compress":
+        _compress(store, None if args.codec == "none" else args.codec)
+    elif args.command == "stats":
+        quota_bytes = settings.STORAGE_QUOTA_MB * 1024 * 1024
+        print(json.dumps(storage_stats(store, quota_bytes), indent=2))
+    elif args.command == "gc":
+        result = maintain(
+            store,
+            args.quota_mb * 1024 * 1024,
+            grace_period=settings.STORAGE_GC_GRACE_PERIOD,
+        )
+        collected = result["collected"]
+        print(
+            f"{store.root}: removed {collected['files']} stale files "
+            f"({collected['bytes'] / 1e6:.1f} MB), evicted {result['evicted']} files"
+        )
+    elif args.command == "migrate":
+        print(
+            f"{store.root}: moved {store.migrate()} files into the {store.layout} layout"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Framed compression for stored papers.
+
+Files are compressed in independent frames of ``FRAME_SIZE`` uncompressed
+bytes, so that a byte range can be read by decompressing only the frames it
+touches. Both formats stay readable by the standard tools:
+
+- ``gzip`` files are a series of gzip members. Like BGZF, each member's
+  header carries its own compressed size in an extra field, and the frame
+  index is rebuilt by hopping from header to header.
+- ``zstd`` files are a series of zstd frames followed by a seek table in a
+  skippable frame, as in the zstd seekable format.
+
+zstd needs the optional ``zstandard`` package; gzip is always available.
+"""
+
+import gzip
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional
+    zstandard = None
+
+CODECS = ("gzip", "zstd")
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+FRAME_SIZE = 256 * 1024
+
+# gzip member header: magic, CM=deflate, FLG=FEXTRA, MTIME, XFL, OS=unknown,
+# XLEN, then one "AX" subfield holding the member's total size minus one
+_GZIP_HEADER = struct.Struct("<4sIBBH2sHI")
+_GZIP_MAGIC = b"\x1f\x8b\x08\x04"
+_GZIP_SUBFIELD = b"AX"
+
+# zstd seekable format: skippable frame with one (compressed, decompressed)
+# size pair per frame, followed by a footer
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A5E
+_ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+_ZSTD_FOOTER = struct.Struct("<IBI")
+
+# (compressed offset, compressed size, uncompressed offset, uncompressed size)
+Frame = Tuple[int, int, int, int]
+
+
+def available_codecs() -> Tuple[str, ...]:
+    """List the codecs usable in this environment."""
+    return tuple(codec for codec in CODECS if codec != "zstd" or zstandard)
+
+
+def codec_for(path: Path) -> Optional[str]:
+    """Get the codec of a stored file from its suffix, or None if plain."""
+    for codec, suffix in SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return codec
+    return None
+
+
+def _require(codec: str) -> None:
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec}; use one of {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+
+def _gzip_frame(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+    trailer = struct.pack("<II", zlib.crc32(data), len(data) & 0xFFFFFFFF)
+    size = _GZIP_HEADER.size + len(body) + len(trailer)
+    header = _GZIP_HEADER.pack(_GZIP_MAGIC, 0, 0, 255, 8, _GZIP_SUBFIELD, 4, size - 1)
+    return header + body + trailer
+
+
+def _zstd_seek_table(sizes: List[Tuple[int, int]]) -> bytes:
+    entries = b"".join(struct.pack("<II", c, d) for c, d in sizes)
+    footer = _ZSTD_FOOTER.pack(len(sizes), 0, _ZSTD_SEEKABLE_MAGIC)
+    payload = entries + footer
+    return struct.pack("<II", _ZSTD_SKIPPABLE_MAGIC, len(payload)) + payload
+
+
+def compress_bytes(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    """Compress ``data`` into independent frames.
+
+    Raises:
+        ValueError: If the codec is unknown or not available.
+    """
+    _require(codec)
+    chunks = [data[i : i + FRAME_SIZE] for i in range(0, len(data), FRAME_SIZE)]
+    if codec == "gzip":
+        return b"".join(_gzip_frame(chunk, level or 6) for chunk in chunks)
+
+    compressor = zstandard.ZstdCompressor(level=level or 9)
+    frames = [compressor.compress(chunk) for chunk in chunks]
+    sizes = [(len(frame), len(chunk)) for frame, chunk in zip(frames, chunks)]
+    return b"".join(frames) + _zstd_seek_table(sizes)
+
+
+def frame_index(path: Path) -> List[Frame]:
+    """Read the frame index of a compressed file.
+
+    Returns:
+        List[Frame]: One entry per frame, in file order.
+
+    Raises:
+        ValueError: If the file was not written by ``compress_bytes``.
+    """
+    codec = codec_for(path)
+    frames = []
+    with open(path, "rb") as f:
+        if codec == "gzip":
+            offset = raw_offset = 0
+            end = path.stat().st_size
+            while offset < end:
+                f.seek(offset)
+                header = f.read(_GZIP_HEADER.size)
+                if len(header) < _GZIP_HEADER.size:
+                    raise ValueError(f"{path.name} has a truncated frame")
+                magic, _, _, _, _, subfield, _, size = _GZIP_HEADER.unpack(header)
+                if magic != _GZIP_MAGIC or subfield != _GZIP_SUBFIELD:
+                    raise ValueError(f"{path.name} is not a framed gzip file")
+                f.seek(offset + size + 1 - 4)
+                (raw_size,) = struct.unpack("<I", f.read(4))
+                frames.append((offset, size + 1, raw_offset, raw_size))
+                offset += size + 1
+                raw_offset += raw_size
+            return frames
+
+        f.seek(-_ZSTD_FOOTER.size, os.SEEK_END)
+        count, _, magic = _ZSTD_FOOTER.unpack(f.read(_ZSTD_FOOTER.size))
+        if magic != _ZSTD_SEEKABLE_MAGIC:
+            raise ValueError(f"{path.name} has no zstd seek table")
+        f.seek(-_ZSTD_FOOTER.size - 8 * count, os.SEEK_END)
+        table = f.read(8 * count)
+    offset = raw_offset = 0
+    for i in range(count):
+        size, raw_size = struct.unpack_from("<II", table, 8 * i)
+        frames.append((offset, size, raw_offset, raw_size))
+        offset += size
+        raw_offset += raw_size
+    return frames
+
+
+def _decompress_frame(frame: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(frame)
+    return zstandard.ZstdDecompressor().decompress(frame)
+
+
+def read_range(path: Path, start: int = 0, length: Optional[int] = None) -> bytes:
+    """Read uncompressed bytes ``[start, start + length)`` of a stored file.
+
+    Plain files are read directly; compressed files only decompress the
+    frames that overlap the range.
+    """
+    codec = codec_for(path)
+    if codec is None:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return f.read() if length is None else f.read(length)
+
+    _require(codec)
+    end = None if length is None else start + length
+    parts = []
+    with open(path, "rb") as f:
+        for offset, size, raw_offset, raw_size in frame_index(path):
+            if raw_offset + raw_size <= start:
+                continue
+            if end is not None and raw_offset >= end:
+                break
+            f.seek(offset)
+            data = _decompress_frame(f.read(size), codec)
+            stop = None if end is None else end - raw_offset
+            parts.append(data[max(0, start - raw_offset) : stop])
+    return b"".join(parts)
+
+
+def read_bytes(path: Path) -> bytes:
+    """Read a stored file, decompressing it if needed."""
+    return read_range(path)
+
+
+def write_file(path: Path, data: bytes, codec: Optional[str] = None) -> Path:
+    """Atomically write ``data`` to ``path``, compressed if ``codec`` is given.
+
+    Returns:
+        Path: The written file; the codec's suffix is appended to ``path``.
+    """
+    if codec:
+        data = compress_bytes(data, codec)
+        path = path.with_name(path.name + SUFFIXES[codec])
+    tmp_path = path.with_name(path.name + ".part")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,109 @@
+"""In-memory index of stored papers.
+
+Built once by walking the store, then kept current by the store itself as
+files are published, recoded, moved and deleted. Existence checks and paper
+listings become dictionary lookups instead of directory scans.
+
+Files added or removed behind the store's back, e.g. copied in by hand, are
+picked up by ``PaperStore.rescan_changed``, which only rescans directories
+whose modification time changed. ``watch_loop`` runs it periodically.
+
+Whenever a paper's markdown appears or disappears, the index calls its
+``listeners``, e.g. to tell clients that the list of resources changed.
+They may be called from any thread.
+"""
+
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from ..identity import base_key
+
+if TYPE_CHECKING:
+    from .store import PaperStore
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+class PaperIndex:
+    """The stored variant of every indexed file, by paper ID and suffix."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._papers: Dict[str, Dict[str, Path]] = {}
+        # Keys of the versions with stored markdown, by key without version
+        self._versions: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Modification times (ns) of the directories as last scanned
+        self.directories: Dict[Path, int] = {}
+        # Called when the set of papers with stored markdown changes
+        self.listeners: List[Callable[[], None]] = []
+
+    def get(self, paper_id: str, suffix: str) -> Optional[Path]:
+        """Get the stored path of a paper's file, or None if it is not stored."""
+        files = self._papers.get(paper_id)
+        return files.get(suffix) if files else None
+
+    def set(self, paper_id: str, suffix: str, path: Optional[Path]) -> None:
+        """Record where a paper's file is stored, or that it is gone (None)."""
+        changed = False
+        with self._lock:
+            if suffix == ".md":
+                versions = self._versions.setdefault(base_key(paper_id), set())
+                changed = (paper_id in versions) != (path is not None)
+                if path is not None:
+                    versions.add(paper_id)
+                else:
+                    versions.discard(paper_id)
+            if path is not None:
+                self._papers.setdefault(paper_id, {})[suffix] = path
+            else:
+                files = self._papers.get(paper_id)
+                if files:
+                    files.pop(suffix, None)
+                    if not files:
+                        del self._papers[paper_id]
+        if changed:
+            for listener in self.listeners:
+                listener()
+
+    def versions(self, base: str) -> Set[str]:
+        """Get the keys of a paper's versions with stored markdown."""
+        with self._lock:
+            return set(self._versions.get(base, ()))
+
+    def paper_ids(self, suffix: str = ".md") -> List[str]:
+        """List the papers that have a file with ``suffix``, sorted."""
+        with self._lock:
+            return sorted(
+                paper_id for paper_id, files in self._papers.items() if suffix in files
+            )
+
+    def files_in(self, directory: Path) -> Set[Tuple[str, str]]:
+        """List the (paper ID, suffix) of the indexed files in a directory."""
+        with self._lock:
+            return {
+                (paper_id, suffix)
+                for paper_id, files in self._papers.items()
+                for suffix, path in files.items()
+                if path.parent == directory
+            }
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+
+async def watch_loop(store: "PaperStore", interval: float) -> None:
+    """Pick up outside changes to the store every ``interval`` seconds.
+
+    Runs until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = await asyncio.to_thread(store.rescan_changed)
+            if changed:
+                logger.info(f"Storage index picked up {changed} changed files")
+        except Exception as e:
+            logger.warning(f"Storage index rescan failed: {str(e)}")
@@ -0,0 +1,262 @@
+"""Storage quota enforcement and garbage collection.
+
+Left alone, the store only grows: PDFs are kept for later upgrades, and
+interrupted downloads and conversions leave partial files behind.
+``enforce_quota`` keeps the store under a size limit by evicting the least
+recently used files: PDFs and e-prints first, since they can be fetched
+again, then whole papers. ``collect_garbage`` removes stale partial files and
+files of papers whose conversion never finished. Both leave alone the papers
+that are being worked on, and files modified within a grace period.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional
+from .store import KINDS, PaperStore, classify
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+PAPER_KINDS = tuple(kind for kind, _ in KINDS)
+_SUFFIXES = dict(KINDS)
+
+# Inputs of a conversion, which can be downloaded again
+INPUT_KINDS = ("pdf", "source")
+
+# Eviction stops once usage is back under this share of the quota, so that
+# the next few downloads do not trigger another round straight away
+LOW_WATERMARK = 0.9
+
+
+@dataclass
+class StoredFile:
+    """A file in the store, as found by ``scan``."""
+
+    path: Path
+    kind: str  # one of KINDS, 'partial' or 'other'
+    paper_id: Optional[str]
+    size: int
+    accessed: float
+    modified: float
+
+
+def scan(store: PaperStore) -> List[StoredFile]:
+    """List every file in the store."""
+    files = []
+    for entry in store.walk():
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue  # Removed or moved into its shard meanwhile
+        kind, paper_id = classify(entry.name)
+        files.append(
+            StoredFile(
+                Path(entry.path),
+                kind,
+                paper_id,
+                stat.st_size,
+                stat.st_atime,
+                stat.st_mtime,
+            )
+        )
+    return files
+
+
+def _remove(store: PaperStore, files: Iterable[StoredFile]) -> int:
+    """Delete files, returning the bytes freed."""
+    freed = 0
+    for file in files:
+        try:
+            file.path.unlink()
+            freed += file.size
+        except FileNotFoundError:
+            pass
+        if file.kind in _SUFFIXES:
+            store.refresh(file.paper_id, _SUFFIXES[file.kind])
+    return freed
+
+
+def storage_stats(store: PaperStore, quota_bytes: int = 0) -> Dict[str, Any]:
+    """Summarize what the store holds.
+
+    Returns:
+        Dict[str, Any]: The number of papers, the total size, the file count
+        and size per kind, the quota and its usage, and when the least
+        recently read paper was last read.
+    """
+    files = scan(store)
+    by_kind: Dict[str, Dict[str, int]] = {}
+    for file in files:
+        entry = by_kind.setdefault(file.kind, {"files": 0, "bytes": 0})
+        entry["files"] += 1
+        entry["bytes"] += file.size
+    total = sum(file.size for file in files)
+    markdown = [file for file in files if file.kind == "markdown"]
+    oldest = min((file.accessed for file in markdown), default=None)
+    return {
+        "storage_path": str(store.root),
+        "papers": len({file.paper_id for file in markdown}),
+        "total_bytes": total,
+        "by_kind": by_kind,
+        "quota_bytes": quota_bytes or None,
+        "quota_used": round(total / quota_bytes, 3) if quota_bytes else None,
+        "least_recently_read": (
+            datetime.fromtimestamp(oldest).isoformat() if oldest else None
+        ),
+    }
+
+
+def collect_garbage(
+    store: PaperStore,
+    active: Collection[str] = (),
+    grace_period: float = 3600,
+    now: Optional[float] = None,
+) -> Dict[str, int]:
+    """Remove leftovers of interrupted and failed work.
+
+    That is partial files, and the PDF, e-print, references and metadata of
+    papers without markdown, i.e. papers whose conversion failed or whose
+    markdown was deleted. Files modified within ``grace_period`` seconds
+    are kept, as they may still be in use by another process.
+
+    Args:
+        store: The store to clean up.
+        active: IDs of papers being downloaded or converted.
+        grace_period: Minimum age of a file to remove, in seconds.
+        now: The current time, for tests.
+
+    Returns:
+        Dict[str, int]: The number of ``files`` removed and ``bytes`` freed.
+    """
+    cutoff = (now or time.time()) - grace_period
+    files = scan(store)
+    converted = {file.paper_id for file in files if file.kind == "markdown"}
+    garbage = [
+        file
+        for file in files
+        if file.modified < cutoff
+        and file.paper_id not in active
+        and (
+            file.kind == "partial"
+            or (file.kind in PAPER_KINDS and file.paper_id not in converted)
+        )
+    ]
+    freed = _remove(store, garbage)
+    if garbage:
+        logger.info(f"Removed {len(garbage)} stale files ({freed} bytes)")
+    return {"files": len(garbage), "bytes": freed}
+
+
+def enforce_quota(
+    store: PaperStore,
+    quota_bytes: int,
+    active: Collection[str] = (),
+) -> List[StoredFile]:
+    """Evict least recently used files until the store fits its quota.
+
+    PDFs and e-prints go first, in order of last access; they are only
+    needed to convert a paper again. If that is not enough, whole papers
+    go, in order of their markdown's last access (see ``PaperStore.touch``).
+    Evicted papers can be downloaded again, usually straight from the
+    conversion cache.
+
+    Args:
+        store: The store to shrink.
+        quota_bytes: The size limit; 0 means unlimited.
+        active: IDs of papers being downloaded or converted, never evicted.
+
+    Returns:
+        List[StoredFile]: The evicted files.
+    """
+    if not quota_bytes:
+        return []
+    files = scan(store)
+    total = sum(file.size for file in files)
+    if total <= quota_bytes:
+        return []
+
+    target = quota_bytes * LOW_WATERMARK
+    evicted: List[StoredFile] = []
+
+    inputs = sorted(
+        (f for f in files if f.kind in INPUT_KINDS and f.paper_id not in active),
+        key=lambda f: f.accessed,
+    )
+    for file in inputs:
+        if total <= target:
+            break
+        total -= _remove(store, [file])
+        evicted.append(file)
+
+    papers: Dict[str, List[StoredFile]] = defaultdict(list)
+    last_read: Dict[str, float] = {}
+    for file in files:
+        if file.kind in ("markdown", "references", "metadata") and file.paper_id:
+            papers[file.paper_id].append(file)
+            if file.kind == "markdown":
+                last_read[file.paper_id] = file.accessed
+    for paper_id in sorted(last_read, key=last_read.get):
+        if total <= target:
+            break
+        if paper_id in active:
+            continue
+        total -= _remove(store, papers[paper_id])
+        evicted += papers[paper_id]
+        logger.info(f"Evicted {paper_id} from storage to stay within quota")
+
+    if evicted:
+        logger.info(
+            f"Evicted {len(evicted)} files; storage now at {total} of "
+            f"{quota_bytes} bytes"
+        )
+    if total > quota_bytes:
+        logger.warning(f"Storage exceeds its quota of {quota_bytes} bytes")
+    return evicted
+
+
+def maintain(
+    store: PaperStore,
+    quota_bytes: int = 0,
+    active: Collection[str] = (),
+    grace_period: float = 3600,
+) -> Dict[str, Any]:
+    """Collect garbage, then enforce the quota.
+
+    Returns:
+        Dict[str, Any]: What was ``collected`` and the number of ``evicted``
+        files.
+    """
+    collected = collect_garbage(store, active, grace_period)
+    evicted = enforce_quota(store, quota_bytes, active)
+    return {"collected": collected, "evicted": len(evicted)}
+
+
+async def maintenance_loop(
+    store: PaperStore,
+    interval: float,
+    quota_bytes: int = 0,
+    active: Callable[[], Collection[str]] = tuple,
+    grace_period: float = 3600,
+) -> None:
+    """Run ``maintain`` every ``interval`` seconds, until cancelled.
+
+    Args:
+        store: The store to maintain.
+        interval: Seconds between runs.
+        quota_bytes: The size limit; 0 means unlimited.
+        active: Returns the IDs of papers being worked on; called on the
+            event loop before each run.
+        grace_period: Minimum age of a file to collect, in seconds.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(
+                maintain, store, quota_bytes, set(active()), grace_period
+            )
+        except Exception as e:
+            logger.warning(f"Storage maintenance failed: {str(e)}")
+        await asyncio.sleep(interval)
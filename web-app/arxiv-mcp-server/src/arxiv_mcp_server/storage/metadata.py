@@ -0,0 +1,40 @@
+"""Per-paper metadata sidecars.
+
+Each stored paper may have a small JSON file next to its markdown recording
+how it was produced (conversion tier, converter version, timestamps). Papers
+stored before sidecars existed simply have none, and readers fall back to
+defaults.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+METADATA_SUFFIX = ".meta.json"
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    """Read a metadata sidecar, returning an empty dict if it is missing."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_metadata(path: Path, **fields: Any) -> Dict[str, Any]:
+    """Merge ``fields`` into a metadata sidecar and write it atomically.
+
+    Returns:
+        Dict[str, Any]: The updated metadata.
+    """
+    data = read_metadata(path)
+    data.update(fields)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+    return data
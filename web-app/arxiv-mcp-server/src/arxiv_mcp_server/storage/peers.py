@@ -0,0 +1,270 @@
+"""Converted papers shared directly between peer servers.
+
+A fleet of servers, each listed in ``PEERS`` by the URL of its peer
+endpoint, spreads papers over a consistent-hash ring of those URLs: every
+paper has a home server, picked by hashing its ID without version, so
+that all versions of a paper share a home. A server that converted a
+paper pushes it to the paper's home, and a server missing a paper asks the
+home, and the next server on the ring, before downloading and converting
+it itself. A popular paper is thus converted once per fleet rather than
+once per server. When servers join or leave, only the papers whose home
+moved are affected, and their old home is usually the next server asked.
+
+``PeerBackend`` is the client side, a ``StorageBackend`` behind the local
+store. ``peer_app`` is the server side, an ``aiohttp`` application that
+answers from the local store only, so that requests never travel further
+than one hop. ``aiohttp`` is only imported once a peer server starts.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+import httpx
+from ..identity import PaperId, base_key
+from .backends import StorageBackend
+from .store import KINDS, SHARED_SUFFIXES, PaperStore, classify
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Points of each server on the ring; more spread papers more evenly
+VIRTUAL_NODES = 64
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """A consistent-hash ring of servers."""
+
+    def __init__(self, nodes: List[str], virtual_nodes: int = VIRTUAL_NODES):
+        """Initialize the ring with ``virtual_nodes`` points per server."""
+        self.nodes = sorted(set(nodes))
+        points = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def nodes_for(self, key: str, count: int = 1) -> List[str]:
+        """Get the servers responsible for a key, its home first.
+
+        Args:
+            key: The key, e.g. a paper ID without version.
+            count: How many distinct servers to return, at most.
+        """
+        if not self._nodes:
+            return []
+        nodes: List[str] = []
+        start = bisect.bisect(self._hashes, _hash(key))
+        for i in range(len(self._nodes)):
+            node = self._nodes[(start + i) % len(self._nodes)]
+            if node not in nodes:
+                nodes.append(node)
+                if len(nodes) == min(count, len(self.nodes)):
+                    break
+        return nodes
+
+
+def _shared_file(key: str) -> Optional[Tuple[str, str]]:
+    """Split the name of a shared file into the paper's storage key and suffix.
+
+    Returns:
+        Optional[Tuple[str, str]]: The key and suffix, or None if ``key`` is
+        not the name of a shared file of an arXiv paper.
+    """
+    kind, paper_id = classify(key)
+    suffix = dict(KINDS).get(kind)
+    if (
+        suffix not in SHARED_SUFFIXES
+        or f"{paper_id}{suffix}" != key
+        or not PaperId.from_key(paper_id).known
+    ):
+        return None
+    return paper_id, suffix
+
+
+class PeerBackend(StorageBackend):
+    """The converted papers of peer servers, found by consistent hashing."""
+
+    def __init__(
+        self,
+        peers: List[str],
+        own_url: str = "",
+        fanout: int = 2,
+        token: str = "",
+        timeout: float = 10,
+    ):
+        """Initialize the backend.
+
+        Args:
+            peers: The peer endpoint URLs of all servers, this one included.
+            own_url: This server's URL in ``peers``, never asked.
+            fanout: How many servers to ask for a paper, starting at its home.
+            token: Secret shared by the peers, sent as a bearer token.
+            timeout: Request timeout, in seconds.
+        """
+        self.ring = HashRing([peer.rstrip("/") for peer in peers])
+        self.own_url = own_url.rstrip("/")
+        self.fanout = fanout
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.client = httpx.Client(timeout=timeout, headers=headers)
+
+    def _peers_for(self, base: str) -> List[str]:
+        """The servers to ask for a paper, home first, without this one."""
+        nodes = self.ring.nodes_for(base, self.fanout + 1)
+        return [node for node in nodes if node != self.own_url][: self.fanout]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Ask the paper's home, and then its neighbours, for a file."""
+        shared = _shared_file(key)
+        if shared is None:
+            return None
+        for peer in self._peers_for(base_key(shared[0])):
+            try:
+                response = self.client.get(f"{peer}/papers/{key}")
+            except httpx.HTTPError as e:
+                logger.debug(f"Peer {peer} unreachable: {e}")
+                continue
+            if response.status_code == 200:
+                return response.content
+            if response.status_code != 404:
+                logger.debug(f"Peer {peer} answered {response.status_code}")
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Push a file to the paper's home, unless this server is its home."""
+        shared = _shared_file(key)
+        if shared is None:
+            return
+        home = self.ring.nodes_for(base_key(shared[0]))[0]
+        if home == self.own_url:
+            return
+        self.client.put(f"{home}/papers/{key}", content=data).raise_for_status()
+
+    def delete(self, key: str) -> None:
+        """Leave the peers' files alone; each server manages its own store."""
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the files of a paper at the servers asked for it.
+
+        Peers answer lookups of single papers only, so an empty prefix, a
+        listing of every paper, yields nothing.
+        """
+        if not prefix:
+            return
+        seen = set()
+        for peer in self._peers_for(base_key(prefix)):
+            try:
+                response = self.client.get(f"{peer}/papers", params={"prefix": prefix})
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.debug(f"Peer {peer} could not list {prefix}: {e}")
+                continue
+            for key in response.json()["keys"]:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+
+def open_peers(settings) -> Optional[PeerBackend]:
+    """Open the peers configured by the ``PEER_*`` settings, if any."""
+    peers = [peer.strip() for peer in settings.PEERS.split(",") if peer.strip()]
+    if not peers:
+        return None
+    return PeerBackend(
+        peers,
+        own_url=settings.PEER_URL,
+        fanout=settings.PEER_FANOUT,
+        token=settings.PEER_TOKEN,
+        timeout=settings.PEER_TIMEOUT,
+    )
+
+
+def _list_shared(store: PaperStore, prefix: str) -> List[str]:
+    """List the markdown of the papers whose storage key starts with ``prefix``."""
+    return [
+        f"{paper_id}.md"
+        for paper_id in store.versions(base_key(prefix))
+        if paper_id.startswith(prefix)
+    ]
+
+
+def peer_app(store: PaperStore, token: str) -> "web.Application":
+    """Build the application answering peers from the local store.
+
+    Args:
+        store: The local store.
+        token: Secret the peers must send as a bearer token.
+
+    Raises:
+        ValueError: If there is no token; peers may write into the store,
+            so the store is never served to anyone who asks.
+    """
+    if not token:
+        raise ValueError("Serving papers to peers requires a PEER_TOKEN")
+    from aiohttp import web
+
+    @web.middleware
+    async def authenticate(request, handler):
+        if request.headers.get("Authorization") != f"Bearer {token}":
+            raise web.HTTPUnauthorized()
+        return await handler(request)
+
+    def shared_file(request):
+        shared = _shared_file(request.match_info["key"])
+        if shared is None:
+            raise web.HTTPNotFound()
+        return shared
+
+    async def list_files(request):
+        prefix = request.query.get("prefix", "")
+        if not prefix:
+            raise web.HTTPBadRequest(text="A prefix is required")
+        keys = await asyncio.to_thread(_list_shared, store, prefix)
+        return web.json_response({"keys": keys})
+
+    async def get_file(request):
+        paper_id, suffix = shared_file(request)
+        data = await asyncio.to_thread(store.export_file, paper_id, suffix)
+        if data is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=data)
+
+    async def put_file(request):
+        paper_id, suffix = shared_file(request)
+        data = await request.read()
+        await asyncio.to_thread(store.import_file, paper_id, suffix, data)
+        if suffix == ".md":
+            logger.info(f"Received {paper_id} from a peer")
+        return web.Response(status=204)
+
+    app = web.Application(middlewares=[authenticate], client_max_size=256 * 2**20)
+    app.router.add_get("/papers", list_files)
+    app.router.add_get("/papers/{key}", get_file)
+    app.router.add_put("/papers/{key}", put_file)
+    return app
+
+
+async def start_peer_server(
+    store: PaperStore, host: str, port: int, token: str
+) -> "web.AppRunner":
+    """Serve the local store to peers until the returned runner is cleaned up.
+
+    Raises:
+        ValueError: If there is no token.
+    """
+    from aiohttp import web
+
+    runner = web.AppRunner(peer_app(store, token), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving papers to peers on {host}:{port}")
+    return runner
@@ -0,0 +1,201 @@
+"""Shared paper storage in an S3-compatible object store.
+
+Requests are signed with AWS Signature Version 4, implemented here on top
+of ``httpx`` so that no AWS SDK is needed. Buckets are addressed
+path-style (``<endpoint>/<bucket>/<key>``), which AWS, MinIO and most
+other S3-compatible stores accept.
+"""
+
+import hashlib
+import hmac
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote, unquote, urlsplit
+import httpx
+from .backends import StorageBackend
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+_XML_NAMESPACE = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_request(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    service: str = "s3",
+    now: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """Sign a request with AWS Signature Version 4.
+
+    Args:
+        method: The HTTP method.
+        url: The full URL, including the query string.
+        headers: Headers to sign along; ``host`` is added from the URL.
+        payload_hash: Hex SHA-256 of the request body.
+        access_key: The access key ID.
+        secret_key: The secret access key.
+        region: The region, e.g. ``us-east-1``.
+        service: The service name.
+        now: The signing time; defaults to now.
+
+    Returns:
+        Dict[str, str]: The headers to send: ``headers`` plus ``host``,
+        ``x-amz-date``, ``x-amz-content-sha256`` and ``Authorization``.
+    """
+    now = now or datetime.now(timezone.utc)
+    timestamp = now.strftime("%Y%m%dT%H%M%SZ")
+    date = timestamp[:8]
+    parts = urlsplit(url)
+
+    signed = {name.lower(): str(value).strip() for name, value in headers.items()}
+    signed["host"] = parts.netloc
+    signed["x-amz-date"] = timestamp
+    signed["x-amz-content-sha256"] = payload_hash
+    names = sorted(signed)
+
+    query = []
+    for pair in filter(None, parts.query.split("&")):
+        name, _, value = pair.partition("=")
+        query.append(
+            (quote(unquote(name), safe="-_.~"), quote(unquote(value), safe="-_.~"))
+        )
+    canonical_request = "\n".join(
+        [
+            method,
+            quote(unquote(parts.path) or "/", safe="/-_.~"),
+            "&".join(f"{name}={value}" for name, value in sorted(query)),
+            "".join(f"{name}:{signed[name]}\n" for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        [ALGORITHM, timestamp, scope, _sha256(canonical_request.encode("utf-8"))]
+    )
+    key = _hmac(("AWS4" + secret_key).encode("utf-8"), date)
+    for part in (region, service, "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(
+        key, string_to_sign.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+    signed["Authorization"] = (
+        f"{ALGORITHM} Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    return signed
+
+
+class S3Backend(StorageBackend):
+    """Files kept as objects in an S3-compatible bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint: str = "",
+        region: str = "us-east-1",
+        access_key: str = "",
+        secret_key: str = "",
+        timeout: float = 60,
+    ):
+        """Initialize the backend.
+
+        Args:
+            bucket: The bucket name.
+            prefix: Prefix of the object keys, e.g. ``papers/``.
+            endpoint: The store's URL; defaults to AWS S3 in ``region``.
+            region: The region requests are signed for.
+            access_key: The access key ID.
+            secret_key: The secret access key.
+            timeout: Request timeout, in seconds.
+        """
+        self.endpoint = (endpoint or f"https://s3.{region}.amazonaws.com").rstrip("/")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.client = httpx.Client(timeout=timeout)
+
+    def _request(
+        self,
+        method: str,
+        key: Optional[str] = None,
+        query: str = "",
+        content: bytes = b"",
+    ) -> httpx.Response:
+        url = f"{self.endpoint}/{self.bucket}"
+        if key is not None:
+            url += "/" + quote(self.prefix + key, safe="/-_.~")
+        if query:
+            url += "?" + query
+        headers = sign_request(
+            method,
+            url,
+            {},
+            _sha256(content),
+            self.access_key,
+            self.secret_key,
+            self.region,
+        )
+        # httpx sets the Host header itself
+        headers.pop("host")
+        return self.client.request(method, url, headers=headers, content=content)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read an object, or return None if it does not exist."""
+        response = self._request("GET", key)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write an object."""
+        self._request("PUT", key, content=data).raise_for_status()
+
+    def delete(self, key: str) -> None:
+        """Delete an object; deleting a missing object is not an error."""
+        response = self._request("DELETE", key)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+        response = self._request("HEAD", key)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """List the keys starting with ``prefix``, page by page."""
+        token = None
+        while True:
+            query = f"list-type=2&prefix={quote(self.prefix + prefix, safe='')}"
+            if token:
+                query += f"&continuation-token={quote(token, safe='')}"
+            response = self._request("GET", query=query)
+            response.raise_for_status()
+            root = ElementTree.fromstring(response.content)
+            for contents in root.iter(f"{_XML_NAMESPACE}Contents"):
+                yield contents.findtext(f"{_XML_NAMESPACE}Key")[len(self.prefix) :]
+            if root.findtext(f"{_XML_NAMESPACE}IsTruncated") != "true":
+                return
+            token = root.findtext(f"{_XML_NAMESPACE}NextContinuationToken")
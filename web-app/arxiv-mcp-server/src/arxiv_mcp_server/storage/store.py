@@ -0,0 +1,655 @@
+"""Local paper storage.
+
+Every file belonging to a paper version lives at
+``<shard>/<key><suffix>`` under the storage root (the markdown, PDF,
+e-print, references and metadata sidecar), where the key is the version's
+``PaperId.key``. The store's methods take that key as ``paper_id``. A file
+may also be stored compressed, with the codec's suffix appended.
+``PaperStore`` hides both: callers name files by paper ID and logical
+suffix, and reads find whichever variant exists.
+
+The shard directory keeps directories small in large libraries:
+
+- ``flat``: no shards, every file directly under the root.
+- ``yymm``: the year and month of new-style arXiv IDs (``2401/2401.12345.md``),
+  so that a paper's versions share a directory. Other IDs are hashed.
+- ``hash``: the first two hex digits of the SHA-1 of the ID without
+  version, 256 shards.
+
+Either way, all versions of a paper share a shard, so that ``versions``
+only needs to look at one directory.
+
+A paper's shard follows from its ID alone, so resolving a path takes no
+directory scan. Files left at the root by the flat layout stay readable and
+are moved into their shards by ``migrate``, which may run while the store is
+in use.
+
+With ``load_index``, the store keeps an in-memory index of its papers'
+files (see ``index``), and lookups no longer touch the disk.
+
+A store may be backed by a corpus shared with other servers (see
+``backends``) and by the stores of peer servers (see ``peers``). Converted
+papers are published to them, and ``resolve`` fetches a paper from them
+when no local version fits a request.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from ..converters import REFERENCES_SUFFIX
+from ..identity import PaperId, base_key, version_of
+from . import compression
+from .backends import LayeredBackend, StorageBackend, open_backend
+from .index import PaperIndex
+from .metadata import METADATA_SUFFIX
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# Suffixes of the files that may be stored compressed. The metadata sidecar
+# is tiny and the e-print is already compressed.
+COMPRESSIBLE_SUFFIXES = (".md", REFERENCES_SUFFIX, ".pdf")
+
+LAYOUTS = ("flat", "yymm", "hash")
+
+# Logical suffix of each kind of stored file, longest first
+KINDS = (
+    ("references", REFERENCES_SUFFIX),
+    ("metadata", METADATA_SUFFIX),
+    ("markdown", ".md"),
+    ("pdf", ".pdf"),
+    ("source", ".src"),
+)
+
+# Suffixes of the files tracked by the index. The metadata sidecar is always
+# read from its path, and written in too many places to track.
+INDEXED_SUFFIXES = (".md", REFERENCES_SUFFIX, ".pdf", ".src")
+
+# Files being written: downloads, atomic writes and metadata updates
+PARTIAL_SUFFIXES = (".part", ".part.json", ".tmp")
+
+_SUFFIXES = dict(KINDS)
+
+# Files of a converted paper kept in the shared backend
+SHARED_SUFFIXES = (".md", REFERENCES_SUFFIX, METADATA_SUFFIX)
+
+_NEW_STYLE_ID = re.compile(r"^(\d{4})\.\d{4,5}")
+
+
+def classify(name: str) -> Tuple[str, Optional[str]]:
+    """Get the kind of a stored file and the paper it belongs to.
+
+    Returns:
+        Tuple[str, Optional[str]]: The kind (one of ``KINDS``, ``partial`` or
+        ``other``) and the paper ID; the ID is None for files that cannot be
+        attributed to a paper.
+    """
+    for suffix in PARTIAL_SUFFIXES:
+        if name.endswith(suffix):
+            _, paper_id = classify(name[: -len(suffix)])
+            return "partial", paper_id
+    for suffix in compression.SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    for kind, suffix in KINDS:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return kind, name[: -len(suffix)]
+    return "other", None
+
+
+def shard_for(paper_id: str, layout: str) -> Optional[str]:
+    """Get the shard directory of a paper, or None in the flat layout."""
+    if layout == "flat":
+        return None
+    if layout == "yymm":
+        match = _NEW_STYLE_ID.match(paper_id)
+        if match:
+            return match.group(1)
+    return hashlib.sha1(base_key(paper_id).encode("utf-8")).hexdigest()[:2]
+
+
+class PaperStore:
+    """Files of downloaded and converted papers, optionally compressed."""
+
+    def __init__(
+        self,
+        root: Path,
+        compression_codec: Optional[str] = None,
+        layout: str = "flat",
+        backend: Optional[StorageBackend] = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            root: The storage directory.
+            compression_codec: Codec new files are compressed with (``gzip``
+                or ``zstd``), or None to store them plain. zstd falls back to
+                gzip when the zstandard package is missing.
+            layout: How files are sharded into directories, one of
+                ``LAYOUTS``.
+            backend: The corpus shared with other servers, if any.
+
+        Raises:
+            ValueError: If the layout is unknown.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(
+                f"Unknown layout {layout}; use one of {', '.join(LAYOUTS)}"
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.layout = layout
+        self.backend = backend
+        # Shard directories known to exist, to create each only once
+        self._directories: Set[Path] = {self.root}
+        self.index: Optional[PaperIndex] = None
+        # Told when the set of stored papers changes, see ``PaperIndex``
+        self.listeners: List[Callable[[], None]] = []
+        if compression_codec in (None, "", "none"):
+            compression_codec = None
+        elif compression_codec not in compression.available_codecs():
+            logger.warning(
+                f"Compression codec {compression_codec} is not available, using gzip"
+            )
+            compression_codec = "gzip"
+        self.codec = compression_codec
+
+    def path(self, paper_id: str, suffix: str = ".md") -> Path:
+        """Get the plain (uncompressed) path of a paper's file.
+
+        The file's shard directory is created if needed, so the path can be
+        written to straight away.
+        """
+        shard = shard_for(paper_id, self.layout)
+        path = (self.root / shard if shard else self.root) / f"{paper_id}{suffix}"
+        if path.parent not in self._directories:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._directories.add(path.parent)
+        return path
+
+    def _variants(self, paper_id: str, suffix: str) -> List[Path]:
+        paths = [self.path(paper_id, suffix)]
+        if self.layout != "flat":
+            # Not migrated yet
+            paths.append(self.root / f"{paper_id}{suffix}")
+        return [
+            path.with_name(path.name + ext)
+            for path in paths
+            for ext in ("",) + tuple(compression.SUFFIXES.values())
+        ]
+
+    def _find(self, paper_id: str, suffix: str) -> Optional[Path]:
+        """Find the stored variant of a paper's file on disk."""
+        for path in self._variants(paper_id, suffix):
+            if path.exists():
+                return path
+        return None
+
+    def locate(self, paper_id: str, suffix: str = ".md") -> Optional[Path]:
+        """Find the stored variant of a paper's file, plain or compressed."""
+        if self.index is not None and suffix in INDEXED_SUFFIXES:
+            return self.index.get(paper_id, suffix)
+        return self._find(paper_id, suffix)
+
+    def refresh(self, paper_id: str, suffix: str = ".md") -> Optional[Path]:
+        """Look a paper's file up on disk again and update the index.
+
+        Call this after writing or deleting a file behind the store's back.
+
+        Returns:
+            Optional[Path]: The stored variant, or None if it is not stored.
+        """
+        path = self._find(paper_id, suffix)
+        if self.index is not None and suffix in INDEXED_SUFFIXES:
+            self.index.set(paper_id, suffix, path)
+        return path
+
+    def exists(self, paper_id: str, suffix: str = ".md") -> bool:
+        """Check whether a paper's file is stored in any variant."""
+        return self.locate(paper_id, suffix) is not None
+
+    def versions(self, base: str) -> List[str]:
+        """List the stored versions of a paper, oldest first.
+
+        Args:
+            base: The storage key of the paper without version
+                (``PaperId.base_key``).
+
+        Returns:
+            List[str]: Storage keys of the versions with stored markdown. A
+            key without version, stored before versions were tracked, comes
+            first.
+        """
+        if self.index is not None:
+            keys = self.index.versions(base)
+        else:
+            directories = {self.path(base).parent, self.root}
+            keys = set()
+            for directory in directories:
+                for entry in self._list(directory)[0]:
+                    kind, key = classify(entry.name)
+                    if kind == "markdown" and base_key(key) == base:
+                        keys.add(key)
+        return sorted(keys, key=lambda key: version_of(key) or 0)
+
+    def resolve(self, paper_id: PaperId) -> Optional[str]:
+        """Find the stored version that serves a request for a paper.
+
+        A request for a specific version is served by that version only. A
+        request without version is served by the newest stored version.
+
+        Returns:
+            Optional[str]: The storage key, or None if no stored version fits.
+        """
+        versions = self.versions(paper_id.base_key)
+        if paper_id.version is None and versions:
+            return versions[-1]
+        if paper_id.key in versions:
+            return paper_id.key
+        if self.backend is None:
+            return None
+        return self._fetch_shared(paper_id)
+
+    def _shared_versions(self, base: str) -> List[str]:
+        """List the versions of a paper in the shared backend, oldest first."""
+        keys = set()
+        for name in self.backend.list_keys(base):
+            kind, key = classify(name)
+            if kind == "markdown" and base_key(key) == base:
+                keys.add(key)
+        return sorted(keys, key=lambda key: version_of(key) or 0)
+
+    def _fetch_shared(self, paper_id: PaperId) -> Optional[str]:
+        """Copy the version of a paper that serves a request from the backend.
+
+        Returns:
+            Optional[str]: The storage key of the fetched version, or None if
+            the backend has none that fits or cannot be reached.
+        """
+        try:
+            if paper_id.version is None:
+                versions = self._shared_versions(paper_id.base_key)
+                if not versions:
+                    return None
+                key = versions[-1]
+            else:
+                key = paper_id.key
+            markdown = self.backend.get(f"{key}.md")
+            if markdown is None:
+                return None
+            for suffix in SHARED_SUFFIXES[1:]:
+                data = self.backend.get(f"{key}{suffix}")
+                if data is not None:
+                    self.import_file(key, suffix, data)
+            # The markdown last, as it marks the paper as stored
+            self.import_file(key, ".md", markdown)
+        except Exception as e:
+            logger.warning(f"Could not fetch {paper_id} from the shared store: {e}")
+            return None
+        logger.info(f"Fetched {key} from the shared store")
+        return key
+
+    def import_file(self, paper_id: str, suffix: str, data: bytes) -> None:
+        """Store a file received from elsewhere, in the store's format."""
+        compression.write_file(self.path(paper_id, suffix), data)
+        if suffix != METADATA_SUFFIX:
+            self.finalize(paper_id, suffix)
+
+    def export_file(self, paper_id: str, suffix: str) -> Optional[bytes]:
+        """Read a file to share with other servers, uncompressed.
+
+        Returns:
+            Optional[bytes]: The file's content, or None if it is not stored.
+        """
+        if suffix == METADATA_SUFFIX:
+            path = self.path(paper_id, suffix)
+            return path.read_bytes() if path.exists() else None
+        if not self.exists(paper_id, suffix):
+            return None
+        return self.read_bytes(paper_id, suffix)
+
+    def publish(self, paper_id: str) -> bool:
+        """Publish a converted paper to the shared backend, if there is one.
+
+        The files are published uncompressed, so that servers with other
+        compression settings can share them, and the markdown last, so
+        that other servers never find a paper without its references.
+
+        Returns:
+            bool: True if the paper was published.
+        """
+        if self.backend is None or not self.exists(paper_id):
+            return False
+        try:
+            for suffix in reversed(SHARED_SUFFIXES):
+                data = self.export_file(paper_id, suffix)
+                if data is not None:
+                    self.backend.put(f"{paper_id}{suffix}", data)
+        except Exception as e:
+            logger.warning(f"Could not publish {paper_id} to the shared store: {e}")
+            return False
+        return True
+
+    def touch(self, paper_id: str, suffix: str = ".md") -> None:
+        """Record that a paper's file was read, for least-recently-used eviction.
+
+        Sets the file's access time explicitly, as many file systems are
+        mounted with ``noatime`` or ``relatime`` and do not keep it current.
+        """
+        path = self.locate(paper_id, suffix)
+        if path is None:
+            return
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except OSError as e:
+            logger.debug(f"Could not record access to {path.name}: {str(e)}")
+
+    def read_bytes(self, paper_id: str, suffix: str = ".md") -> bytes:
+        """Read a paper's file, decompressing it if needed.
+
+        Raises:
+            FileNotFoundError: If the file is not stored.
+        """
+        return self.read_range(paper_id, suffix, 0)
+
+    def read_text(self, paper_id: str, suffix: str = ".md") -> str:
+        """Read a paper's text file, decompressing it if needed."""
+        return self.read_bytes(paper_id, suffix).decode("utf-8")
+
+    def read_range(
+        self, paper_id: str, suffix: str, start: int, length: Optional[int] = None
+    ) -> bytes:
+        """Read part of a paper's file, decompressing only the frames needed."""
+        path = self.locate(paper_id, suffix)
+        if path is None:
+            raise FileNotFoundError(self.path(paper_id, suffix))
+        try:
+            return compression.read_range(path, start, length)
+        except FileNotFoundError:
+            if self.index is None:
+                raise
+        # The index is stale, e.g. the file was recoded or removed meanwhile
+        path = self.refresh(paper_id, suffix)
+        if path is None:
+            raise FileNotFoundError(self.path(paper_id, suffix))
+        return compression.read_range(path, start, length)
+
+    def materialize(self, paper_id: str, suffix: str = ".pdf") -> Optional[Path]:
+        """Make a plain copy of a file available, e.g. a PDF to convert again.
+
+        Returns:
+            Optional[Path]: The plain path, or None if the file is not stored.
+        """
+        path = self.locate(paper_id, suffix)
+        if path is None or compression.codec_for(path) is None:
+            return path
+        plain = compression.write_file(
+            self.path(paper_id, suffix), compression.read_bytes(path)
+        )
+        self.refresh(paper_id, suffix)
+        return plain
+
+    def finalize(self, paper_id: str, suffix: str = ".md") -> Optional[Path]:
+        """Publish a freshly written plain file in the store's format.
+
+        Stale variants of the file are removed, and the file is compressed
+        if the store compresses new files.
+
+        Returns:
+            Optional[Path]: The stored file, or None if there is no plain file.
+        """
+        path = self.path(paper_id, suffix)
+        if not path.exists():
+            return None
+        self.refresh(paper_id, suffix)
+        return self.recode(paper_id, suffix, self.codec)
+
+    def recode(
+        self, paper_id: str, suffix: str, codec: Optional[str]
+    ) -> Optional[Path]:
+        """Store a paper's file with ``codec`` (None for plain).
+
+        The new variant is written before the others are removed, so the file
+        stays readable throughout.
+
+        Returns:
+            Optional[Path]: The stored file, or None if the file is not stored.
+        """
+        current = self.locate(paper_id, suffix)
+        if current is None:
+            return None
+        if compression.codec_for(current) == codec:
+            stored = current
+        else:
+            stored = compression.write_file(
+                self.path(paper_id, suffix), compression.read_bytes(current), codec
+            )
+        for path in self._variants(paper_id, suffix):
+            if path != stored:
+                path.unlink(missing_ok=True)
+        self.refresh(paper_id, suffix)
+        return stored
+
+    def delete(self, paper_id: str, suffix: str) -> None:
+        """Delete every variant of a paper's file."""
+        for path in self._variants(paper_id, suffix):
+            path.unlink(missing_ok=True)
+        self.refresh(paper_id, suffix)
+
+    def disk_usage(self, paper_id: str, suffix: str = ".md") -> int:
+        """Get the bytes a paper's file takes on disk (0 if not stored)."""
+        path = self.locate(paper_id, suffix)
+        return path.stat().st_size if path else 0
+
+    @staticmethod
+    def _list(directory: Path) -> Tuple[List[os.DirEntry], List[Path]]:
+        """List the files and the subdirectories of a directory.
+
+        Hidden subdirectories, such as the server's lock files, are skipped.
+        """
+        files, directories = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        directories.append(Path(entry.path))
+                elif entry.is_file():
+                    files.append(entry)
+        return files, directories
+
+    def walk(self) -> Iterator[os.DirEntry]:
+        """Iterate over every file in the store, shards included."""
+        directories = [self.root]
+        while directories:
+            files, subdirectories = self._list(directories.pop())
+            directories += subdirectories
+            yield from files
+
+    def load_index(self) -> None:
+        """Build the in-memory index by walking the store once."""
+        index = PaperIndex()
+        found: Dict[Tuple[str, str], List[Path]] = {}
+        directories = [self.root]
+        while directories:
+            directory = directories.pop()
+            # Taken before listing, so that changes during the walk are
+            # picked up by the next rescan
+            index.directories[directory] = directory.stat().st_mtime_ns
+            files, subdirectories = self._list(directory)
+            directories += subdirectories
+            for entry in files:
+                kind, paper_id = classify(entry.name)
+                suffix = _SUFFIXES.get(kind)
+                if suffix in INDEXED_SUFFIXES:
+                    found.setdefault((paper_id, suffix), []).append(Path(entry.path))
+        for (paper_id, suffix), paths in found.items():
+            if len(paths) > 1:
+                # Mid-recode or not migrated yet; pick the variant reads use
+                paths = [self._find(paper_id, suffix)]
+            index.set(paper_id, suffix, paths[0])
+        index.listeners = self.listeners
+        self.index = index
+        logger.info(f"Indexed {len(index)} papers in {self.root}")
+
+    def rescan_changed(self) -> int:
+        """Update the index for directories modified behind the store's back.
+
+        Only directories whose modification time changed since they were
+        last scanned are listed again.
+
+        Returns:
+            int: The number of files looked up again.
+        """
+        if self.index is None:
+            return 0
+        stale: Set[Tuple[str, str]] = set()
+        pending = list(self.index.directories)
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self.index.directories.get(directory):
+                continue
+            stale |= self.index.files_in(directory)
+            if mtime is None:
+                del self.index.directories[directory]
+                continue
+            self.index.directories[directory] = mtime
+            files, subdirectories = self._list(directory)
+            pending += [d for d in subdirectories if d not in self.index.directories]
+            for entry in files:
+                kind, paper_id = classify(entry.name)
+                suffix = _SUFFIXES.get(kind)
+                if suffix in INDEXED_SUFFIXES:
+                    stale.add((paper_id, suffix))
+        for paper_id, suffix in stale:
+            self.refresh(paper_id, suffix)
+        return len(stale)
+
+    def paper_ids(self) -> List[str]:
+        """List the IDs of all papers with stored markdown.
+
+        Only the local store is listed; papers in the shared backend are
+        found by ``resolve`` when asked for.
+        """
+        if self.index is not None:
+            ids = set(self.index.paper_ids(".md"))
+        else:
+            ids = set()
+            for entry in self.walk():
+                kind, paper_id = classify(entry.name)
+                if kind == "markdown":
+                    ids.add(paper_id)
+        return sorted(ids)
+
+    def unconverted_ids(self) -> List[str]:
+        """List papers with a downloaded PDF or e-print but no markdown."""
+        if self.index is not None:
+            ids = set(self.index.paper_ids(".pdf")) | set(self.index.paper_ids(".src"))
+        else:
+            ids = set()
+            for entry in self.walk():
+                kind, paper_id = classify(entry.name)
+                if kind in ("pdf", "source"):
+                    ids.add(paper_id)
+        return sorted(ids - set(self.paper_ids()))
+
+    def migrate(self) -> int:
+        """Move every file into its shard under the store's layout.
+
+        Files are moved with an atomic rename, so readers find each file at
+        its old or its new location throughout. Where a file exists at both,
+        the one in place wins, as writes always go there.
+
+        Returns:
+            int: The number of files moved.
+        """
+        moved = 0
+        for entry in list(self.walk()):
+            kind, paper_id = classify(entry.name)
+            if kind in ("partial", "other"):
+                continue
+            current = Path(entry.path)
+            target = self.path(paper_id, entry.name[len(paper_id) :])
+            if current == target:
+                continue
+            try:
+                if target.exists():
+                    current.unlink()
+                else:
+                    os.replace(current, target)
+                    moved += 1
+            except OSError as e:
+                # E.g. the file is open on Windows; the next run retries
+                logger.warning(f"Could not move {entry.name}: {str(e)}")
+            self.refresh(paper_id, _SUFFIXES[kind])
+        if moved:
+            logger.info(f"Moved {moved} files into the {self.layout} layout")
+        return moved
+
+    def compress_all(self, codec: Optional[str]) -> Tuple[int, int]:
+        """Re-encode every compressible file in the store with ``codec``.
+
+        Returns:
+            Tuple[int, int]: Bytes on disk before and after.
+        """
+        before = after = 0
+        for paper_id in self.paper_ids() + self._pdf_only_ids():
+            for suffix in COMPRESSIBLE_SUFFIXES:
+                size = self.disk_usage(paper_id, suffix)
+                if not size:
+                    continue
+                before += size
+                after += self.recode(paper_id, suffix, codec).stat().st_size
+        return before, after
+
+    def _pdf_only_ids(self) -> List[str]:
+        """List papers that have a PDF but no markdown (yet)."""
+        with_markdown = set(self.paper_ids())
+        ids = set()
+        for entry in self.walk():
+            kind, paper_id = classify(entry.name)
+            if kind == "pdf":
+                ids.add(paper_id)
+        return sorted(ids - with_markdown)
+
+
+_default_store: Optional[PaperStore] = None
+
+
+def default_store() -> PaperStore:
+    """Get the store for the configured ``STORAGE_PATH``, created on first use.
+
+    The store is shared by the whole process, and so is its index.
+    """
+    global _default_store
+    if _default_store is None:
+        from ..config import get_settings
+
+        from .peers import open_peers
+
+        settings = get_settings()
+        # The shared corpus first, then the peers
+        layers = [
+            backend
+            for backend in (
+                open_backend(settings.STORAGE_BACKEND, settings),
+                open_peers(settings),
+            )
+            if backend is not None
+        ]
+        store = PaperStore(
+            settings.STORAGE_PATH,
+            settings.STORAGE_COMPRESSION,
+            settings.STORAGE_LAYOUT,
+            LayeredBackend(layers) if len(layers) > 1 else next(iter(layers), None),
+        )
+        store.load_index()
+        _default_store = store
+    return _default_store
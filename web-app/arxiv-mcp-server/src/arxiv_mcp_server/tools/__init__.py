@@ -4,6 +4,8 @@ from .search import search_tool, handle_search
 from .download import download_tool, handle_download
 from .list_papers import list_tool, handle_list_papers
 from .read_paper import read_tool, handle_read_paper
+from .storage_stats import storage_stats_tool, handle_storage_stats
+from .usage_stats import usage_stats_tool, handle_usage_stats
 
 
 __all__ = [
@@ -15,4 +17,8 @@ __all__ = [
     "handle_read_paper",
     "list_tool",
     "handle_list_papers",
+    "storage_stats_tool",
+    "handle_storage_stats",
+    "usage_stats_tool",
+    "handle_usage_stats",
 ]
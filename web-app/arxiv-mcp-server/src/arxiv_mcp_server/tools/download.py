@@ -1,33 +1,88 @@
 """Download functionality for the arXiv MCP server."""
 
-import arxiv
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Awaitable, Dict, Any, List, Optional, Set
 from datetime import datetime
 import mcp.types as types
-from ..config import Settings
-import pymupdf4llm
+from ..admission import CONVERSION, admission
+from ..catalog import resolve_latest
+from ..config import get_settings
+from ..deadlines import current_deadline
+from ..converters import (
+    TIERS,
+    LATEX_CONVERTER_VERSION,
+    POSTPROCESS_VERSION,
+    REFERENCES_SUFFIX,
+    converter_version,
+    find_title,
+    split_references_file,
+)
+from ..downloads import PaperNotFoundError, download_pdf, fetch_eprint
+from ..identity import PaperId, base_key, version_of
+from ..jobs import JOBS_FILE, OWNER, ConversionStatus, JobTable
+from ..locks import LOCKS_DIR, PaperLocks
+from ..progress import current_progress, follow, progress_board, report_progress
+from ..storage import ConversionCache, METADATA_SUFFIX, read_metadata, update_metadata
+from ..storage.cache import hash_file
+from ..storage.maintenance import enforce_quota
+from ..storage.store import default_store
+from ..worker import ConversionError, convert_in_worker
 import logging
 
 logger = logging.getLogger("arxiv-mcp-server")
-settings = Settings()
+settings = get_settings()
+
+# Content-addressed cache shared by every paper ID that maps onto the same PDF
+conversion_cache = (
+    ConversionCache(settings.CACHE_PATH) if settings.CONVERSION_CACHE else None
+)
+
+# Conversion status by storage key; persisted once the server opens it
+conversion_statuses = JobTable(settings.JOB_STATUS_TTL)
+
+# Running conversion tasks, kept so that they can be cancelled
+conversion_tasks: Dict[str, asyncio.Task] = {}
+
+# Papers whose interrupted work is waiting to be resumed after a restart
+recovering: Set[str] = set()
+
+# Head of a converted paper searched for its title
+_TITLE_BYTES = 8192
+
 
-# Global dictionary to track conversion status
-conversion_statuses: Dict[str, Any] = {}
+def paper_locks() -> PaperLocks:
+    """Get the per-paper locks shared by the servers using the store."""
+    root = default_store().root / LOCKS_DIR
+    return _paper_locks.setdefault(root, PaperLocks(root))
 
 
-@dataclass
-class ConversionStatus:
-    """Track the status of a PDF to Markdown conversion."""
+_paper_locks: Dict[Path, PaperLocks] = {}
 
-    paper_id: str
-    status: str  # 'downloading', 'converting', 'success', 'error'
-    started_at: datetime
-    completed_at: Optional[datetime] = None
-    error: Optional[str] = None
+
+def _is_live(status: ConversionStatus) -> bool:
+    """Check whether an active status belongs to work that is still running.
+
+    Work of another process is running as long as it holds the paper's
+    lock; a status it left behind when it stopped is stale.
+    """
+    return status.active and (
+        status.owner == OWNER or paper_locks().locked(status.paper_id)
+    )
+
+
+def active_paper_ids() -> Set[str]:
+    """List the papers being downloaded or converted, by any server process."""
+    active = {
+        paper_id for paper_id, status in conversion_statuses.items() if status.active
+    }
+    active.update(
+        paper_id
+        for paper_id in conversion_statuses.active_ids()
+        if paper_id not in active and paper_locks().locked(paper_id)
+    )
+    return active | recovering
 
 
 download_tool = types.Tool(
@@ -38,13 +93,39 @@ download_tool = types.Tool(
         "properties": {
             "paper_id": {
                 "type": "string",
-                "description": "The arXiv ID of the paper to download",
+                "description": "The arXiv ID of the paper to download, e.g. 2401.12345, 2401.12345v2 or hep-th/9901001. Without a version, the latest version is downloaded, or the newest one already stored is used",
             },
             "check_status": {
                 "type": "boolean",
                 "description": "If true, only check conversion status without downloading",
                 "default": False,
             },
+            "tier": {
+                "type": "string",
+                "enum": list(TIERS),
+                "description": "Conversion tier: 'fast' extracts plain text with headings only (no images or tables), 'full' runs layout analysis. A fast paper can be upgraded later by downloading it again with tier 'full'.",
+                "default": settings.DEFAULT_CONVERSION_TIER,
+            },
+            "prefer_source": {
+                "type": "boolean",
+                "description": "If true, convert the paper's LaTeX source instead of its PDF when arXiv has it. Faster, and keeps equations intact; falls back to the PDF otherwise.",
+                "default": settings.PREFER_LATEX_SOURCE,
+            },
+            "cancel": {
+                "type": "boolean",
+                "description": "If true, cancel an in-progress conversion of the paper",
+                "default": False,
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "If true, return only once the paper is ready (or failed), instead of right after its conversion started. Progress is reported as it goes if the call has a progress token.",
+                "default": False,
+            },
+            "timeout": {
+                "type": "number",
+                "description": f"With wait, the most seconds to wait for the paper (at most {settings.DOWNLOAD_WAIT_TIMEOUT}); on timeout the current status is returned and the conversion goes on",
+                "default": settings.DOWNLOAD_WAIT_TIMEOUT,
+            },
         },
         "required": ["paper_id"],
     },
@@ -52,62 +133,676 @@ download_tool = types.Tool(
 
 
 def get_paper_path(paper_id: str, suffix: str = ".md") -> Path:
-    """Get the absolute file path for a paper with given suffix."""
-    storage_path = Path(settings.STORAGE_PATH)
-    storage_path.mkdir(parents=True, exist_ok=True)
-    return storage_path / f"{paper_id}{suffix}"
+    """Get the absolute (uncompressed) file path for a paper with given suffix.
+
+    ``paper_id`` is the storage key of a paper version (``PaperId.key``).
+    """
+    return default_store().path(paper_id, suffix)
+
+
+def _status_key(requested: PaperId) -> str:
+    """Get the storage key under which a request's conversion is tracked.
+
+    A request without version matches the newest version being worked on.
+    """
+    if requested.version is None:
+        tracked = [
+            key for key in conversion_statuses if base_key(key) == requested.base_key
+        ]
+        if tracked:
+            return max(tracked, key=lambda key: version_of(key) or 0)
+    return requested.key
+
 
+def stored_tier(paper_id: str) -> Optional[str]:
+    """Get the conversion tier of a stored paper, or None if it is not stored.
 
-def convert_pdf_to_markdown(paper_id: str, pdf_path: Path) -> None:
-    """Convert PDF to Markdown in a separate thread."""
+    Papers converted before tiers existed have no metadata and count as full.
+    """
+    if not default_store().exists(paper_id):
+        return None
+    return read_metadata(get_paper_path(paper_id, METADATA_SUFFIX)).get("tier", "full")
+
+
+def newer_version(paper_id: str) -> Optional[str]:
+    """Get the newer version of a stored paper that the freshness check found."""
+    return read_metadata(get_paper_path(paper_id, METADATA_SUFFIX)).get("newer_version")
+
+
+def _satisfies(stored: Optional[str], requested: str) -> bool:
+    """Check whether a stored tier is good enough for a requested one."""
+    return stored is not None and (stored == "full" or requested == "fast")
+
+
+def _converter_for(tier: str, source: str) -> str:
+    """Identify the converter used for a tier and input kind."""
+    converter = (
+        LATEX_CONVERTER_VERSION if source == "latex" else converter_version(tier)
+    )
+    if settings.POSTPROCESS_MARKDOWN:
+        converter += f"+{POSTPROCESS_VERSION}"
+    return converter
+
+
+def _record_conversion(
+    paper_id: str, tier: str, source: str = "pdf", raw_bytes: Optional[int] = None
+) -> None:
+    """Record how a stored paper was converted and how large it is.
+
+    With ``SPLIT_REFERENCES``, the references section is moved into its own
+    file first. ``raw_bytes`` is the converter's output size before
+    post-processing; it is unknown for papers restored from the cache.
+    """
+    store = default_store()
+    md_path = store.path(paper_id, ".md")
+    with open(md_path, encoding="utf-8", errors="replace") as f:
+        title = find_title(f.read(_TITLE_BYTES))
+    if settings.SPLIT_REFERENCES:
+        stored_bytes, references_bytes = split_references_file(md_path)
+    else:
+        stored_bytes, references_bytes = md_path.stat().st_size, 0
+    if references_bytes:
+        store.finalize(paper_id, REFERENCES_SUFFIX)
+    else:
+        store.delete(paper_id, REFERENCES_SUFFIX)
+    store.finalize(paper_id, ".md")
+
+    if raw_bytes:
+        saved = raw_bytes - stored_bytes - references_bytes
+        logger.info(
+            f"Post-processing removed {saved} of {raw_bytes} bytes from {paper_id}"
+        )
+    update_metadata(
+        get_paper_path(paper_id, METADATA_SUFFIX),
+        paper_id=paper_id,
+        tier=tier,
+        source=source,
+        converter=_converter_for(tier, source),
+        converted_at=datetime.now().isoformat(),
+        title=title,
+        arxiv_id=PaperId.from_key(paper_id).canonical,
+        version=PaperId.from_key(paper_id).version,
+        raw_bytes=raw_bytes,
+        stored_bytes=stored_bytes,
+        references_bytes=references_bytes,
+    )
+    # Let the other servers sharing the corpus skip the conversion
+    store.publish(paper_id)
+
+
+def paper_sizes(paper_id: str) -> Dict[str, Any]:
+    """Report a stored paper's size and how much post-processing saved.
+
+    Returns:
+        Dict[str, Any]: ``stored_bytes`` and ``references_bytes``, plus
+        ``raw_bytes`` and the fractional ``reduction`` of the stored paper
+        when the converter's output size is known, and ``disk_bytes``, the
+        space the paper takes on disk after compression.
+    """
+    metadata = read_metadata(get_paper_path(paper_id, METADATA_SUFFIX))
+    sizes = {
+        key: metadata[key]
+        for key in ("raw_bytes", "stored_bytes", "references_bytes")
+        if metadata.get(key) is not None
+    }
+    store = default_store()
+    sizes["disk_bytes"] = store.disk_usage(paper_id) + store.disk_usage(
+        paper_id, REFERENCES_SUFFIX
+    )
+    if sizes.get("raw_bytes") and "stored_bytes" in sizes:
+        sizes["reduction"] = round(1 - sizes["stored_bytes"] / sizes["raw_bytes"], 3)
+    return sizes
+
+
+def _hash_input(paper_id: str, input_path: Path, source: str = "pdf") -> Optional[str]:
+    """Hash a downloaded PDF or e-print and map the paper ID onto it in the cache."""
+    if conversion_cache is None:
+        return None
     try:
-        logger.info(f"Starting conversion for {paper_id}")
-        markdown = pymupdf4llm.to_markdown(pdf_path, show_progress=False)
-        md_path = get_paper_path(paper_id, ".md")
+        digest = hash_file(input_path)
+        conversion_cache.link(paper_id, digest, kind=source)
+        return digest
+    except OSError as e:
+        logger.warning(f"Could not hash {source} input for {paper_id}: {str(e)}")
+        return None
 
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(markdown)
 
-        status = conversion_statuses.get(paper_id)
-        if status:
-            status.status = "success"
-            status.completed_at = datetime.now()
+def _cache_candidates(digest: str, tier: str, source: str) -> List[tuple]:
+    """List the (digest, tier, source) conversions that satisfy a request.
+
+    LaTeX conversions are complete, so they count as full. A full PDF
+    conversion also satisfies a fast request, so it is tried first.
+    """
+    if source == "latex":
+        return [(digest, "full", "latex")]
+    tiers = ("full", "fast") if tier == "fast" else ("full",)
+    return [(digest, candidate, "pdf") for candidate in tiers]
+
+
+def _restore_cached(
+    paper_id: str,
+    tier: str = "full",
+    digest: Optional[str] = None,
+    source: str = "pdf",
+) -> bool:
+    """Restore a paper's markdown from the conversion cache, if present.
+
+    With a digest, only conversions of that input are considered. Without
+    one, the LaTeX source and PDF recorded for the paper ID are both tried.
+    """
+    if conversion_cache is None:
+        return False
+    if digest:
+        candidates = _cache_candidates(digest, tier, source)
+    else:
+        candidates = []
+        for kind in ("latex", "pdf"):
+            recorded = conversion_cache.lookup(paper_id, kind)
+            if recorded:
+                candidates += _cache_candidates(recorded, tier, kind)
+
+    for candidate_digest, candidate_tier, candidate_source in candidates:
+        try:
+            restored = conversion_cache.restore(
+                candidate_digest,
+                {"paper.md": get_paper_path(paper_id, ".md")},
+                converter=_converter_for(candidate_tier, candidate_source),
+            )
+        except OSError as e:
+            logger.warning(f"Could not restore {paper_id} from cache: {str(e)}")
+            return False
+        if restored:
+            _record_conversion(paper_id, candidate_tier, candidate_source)
+            return True
+    return False
+
+
+def _cache_conversion(paper_id: str, digest: str, tier: str, source: str) -> None:
+    """Store a freshly converted paper in the conversion cache."""
+    try:
+        conversion_cache.put(
+            digest,
+            {"paper.md": get_paper_path(paper_id, ".md")},
+            converter=_converter_for(tier, source),
+        )
+    except OSError as e:
+        logger.warning(f"Could not cache conversion of {paper_id}: {str(e)}")
+
+
+def _mark_failed(paper_id: Optional[str], error: str, outcome: str = "error") -> None:
+    """Record a failed download so that the paper can be requested again."""
+    status = conversion_statuses.get(paper_id)
+    if status and status.status == "downloading":
+        conversion_statuses.update_status(paper_id, status=outcome, error=error)
+        progress_board.report(paper_id, outcome, message=error)
+
+
+def _report_download(paper_id: str, received: int, total: Optional[int]) -> None:
+    """Report how much of a paper's PDF was downloaded."""
+    if total:
+        message = f"Downloading PDF: {received / 1e6:.1f} of {total / 1e6:.1f} MB"
+    else:
+        message = f"Downloading PDF: {received / 1e6:.1f} MB"
+    progress_board.report(paper_id, "downloading", received, total, message)
+
+
+async def _download_pdf(paper_id: str, pdf_path: Path) -> None:
+    """Stream a paper's PDF from arXiv, publishing it atomically."""
+    progress_board.report(paper_id, "downloading", message="Downloading PDF")
+    size = await download_pdf(
+        PaperId.from_key(paper_id).canonical,
+        pdf_path,
+        timeout=settings.REQUEST_TIMEOUT,
+        retries=settings.DOWNLOAD_RETRIES,
+        on_progress=lambda received, total: _report_download(paper_id, received, total),
+    )
+    default_store().refresh(paper_id, ".pdf")
+    logger.info(f"Downloaded {size} bytes of PDF for {paper_id}")
+
+
+async def _convert(
+    paper_id: str, input_path: Path, tier: str, source: str = "pdf"
+) -> None:
+    """Convert a downloaded PDF or e-print, reusing a cached conversion."""
+    digest = await asyncio.to_thread(_hash_input, paper_id, input_path, source)
+    if digest and await asyncio.to_thread(
+        _restore_cached, paper_id, tier, digest, source
+    ):
+        logger.info(f"Conversion cache hit for {paper_id}")
+        return
+
+    def report_page(page: int, pages: int) -> None:
+        progress_board.report(
+            paper_id, "converting", page, pages, f"Converting page {page} of {pages}"
+        )
+
+    # Conversions queue for the workers, each client getting its share
+    progress_board.report(
+        paper_id, "converting", message="Waiting for a conversion worker"
+    )
+    async with admission.slot(CONVERSION):
+        logger.info(f"Starting {tier} {source} conversion for {paper_id}")
+        progress_board.report(
+            paper_id,
+            "converting",
+            message=f"Converting {'LaTeX source' if source == 'latex' else 'PDF'}",
+        )
+        stats = await convert_in_worker(
+            input_path,
+            get_paper_path(paper_id, ".md"),
+            tier=tier,
+            source=source,
+            postprocess=settings.POSTPROCESS_MARKDOWN,
+            timeout=settings.CONVERSION_TIMEOUT,
+            memory_limit_mb=settings.CONVERSION_MEMORY_LIMIT_MB,
+            on_page=report_page,
+        )
+    # Cache the whole paper; references are split out per store
+    if digest:
+        await asyncio.to_thread(_cache_conversion, paper_id, digest, tier, source)
+    await asyncio.to_thread(
+        _record_conversion, paper_id, tier, source, (stats or {}).get("raw_bytes")
+    )
+    if source == "pdf":
+        # The PDF is kept for later upgrades, compressed like the rest
+        await asyncio.to_thread(default_store().finalize, paper_id, ".pdf")
+
+
+async def _enforce_quota() -> None:
+    """Evict least recently used files if the store exceeds its quota."""
+    if not settings.STORAGE_QUOTA_MB:
+        return
+    try:
+        await asyncio.to_thread(
+            enforce_quota,
+            default_store(),
+            settings.STORAGE_QUOTA_MB * 1024 * 1024,
+            active_paper_ids(),
+        )
+    except OSError as e:
+        logger.warning(f"Could not enforce the storage quota: {str(e)}")
+
+
+async def _track_conversion(paper_id: str, conversion: Awaitable[None]) -> None:
+    """Await a conversion, keeping the paper's status up to date."""
+    # The conversion outlives the call that started it
+    current_deadline.set(None)
+    try:
+        await conversion
+
+        conversion_statuses.update_status(paper_id, status="success")
+        progress_board.report(paper_id, "done", message="Paper is ready")
 
-        # Clean up PDF after successful conversion
         logger.info(f"Conversion completed for {paper_id}")
 
+        # Make room for the new paper by evicting cold ones
+        await _enforce_quota()
+
+    except asyncio.CancelledError:
+        logger.info(f"Conversion cancelled for {paper_id}")
+        conversion_statuses.update_status(
+            paper_id, status="cancelled", error="Conversion cancelled"
+        )
+        progress_board.report(paper_id, "cancelled", message="Conversion cancelled")
+        raise
+
     except Exception as e:
         logger.error(f"Conversion failed for {paper_id}: {str(e)}")
+        conversion_statuses.update_status(paper_id, status="error", error=str(e))
+        progress_board.report(paper_id, "error", message=f"Conversion failed: {e}")
+
+    finally:
+        conversion_tasks.pop(paper_id, None)
+        paper_locks().release(paper_id)
+
+
+async def convert_pdf_to_markdown(
+    paper_id: str, pdf_path: Path, tier: str = "full"
+) -> None:
+    """Convert PDF to Markdown in an isolated worker process."""
+    await _track_conversion(paper_id, _convert(paper_id, pdf_path, tier))
+
+
+async def convert_source_to_markdown(
+    paper_id: str, source_path: Path, tier: str = "full"
+) -> None:
+    """Convert a paper's LaTeX source to Markdown, falling back to its PDF."""
+
+    async def convert() -> None:
+        try:
+            await _convert(paper_id, source_path, tier, "latex")
+            return
+        except ConversionError as e:
+            logger.info(f"Falling back to PDF for {paper_id}: {str(e)}")
+
+        pdf_path = get_paper_path(paper_id, ".pdf")
+        if not await asyncio.to_thread(default_store().materialize, paper_id, ".pdf"):
+            conversion_statuses.update_status(paper_id, status="downloading")
+            await _download_pdf(paper_id, pdf_path)
+            conversion_statuses.update_status(paper_id, status="converting")
+        await _convert(paper_id, pdf_path, tier)
+
+    await _track_conversion(paper_id, convert())
+
+
+async def start_conversion(
+    paper_id: str, tier: str, prefer_source: bool = False
+) -> List[types.TextContent]:
+    """Download and convert a paper version that is not stored or being worked on.
+
+    The paper's lock is held from here until its conversion ends, so that
+    no other server process sharing the store works on it meanwhile. If
+    another process holds the lock, its job status is reported instead.
+
+    Args:
+        paper_id: The storage key of the paper version.
+        tier: The conversion tier.
+        prefer_source: Whether to convert the LaTeX source when arXiv has it.
+
+    Raises:
+        PaperNotFoundError: If arXiv has no PDF for the paper.
+    """
+    locks = paper_locks()
+    if not locks.acquire(paper_id):
         status = conversion_statuses.get(paper_id)
-        if status:
-            status.status = "error"
-            status.completed_at = datetime.now()
-            status.error = str(e)
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(
+                    {
+                        "status": status.status if status else "converting",
+                        "message": "Paper is already being processed",
+                        "paper_id": PaperId.from_key(paper_id).canonical,
+                        "tier": status.tier if status else tier,
+                    }
+                ),
+            )
+        ]
+    try:
+        # Another process may have stored the paper before we got the lock
+        stored = await asyncio.to_thread(default_store().refresh, paper_id)
+        if stored and _satisfies(stored_tier(paper_id), tier):
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "success",
+                            "message": "Paper already available",
+                            "paper_id": PaperId.from_key(paper_id).canonical,
+                            "tier": stored_tier(paper_id),
+                            "resource_uri": f"file://{get_paper_path(paper_id, '.md')}",
+                        }
+                    ),
+                )
+            ]
+        return await _start_conversion(paper_id, tier, prefer_source)
+    finally:
+        # Held on by the conversion task, if one was started
+        if paper_id not in conversion_tasks:
+            locks.release(paper_id)
+
+
+async def _start_conversion(
+    paper_id: str, tier: str, prefer_source: bool
+) -> List[types.TextContent]:
+    """Start a paper's download and conversion, holding the paper's lock."""
+    # A paper ID we have converted before can be served from the cache
+    if await asyncio.to_thread(_restore_cached, paper_id, tier):
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(
+                    {
+                        "status": "success",
+                        "message": "Paper restored from conversion cache",
+                        "tier": stored_tier(paper_id),
+                        "resource_uri": f"file://{get_paper_path(paper_id, '.md')}",
+                    }
+                ),
+            )
+        ]
+
+    # Start new download and conversion
+    pdf_path = get_paper_path(paper_id, ".pdf")
+
+    # Initialize status
+    conversion_statuses[paper_id] = ConversionStatus(
+        paper_id=paper_id,
+        status="downloading",
+        started_at=datetime.now(),
+        tier=tier,
+    )
+
+    # Source-first mode: convert the LaTeX source when arXiv has it
+    if prefer_source:
+        source_path = get_paper_path(paper_id, ".src")
+        progress_board.report(paper_id, "downloading", message="Downloading source")
+        try:
+            # An e-print left by an interrupted conversion is reused
+            has_source = source_path.exists() or await fetch_eprint(
+                PaperId.from_key(paper_id).canonical,
+                source_path,
+                timeout=settings.REQUEST_TIMEOUT,
+            )
+        except Exception as e:
+            logger.warning(f"Could not fetch source for {paper_id}: {str(e)}")
+            has_source = False
+
+        if has_source:
+            default_store().refresh(paper_id, ".src")
+            status = conversion_statuses.update_status(paper_id, status="converting")
+            conversion_tasks[paper_id] = asyncio.create_task(
+                convert_source_to_markdown(paper_id, source_path, tier)
+            )
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "converting",
+                            "message": "Paper source downloaded, LaTeX conversion started",
+                            "paper_id": PaperId.from_key(paper_id).canonical,
+                            "tier": tier,
+                            "started_at": status.started_at.isoformat(),
+                        }
+                    ),
+                )
+            ]
+
+    # Download PDF, unless it is still around from an earlier conversion
+    # (e.g. when upgrading a fast conversion to a full one)
+    if await asyncio.to_thread(default_store().materialize, paper_id, ".pdf"):
+        message = f"Paper available locally, {tier} conversion started"
+    else:
+        await _download_pdf(paper_id, pdf_path)
+        message = f"Paper downloaded, {tier} conversion started"
+
+    # Update status and start conversion
+    status = conversion_statuses.update_status(paper_id, status="converting")
+
+    # Start conversion in an isolated worker
+    conversion_tasks[paper_id] = asyncio.create_task(
+        convert_pdf_to_markdown(paper_id, pdf_path, tier)
+    )
+
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps(
+                {
+                    "status": "converting",
+                    "message": message,
+                    "paper_id": PaperId.from_key(paper_id).canonical,
+                    "tier": tier,
+                    "started_at": status.started_at.isoformat(),
+                }
+            ),
+        )
+    ]
+
+
+def _ready(paper_id: str) -> List[types.TextContent]:
+    """Answer that a stored paper is ready to be read."""
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps(
+                {
+                    "status": "success",
+                    "message": "Paper is ready",
+                    "paper_id": PaperId.from_key(paper_id).canonical,
+                    "tier": stored_tier(paper_id),
+                    "size": paper_sizes(paper_id),
+                    "resource_uri": f"file://{get_paper_path(paper_id, '.md')}",
+                }
+            ),
+        )
+    ]
+
+
+def wait_timeout(arguments: Dict[str, Any]) -> float:
+    """Get how long a download call may wait for its paper, in seconds."""
+    if not arguments.get("wait", False):
+        return 0.0
+    timeout = float(arguments.get("timeout", settings.DOWNLOAD_WAIT_TIMEOUT))
+    return max(0.0, min(timeout, settings.DOWNLOAD_WAIT_TIMEOUT))
+
+
+async def _wait_until_done(requested: PaperId, timeout: float) -> bool:
+    """Wait until the work on a requested paper ended.
+
+    Returns:
+        bool: False if the work was still going on after ``timeout`` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + timeout
+    while True:
+        status = conversion_statuses.get(_status_key(requested))
+        if not status or not _is_live(status):
+            return True
+        left = expires_at - loop.time()
+        if left <= 0:
+            return False
+        # Work of other server processes reports no progress here, so
+        # look again now and then
+        await progress_board.changed(min(left, 1.0))
 
 
 async def handle_download(arguments: Dict[str, Any]) -> List[types.TextContent]:
-    """Handle paper download and conversion requests."""
+    """Handle paper download and conversion requests.
+
+    With ``wait``, the call returns only once the paper is ready, the work
+    on it failed, or the wait timed out. If the client asked for progress,
+    the download and conversion progress is sent to it meanwhile.
+    """
+    if (
+        arguments.get("check_status", False)
+        or arguments.get("cancel", False)
+        or "paper_id" not in arguments
+    ):
+        return await _download(arguments)
+    requested = PaperId.parse(arguments["paper_id"])
+
+    following = None
+    if current_progress.get() is not None:
+        following = asyncio.create_task(follow(requested.key))
+    try:
+        response = await _download_and_wait(requested, arguments)
+    finally:
+        if following and not following.done():
+            following.cancel()
+        else:
+            # Nothing to follow, or the end was already reported
+            following = None
+    if following and json.loads(response[0].text).get("status") == "success":
+        await report_progress(100, 100, "Paper is ready")
+    return response
+
+
+async def _download_and_wait(
+    requested: PaperId, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Answer a download call, waiting for the paper if the call asks to."""
+    response = await _download(arguments)
+    timeout = wait_timeout(arguments)
+    status = json.loads(response[0].text).get("status")
+    if not timeout or status not in ("downloading", "converting"):
+        return response
+
+    ready = await _wait_until_done(requested, timeout)
+    paper_id = _status_key(requested)
+    status = conversion_statuses.get(paper_id)
+    if status and status.status == "success":
+        return _ready(paper_id)
+    response = await _download(
+        {"paper_id": arguments["paper_id"], "check_status": True}
+    )
+    if ready:
+        return response
+    status = json.loads(response[0].text)
+    status["message"] = f"Paper not ready after waiting {timeout:g} seconds"
+    return [types.TextContent(type="text", text=json.dumps(status))]
+
+
+async def _download(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Answer a download call without waiting for the conversion."""
+    paper_id = None
     try:
-        paper_id = arguments["paper_id"]
+        requested = PaperId.parse(arguments["paper_id"])
+        paper_id = _status_key(requested)
         check_status = arguments.get("check_status", False)
+        tier = arguments.get("tier", settings.DEFAULT_CONVERSION_TIER)
+        if tier not in TIERS:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "error",
+                            "message": f"Unknown tier {tier}; use one of {', '.join(TIERS)}",
+                        }
+                    ),
+                )
+            ]
+
+        if arguments.get("cancel", False):
+            task = conversion_tasks.get(paper_id)
+            if not task:
+                return [
+                    types.TextContent(
+                        type="text",
+                        text=json.dumps(
+                            {
+                                "status": "unknown",
+                                "message": "No conversion in progress",
+                            }
+                        ),
+                    )
+                ]
+            task.cancel()
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "cancelled",
+                            "message": "Paper conversion cancelled",
+                        }
+                    ),
+                )
+            ]
 
         # If only checking status
         if check_status:
             status = conversion_statuses.get(paper_id)
+            if status and status.active and not _is_live(status):
+                status.status = "interrupted"
+                status.error = "The server working on the paper stopped"
             if not status:
-                if get_paper_path(paper_id, ".md").exists():
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": "Paper is ready",
-                                    "resource_uri": f"file://{get_paper_path(paper_id, '.md')}",
-                                }
-                            ),
-                        )
-                    ]
+                stored = await asyncio.to_thread(default_store().resolve, requested)
+                if stored:
+                    return _ready(stored)
                 return [
                     types.TextContent(
                         type="text",
@@ -133,14 +828,25 @@ async def handle_download(arguments: Dict[str, Any]) -> List[types.TextContent]:
                                 else None
                             ),
                             "error": status.error,
+                            "tier": status.tier,
                             "message": f"Paper conversion {status.status}",
+                            "size": (
+                                paper_sizes(paper_id)
+                                if status.status == "success"
+                                else None
+                            ),
                         }
                     ),
                 )
             ]
 
-        # Check if paper is already converted
-        if get_paper_path(paper_id, ".md").exists():
+        # Check if paper is already converted at the requested tier; any
+        # stored version that fits the request will do
+        stored = await asyncio.to_thread(default_store().resolve, requested)
+        current_tier = stored_tier(stored) if stored else None
+        if _satisfies(current_tier, tier):
+            paper_id = stored
+            default_store().touch(paper_id)
             return [
                 types.TextContent(
                     type="text",
@@ -148,15 +854,27 @@ async def handle_download(arguments: Dict[str, Any]) -> List[types.TextContent]:
                         {
                             "status": "success",
                             "message": "Paper already available",
+                            "paper_id": PaperId.from_key(paper_id).canonical,
+                            "tier": current_tier,
+                            "newer_version": newer_version(paper_id),
+                            "size": paper_sizes(paper_id),
                             "resource_uri": f"file://{get_paper_path(paper_id, '.md')}",
                         }
                     ),
                 )
             ]
 
-        # Check if already in progress
-        if paper_id in conversion_statuses:
-            status = conversion_statuses[paper_id]
+        if stored:
+            # Upgrade the stored version to the requested tier
+            paper_id = stored
+        elif requested.version is None and paper_id not in conversion_statuses:
+            # Pin the request to the latest version, which is what arXiv
+            # would serve
+            paper_id = (await resolve_latest(requested)).key
+
+        # Check if already in progress; failed or cancelled papers are retried
+        status = conversion_statuses.get(paper_id)
+        if status and _is_live(status):
             return [
                 types.TextContent(
                     type="text",
@@ -164,63 +882,115 @@ async def handle_download(arguments: Dict[str, Any]) -> List[types.TextContent]:
                         {
                             "status": status.status,
                             "message": f"Paper conversion {status.status}",
+                            "tier": status.tier,
                             "started_at": status.started_at.isoformat(),
                         }
                     ),
                 )
             ]
 
-        # Start new download and conversion
-        pdf_path = get_paper_path(paper_id, ".pdf")
-        client = arxiv.Client()
-
-        # Initialize status
-        conversion_statuses[paper_id] = ConversionStatus(
-            paper_id=paper_id, status="downloading", started_at=datetime.now()
+        return await start_conversion(
+            paper_id,
+            tier,
+            arguments.get("prefer_source", settings.PREFER_LATEX_SOURCE),
         )
 
-        # Download PDF
-        paper = next(client.results(arxiv.Search(id_list=[paper_id])))
-        paper.download_pdf(dirpath=pdf_path.parent, filename=pdf_path.name)
-
-        # Update status and start conversion
-        status = conversion_statuses[paper_id]
-        status.status = "converting"
-
-        # Start conversion in thread
-        asyncio.create_task(
-            asyncio.to_thread(convert_pdf_to_markdown, paper_id, pdf_path)
-        )
-
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "status": "converting",
-                        "message": "Paper downloaded, conversion started",
-                        "started_at": status.started_at.isoformat(),
-                    }
-                ),
-            )
-        ]
-
-    except StopIteration:
+    except asyncio.CancelledError:
+        # A call given up by its deadline or client leaves no stuck download;
+        # the paper's lock was released on the way out of start_conversion
+        _mark_failed(paper_id, "Download cancelled", "cancelled")
+        raise
+    except PaperNotFoundError:
+        message = f"Paper {PaperId.from_key(paper_id)} not found on arXiv"
+        _mark_failed(paper_id, message)
         return [
             types.TextContent(
                 type="text",
                 text=json.dumps(
                     {
                         "status": "error",
-                        "message": f"Paper {paper_id} not found on arXiv",
+                        "message": message,
                     }
                 ),
             )
         ]
     except Exception as e:
+        _mark_failed(paper_id, str(e))
         return [
             types.TextContent(
                 type="text",
                 text=json.dumps({"status": "error", "message": f"Error: {str(e)}"}),
             )
         ]
+
+
+def open_job_table() -> List[ConversionStatus]:
+    """Persist job statuses next to the stored papers.
+
+    Returns:
+        List[ConversionStatus]: Jobs of an earlier run that were still active
+        when it stopped.
+    """
+    return conversion_statuses.open(default_store().root / JOBS_FILE)
+
+
+def plan_recovery(interrupted: List[ConversionStatus]) -> List[tuple]:
+    """Decide which work to resume after a restart.
+
+    That is the interrupted jobs, and papers with a downloaded PDF or
+    e-print but no markdown whose conversion did not fail or get
+    cancelled (orphans, e.g. of a crash before jobs were persisted). The
+    papers are marked as active right away, so that garbage collection
+    spares their files until they are resumed.
+
+    Returns:
+        List[tuple]: ``(paper_id, tier)`` of each paper to resume.
+    """
+    # Jobs of other servers sharing the store are left to them
+    locks = paper_locks()
+    plan = [
+        (status.paper_id, status.tier)
+        for status in interrupted
+        if not locks.locked(status.paper_id)
+    ]
+    planned = {paper_id for paper_id, _ in plan}
+    for paper_id in default_store().unconverted_ids():
+        if (
+            paper_id not in planned
+            and paper_id not in conversion_statuses
+            and not locks.locked(paper_id)
+        ):
+            plan.append((paper_id, settings.DEFAULT_CONVERSION_TIER))
+    recovering.update(paper_id for paper_id, _ in plan)
+    return plan
+
+
+async def recover(plan: List[tuple]) -> int:
+    """Resume the work found by ``plan_recovery``, one paper at a time.
+
+    Downloaded PDFs and e-prints are converted without downloading them
+    again, and partial downloads are resumed where they broke off.
+
+    Returns:
+        int: The number of papers converted.
+    """
+    store = default_store()
+    recovered = 0
+    for paper_id, tier in plan:
+        try:
+            if not store.exists(paper_id):
+                logger.info(f"Resuming interrupted conversion of {paper_id}")
+                await start_conversion(
+                    paper_id, tier, prefer_source=store.exists(paper_id, ".src")
+                )
+        except Exception as e:
+            logger.warning(f"Could not resume work on {paper_id}: {str(e)}")
+            _mark_failed(paper_id, str(e))
+        finally:
+            recovering.discard(paper_id)
+        task = conversion_tasks.get(paper_id)
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+        if store.exists(paper_id):
+            recovered += 1
+    return recovered
@@ -1,13 +1,15 @@
 """List functionality for the arXiv MCP server."""
 
+import asyncio
 import json
-from pathlib import Path
-import arxiv
 from typing import Dict, Any, List, Optional
 import mcp.types as types
-from ..config import Settings
+from ..catalog import fetch_results
+from ..config import get_settings
+from ..identity import PaperId
+from ..storage.store import default_store
 
-settings = Settings()
+settings = get_settings()
 
 list_tool = types.Tool(
     name="list_papers",
@@ -21,8 +23,8 @@ list_tool = types.Tool(
 
 
 def list_papers() -> list[str]:
-    """List all stored paper IDs."""
-    return [p.stem for p in Path(settings.STORAGE_PATH).glob("*.md")]
+    """List all stored paper IDs, with their version."""
+    return [PaperId.from_key(key).canonical for key in default_store().paper_ids()]
 
 
 async def handle_list_papers(
@@ -30,11 +32,10 @@ async def handle_list_papers(
 ) -> List[types.TextContent]:
     """Handle requests to list all stored papers."""
     try:
-        papers = list_papers()
+        papers = await asyncio.to_thread(list_papers)
 
-        client = arxiv.Client()
-
-        results = client.results(arxiv.Search(id_list=papers))
+        # Batched and rate limited; the store may hold many papers
+        results = await asyncio.to_thread(fetch_results, papers)
 
         response_data = {
             "total_papers": len(papers),
@@ -1,12 +1,16 @@
 """Read functionality for the arXiv MCP server."""
 
+import asyncio
 import json
-from pathlib import Path
 from typing import Dict, Any, List
 import mcp.types as types
-from ..config import Settings
+from ..config import get_settings
+from ..converters import REFERENCES_SUFFIX, join_references
+from ..identity import PaperId
+from ..storage import METADATA_SUFFIX, read_metadata
+from ..storage.store import default_store
 
-settings = Settings()
+settings = get_settings()
 
 read_tool = types.Tool(
     name="read_paper",
@@ -16,8 +20,13 @@ read_tool = types.Tool(
         "properties": {
             "paper_id": {
                 "type": "string",
-                "description": "The arXiv ID of the paper to read",
-            }
+                "description": "The arXiv ID of the paper to read; without a version, the newest stored version is read",
+            },
+            "include_references": {
+                "type": "boolean",
+                "description": "If true, include the references section when it is stored separately from the paper",
+                "default": False,
+            },
         },
         "required": ["paper_id"],
     },
@@ -25,41 +34,53 @@ read_tool = types.Tool(
 
 
 def list_papers() -> list[str]:
-    """List all stored paper IDs."""
-    return [p.stem for p in Path(settings.STORAGE_PATH).glob("*.md")]
+    """List all stored paper IDs, with their version."""
+    return [PaperId.from_key(key).canonical for key in default_store().paper_ids()]
 
 
 async def handle_read_paper(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle requests to read a paper's content."""
     try:
-        paper_ids = list_papers()
-        paper_id = arguments["paper_id"]
-        # Check if paper exists
-        if paper_id not in paper_ids:
+        store = default_store()
+        requested = PaperId.parse(arguments["paper_id"])
+        # Find the stored version that serves the request
+        paper_id = await asyncio.to_thread(store.resolve, requested)
+        if paper_id is None:
             return [
                 types.TextContent(
                     type="text",
                     text=json.dumps(
                         {
                             "status": "error",
-                            "message": f"Paper {paper_id} not found in storage. You may need to download it first using download_paper.",
+                            "message": f"Paper {requested} not found in storage. You may need to download it first using download_paper.",
                         }
                     ),
                 )
             ]
 
-        # Get paper content
-        content = Path(settings.STORAGE_PATH, f"{paper_id}.md").read_text(
-            encoding="utf-8"
-        )
+        # Get paper content, decompressing it if needed
+        content = store.read_text(paper_id)
+        store.touch(paper_id)
 
+        # References may have been split out of the paper to keep reads small
+        references_available = store.exists(paper_id, REFERENCES_SUFFIX)
+        if references_available and arguments.get("include_references", False):
+            content = join_references(
+                content, store.read_text(paper_id, REFERENCES_SUFFIX)
+            )
+
+        metadata = read_metadata(store.path(paper_id, METADATA_SUFFIX))
         return [
             types.TextContent(
                 type="text",
                 text=json.dumps(
                     {
                         "status": "success",
-                        "paper_id": paper_id,
+                        "paper_id": PaperId.from_key(paper_id).canonical,
+                        "tier": metadata.get("tier", "full"),
+                        # Set by the freshness check if arXiv has a newer version
+                        "newer_version": metadata.get("newer_version"),
+                        "references_stored_separately": references_available,
                         "content": content,
                     }
                 ),
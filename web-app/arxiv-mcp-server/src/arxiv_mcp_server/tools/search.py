@@ -1,16 +1,23 @@
 """Search functionality for the arXiv MCP server."""
 
-import arxiv
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
 from datetime import datetime, timezone
 from dateutil import parser
 import mcp.types as types
-from ..config import Settings
+from ..catalog import api_limiter, arxiv_client
+from ..config import get_settings
+from ..deadlines import check_deadline
+from ..progress import current_progress, report_progress
+
+if TYPE_CHECKING:
+    import arxiv
 
 logger = logging.getLogger("arxiv-mcp-server")
-settings = Settings()
+settings = get_settings()
 
 # Valid arXiv category prefixes for validation
 VALID_CATEGORIES = {
@@ -114,6 +121,11 @@ TIPS FOR FOUNDATIONAL RESEARCH:
                 "enum": ["relevance", "date"],
                 "description": "Sort results by 'relevance' (most relevant first, default) or 'date' (newest first). Use 'relevance' for focused searches, 'date' for recent developments.",
             },
+            "stream": {
+                "type": "boolean",
+                "description": "If true and the call has a progress token, send the results in batches as progress notifications as soon as they arrive, and end with a summary of IDs and titles only",
+                "default": False,
+            },
         },
         "required": ["query"],
     },
@@ -183,7 +195,7 @@ def _build_date_filter(date_from: str = None, date_to: str = None) -> str:
         raise ValueError(f"Invalid date format. Use YYYY-MM-DD format: {e}")
 
 
-def _process_paper(paper: arxiv.Result) -> Dict[str, Any]:
+def _process_paper(paper: "arxiv.Result") -> Dict[str, Any]:
     """Process paper information with resource URI."""
     return {
         "id": paper.get_short_id(),
@@ -197,10 +209,78 @@ def _process_paper(paper: arxiv.Result) -> Dict[str, Any]:
     }
 
 
+def _collect_results(
+    client: "arxiv.Client",
+    search: "arxiv.Search",
+    max_results: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    batch_size: int = 0,
+) -> List[Dict[str, Any]]:
+    """Fetch search results, filtering them by date client-side.
+
+    With ``on_batch``, every ``batch_size`` results are handed to it as soon
+    as they are parsed, and the remaining ones at the end.
+    """
+    results = []
+    batch_start = 0
+    for paper in client.results(search):
+        check_deadline()
+        if len(results) >= max_results:
+            break
+
+        # Apply client-side date filtering
+        paper_date = paper.published
+        if not paper_date.tzinfo:
+            paper_date = paper_date.replace(tzinfo=timezone.utc)
+
+        if date_from and paper_date < date_from:
+            continue
+        if date_to and paper_date > date_to:
+            continue
+
+        results.append(_process_paper(paper))
+        if on_batch and len(results) - batch_start >= batch_size:
+            # Send the batch before the client fetches the next page
+            on_batch(results[batch_start:])
+            batch_start = len(results)
+    if on_batch and len(results) > batch_start:
+        on_batch(results[batch_start:])
+    return results
+
+
+def _batch_sender(
+    loop: asyncio.AbstractEventLoop, max_results: int
+) -> Callable[[List[Dict[str, Any]]], None]:
+    """Make a sender of result batches as progress notifications.
+
+    The sender is called from the thread collecting the results, and
+    waits until each batch was sent, so that batches arrive in order.
+    """
+    sent = 0
+
+    def send(batch: List[Dict[str, Any]]) -> None:
+        nonlocal sent
+        sent += len(batch)
+        message = json.dumps({"papers": batch})
+        future = asyncio.run_coroutine_threadsafe(
+            report_progress(sent, max_results, message), loop
+        )
+        try:
+            future.result(settings.REQUEST_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning("Gave up sending a batch of search results")
+
+    return send
+
+
 async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle paper search requests with improved arXiv API integration."""
+    # Imported on first search, so that servers start fast
+    import arxiv
+
     try:
-        client = arxiv.Client()
         max_results = min(int(arguments.get("max_results", 10)), settings.MAX_RESULTS)
         base_query = arguments["query"]
 
@@ -271,10 +351,6 @@ async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
             sort_by=sort_criterion,
         )
 
-        # Process results with client-side date filtering
-        results = []
-        result_count = 0
-
         # Parse date filters if provided
         date_from_parsed = None
         date_to_parsed = None
@@ -300,25 +376,42 @@ async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
                     )
                 ]
 
-        for paper in client.results(search):
-            if result_count >= max_results:
-                break
-
-            # Apply client-side date filtering
-            paper_date = paper.published
-            if not paper_date.tzinfo:
-                paper_date = paper_date.replace(tzinfo=timezone.utc)
-
-            if date_from_parsed and paper_date < date_from_parsed:
-                continue
-            if date_to_parsed and paper_date > date_to_parsed:
-                continue
-
-            results.append(_process_paper(paper))
-            result_count += 1
+        # Streamed results are fetched one batch per API page, so that the
+        # top hits arrive while the rest is still being fetched
+        stream = arguments.get("stream", False) and current_progress.get() is not None
+        if stream:
+            client = arxiv_client(page_size=settings.STREAM_BATCH_SIZE)
+            on_batch = _batch_sender(asyncio.get_running_loop(), max_results)
+        else:
+            client = arxiv_client()
+            on_batch = None
+
+        # Share arXiv's rate limit with the server's other catalog queries
+        await api_limiter.wait_async()
+        # The arXiv client blocks, so page through the results in a thread
+        results = await asyncio.to_thread(
+            _collect_results,
+            client,
+            search,
+            max_results,
+            date_from_parsed,
+            date_to_parsed,
+            on_batch,
+            settings.STREAM_BATCH_SIZE,
+        )
 
         logger.info(f"Search completed: {len(results)} results returned")
-        response_data = {"total_results": len(results), "papers": results}
+        if stream:
+            # The full results were sent already
+            response_data = {
+                "total_results": len(results),
+                "streamed": True,
+                "papers": [
+                    {"id": paper["id"], "title": paper["title"]} for paper in results
+                ],
+            }
+        else:
+            response_data = {"total_results": len(results), "papers": results}
 
         return [
             types.TextContent(type="text", text=json.dumps(response_data, indent=2))
@@ -0,0 +1,53 @@
+"""Storage statistics for the arXiv MCP server."""
+
+import asyncio
+import json
+from typing import Dict, Any, List, Optional
+import mcp.types as types
+from ..config import get_settings
+from ..storage.maintenance import maintain, storage_stats
+from ..storage.store import default_store
+from .download import active_paper_ids
+
+settings = get_settings()
+
+storage_stats_tool = types.Tool(
+    name="storage_stats",
+    description="Show how much disk space stored papers take, by file kind, and how much of the storage quota is used",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "collect_garbage": {
+                "type": "boolean",
+                "description": "If true, first remove leftovers of interrupted downloads and failed conversions, and evict cold papers if the storage quota is exceeded",
+                "default": False,
+            },
+        },
+        "required": [],
+    },
+)
+
+
+async def handle_storage_stats(
+    arguments: Optional[Dict[str, Any]] = None,
+) -> List[types.TextContent]:
+    """Handle requests for storage statistics."""
+    try:
+        store = default_store()
+        quota_bytes = settings.STORAGE_QUOTA_MB * 1024 * 1024
+        response_data: Dict[str, Any] = {}
+        if (arguments or {}).get("collect_garbage", False):
+            response_data["maintenance"] = await asyncio.to_thread(
+                maintain,
+                store,
+                quota_bytes,
+                active_paper_ids(),
+                settings.STORAGE_GC_GRACE_PERIOD,
+            )
+        response_data.update(await asyncio.to_thread(storage_stats, store, quota_bytes))
+        return [
+            types.TextContent(type="text", text=json.dumps(response_data, indent=2))
+        ]
+
+    except Exception as e:
+        return [types.TextContent(type="text", text=f"Error: {str(e)}")]
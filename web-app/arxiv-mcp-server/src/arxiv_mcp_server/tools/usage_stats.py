@@ -0,0 +1,44 @@
+"""Usage statistics for the arXiv MCP server."""
+
+import json
+from typing import Dict, Any, List, Optional
+import mcp.types as types
+from ..admission import admission, current_client
+
+usage_stats_tool = types.Tool(
+    name="usage_stats",
+    description="Show how busy each tool is, and what each client used of the tools and of its quotas",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "all_clients": {
+                "type": "boolean",
+                "description": "If true, show the usage of every client rather than only your own",
+                "default": False,
+            },
+        },
+        "required": [],
+    },
+)
+
+
+async def handle_usage_stats(
+    arguments: Optional[Dict[str, Any]] = None,
+) -> List[types.TextContent]:
+    """Handle requests for usage statistics."""
+    try:
+        client = current_client.get()
+        clients = admission.client_stats()
+        if not (arguments or {}).get("all_clients", False):
+            clients = {client: clients.get(client, {})}
+        response_data = {
+            "client": client,
+            "tools": admission.stats(),
+            "clients": clients,
+        }
+        return [
+            types.TextContent(type="text", text=json.dumps(response_data, indent=2))
+        ]
+
+    except Exception as e:
+        return [types.TextContent(type="text", text=f"Error: {str(e)}")]
@@ -0,0 +1,202 @@
+"""Isolated worker process for PDF to Markdown conversion.
+
+Each conversion runs in its own child interpreter so that a pathological PDF
+cannot hang the server or exhaust its memory. The parent enforces a wall-clock
+timeout and can kill the child at any time; the child runs under an
+address-space ceiling where the platform supports one.
+
+The child reports its progress as JSON lines on stdout, ``{"page": 3,
+"pages": 12}``, and ends with a line of conversion statistics.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .converters import (
+    DEFAULT_TIER,
+    PageCallback,
+    convert_pdf,
+    find_running_lines,
+    postprocess_markdown,
+)
+from .converters.latex import SourceUnavailableError, latex_source_to_markdown
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+class ConversionError(Exception):
+    """Raised when a conversion worker fails."""
+
+
+class ConversionTimeoutError(ConversionError):
+    """Raised when a conversion exceeds its wall-clock timeout."""
+
+
+def _worker_command(
+    input_path: Path, md_path: Path, tier: str, source: str, postprocess: bool
+) -> List[str]:
+    """Build the command line that runs a single conversion."""
+    return [
+        sys.executable,
+        "-m",
+        "arxiv_mcp_server.worker",
+        str(input_path),
+        str(md_path),
+        tier,
+        source,
+        "1" if postprocess else "0",
+    ]
+
+
+def _limit_memory(limit_mb: int) -> None:
+    """Apply an address-space ceiling to the current (child) process."""
+    import resource
+
+    limit = limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        # Some platforms (notably macOS) refuse RLIMIT_AS; run unbounded there.
+        pass
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill a worker process, ignoring races with its own exit."""
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _read_output(
+    stream: asyncio.StreamReader, on_page: Optional[PageCallback]
+) -> Dict[str, Any]:
+    """Pass on the progress a worker reports, and get its statistics."""
+    stats: Dict[str, Any] = {}
+    async for line in stream:
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            continue
+        if not isinstance(message, dict):
+            continue
+        if "page" in message:
+            if on_page:
+                on_page(message["page"], message["pages"])
+        else:
+            stats = message
+    return stats
+
+
+async def convert_in_worker(
+    input_path: Path,
+    md_path: Path,
+    tier: str = DEFAULT_TIER,
+    source: str = "pdf",
+    postprocess: bool = True,
+    timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    on_page: Optional[PageCallback] = None,
+) -> Dict[str, Any]:
+    """Convert ``input_path`` to ``md_path`` in an isolated child process.
+
+    Args:
+        input_path: The PDF or LaTeX e-print to convert.
+        md_path: Where the markdown is written once conversion succeeds.
+        tier: Conversion tier for PDFs, one of ``converters.TIERS``.
+        source: The input kind, ``pdf`` or ``latex``.
+        postprocess: Whether to strip layout boilerplate from the markdown.
+        timeout: Wall-clock limit in seconds; ``None`` or 0 disables it.
+        memory_limit_mb: Address-space limit for the child; ``None`` or 0
+            disables it. Ignored on Windows.
+        on_page: Called with the number of pages converted so far and the
+            number of pages in all, as the worker reports them.
+
+    Returns:
+        Dict[str, Any]: Conversion statistics reported by the worker, such as
+        the markdown size before (``raw_bytes``) and after (``bytes``)
+        post-processing.
+
+    Raises:
+        ConversionTimeoutError: If the child runs longer than ``timeout``.
+        ConversionError: If the child exits with an error.
+    """
+    preexec_fn = None
+    if memory_limit_mb and sys.platform != "win32":
+        preexec_fn = functools.partial(_limit_memory, memory_limit_mb)
+
+    process = await asyncio.create_subprocess_exec(
+        *_worker_command(input_path, md_path, tier, source, postprocess),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        preexec_fn=preexec_fn,
+    )
+
+    async def run() -> tuple:
+        stats, stderr, _ = await asyncio.gather(
+            _read_output(process.stdout, on_page),
+            process.stderr.read(),
+            process.wait(),
+        )
+        return stats, stderr
+
+    try:
+        stats, stderr = await asyncio.wait_for(run(), timeout or None)
+    except asyncio.TimeoutError:
+        _kill(process)
+        await process.wait()
+        raise ConversionTimeoutError(f"Conversion timed out after {timeout} seconds")
+    except asyncio.CancelledError:
+        _kill(process)
+        await asyncio.shield(process.wait())
+        raise
+
+    if process.returncode != 0:
+        lines = stderr.decode("utf-8", errors="replace").strip().splitlines()
+        detail = lines[-1] if lines else f"exit code {process.returncode}"
+        raise ConversionError(f"Conversion worker failed: {detail}")
+    return stats
+
+
+def _print_progress(page: int, pages: int) -> None:
+    print(json.dumps({"page": page, "pages": pages}), flush=True)
+
+
+def main(argv: List[str]) -> int:
+    """Worker entry point: convert one paper and write its markdown atomically."""
+    input_path, md_path = Path(argv[0]), Path(argv[1])
+    tier = argv[2] if len(argv) > 2 else DEFAULT_TIER
+    source = argv[3] if len(argv) > 3 else "pdf"
+    postprocess = argv[4] != "0" if len(argv) > 4 else True
+
+    try:
+        if source == "latex":
+            markdown = latex_source_to_markdown(input_path)
+        else:
+            markdown = convert_pdf(input_path, tier, _print_progress)
+        raw_bytes = len(markdown.encode("utf-8"))
+        if postprocess:
+            running = find_running_lines(input_path) if source == "pdf" else None
+            markdown = postprocess_markdown(markdown, running)
+    except MemoryError:
+        print("MemoryError: conversion exceeded the memory limit", file=sys.stderr)
+        return 1
+    except SourceUnavailableError as e:
+        print(f"SourceUnavailableError: {e}", file=sys.stderr)
+        return 1
+
+    tmp_path = md_path.with_name(md_path.name + ".part")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(markdown)
+    os.replace(tmp_path, md_path)
+    print(json.dumps({"raw_bytes": raw_bytes, "bytes": len(markdown.encode("utf-8"))}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -6,6 +6,11 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, AsyncMock
 import arxiv
 from pathlib import Path
+from arxiv_mcp_server import catalog
+from arxiv_mcp_server.config import Settings
+from arxiv_mcp_server.storage import METADATA_SUFFIX, update_metadata
+from arxiv_mcp_server.storage import store as store_module
+from arxiv_mcp_server.storage.store import PaperStore
 
 
 class MockAuthor:
@@ -44,6 +49,43 @@ def mock_client(mock_paper):
     return client
 
 
+@pytest.fixture(autouse=True)
+def paper_store(tmp_path, monkeypatch):
+    """Give every test its own empty, indexed paper store."""
+    store = PaperStore(tmp_path / "papers", layout=Settings().STORAGE_LAYOUT)
+    store.load_index()
+    monkeypatch.setattr(store_module, "_default_store", store)
+    return store
+
+
+@pytest.fixture
+def stored_paper(paper_store):
+    """Store a converted paper, in the test's store unless given another."""
+
+    def store_paper(paper_id, store=None, **metadata):
+        store = store or paper_store
+        path = store.path(paper_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Paper", encoding="utf-8")
+        if metadata:
+            update_metadata(store.path(paper_id, METADATA_SUFFIX), **metadata)
+        store.refresh(paper_id)
+
+    return store_paper
+
+
+@pytest.fixture(autouse=True)
+def offline_catalog(monkeypatch):
+    """Keep version lookups from querying arXiv; tests override as needed."""
+    monkeypatch.setattr(catalog, "latest_versions", lambda bases: {})
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    """Let tests query the (mocked) catalog without waiting between requests."""
+    monkeypatch.setattr(catalog.api_limiter, "interval", 0)
+
+
 @pytest.fixture
 def temp_storage_path():
     """Create a temporary directory for paper storage during tests."""
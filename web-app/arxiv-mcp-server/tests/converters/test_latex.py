@@ -0,0 +1,107 @@
+"""Tests for LaTeX source conversion."""
+
+import gzip
+import io
+import tarfile
+import pytest
+from arxiv_mcp_server.converters import (
+    SourceUnavailableError,
+    latex_source_to_markdown,
+)
+from arxiv_mcp_server.converters.latex import latex_to_markdown
+
+MAIN_TEX = r"""
+\documentclass{article}
+\newcommand{\R}{\mathbb{R}}
+\title{On Things}
+\author{A. Author \and B. Author}
+\begin{document}
+\maketitle
+\begin{abstract}
+We study $x \in \R^n$.
+\end{abstract}
+\section{Introduction}\label{sec:intro}
+As shown in~\cite{foo,bar}, the loss % a comment
+satisfies
+\begin{equation}\label{eq:loss}
+  L(\theta) = \sum_{i=1}^n \ell_i(\theta) .
+\end{equation}
+\input{sections/method}
+\end{document}
+"""
+
+METHOD_TEX = r"""
+\section*{Method}
+\begin{itemize}
+  \item \textbf{First} step;
+  \item \emph{second} step, see Eq.~\eqref{eq:loss}.
+\end{itemize}
+"""
+
+
+def _tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_structure_and_math():
+    """Test that headings, lists and citations convert and math is verbatim."""
+    markdown = latex_to_markdown(
+        {"main.tex": MAIN_TEX, "sections/method.tex": METHOD_TEX}
+    )
+    assert markdown.startswith("# On Things\n\nA. Author, B. Author")
+    assert "## Abstract" in markdown
+    assert r"$x \in \R^n$" in markdown
+    assert "## Introduction" in markdown
+    assert "[foo, bar]" in markdown
+    assert "$$\nL(\\theta) = \\sum_{i=1}^n \\ell_i(\\theta) .\n$$" in markdown
+    assert "a comment" not in markdown
+    assert "## Method" in markdown
+    assert "- **First** step;" in markdown
+    assert "(eq:loss)" in markdown
+
+
+def test_tarball_eprint(temp_storage_path):
+    """Test reading a gzipped tar e-print with an included file."""
+    path = temp_storage_path / "paper.src"
+    path.write_bytes(
+        _tarball({"main.tex": MAIN_TEX, "sections/method.tex": METHOD_TEX})
+    )
+    markdown = latex_source_to_markdown(path)
+    assert "## Method" in markdown
+
+
+def test_single_file_eprint(temp_storage_path):
+    """Test reading an e-print that is a single gzipped TeX file."""
+    path = temp_storage_path / "paper.src"
+    path.write_bytes(gzip.compress(MAIN_TEX.encode("utf-8")))
+    assert "## Introduction" in latex_source_to_markdown(path)
+
+
+def test_pdf_only_eprint(temp_storage_path):
+    """Test that an e-print holding only a PDF is reported as unavailable."""
+    path = temp_storage_path / "paper.src"
+    path.write_bytes(b"%PDF-1.5 not source")
+    with pytest.raises(SourceUnavailableError):
+        latex_source_to_markdown(path)
+
+
+def test_tabular_becomes_markdown_table():
+    """Test that tables keep their caption and cells."""
+    markdown = latex_to_markdown(
+        {"main.tex": r"""\documentclass{article}\begin{document}
+\begin{table}\caption{Results}
+\begin{tabular}{lc}\hline
+Method & Score \\ \hline
+Ours & 0.9 \\
+\end{tabular}\end{table}
+\end{document}"""}
+    )
+    assert "*Table: Results*" in markdown
+    assert "| Method | Score |\n| --- | --- |\n| Ours | 0.9 |" in markdown
@@ -0,0 +1,45 @@
+"""Tests for the PDF conversion tiers."""
+
+import pytest
+from arxiv_mcp_server.converters import convert_pdf, converter_version
+
+
+@pytest.fixture
+def sample_pdf(temp_storage_path):
+    """Create a small PDF with a title, a section heading and body text."""
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "A Study of Things", fontsize=22)
+    page.insert_text((72, 120), "Introduction", fontsize=15)
+    page.insert_text((72, 150), "This paragraph explains the contri-", fontsize=10)
+    page.insert_text((72, 162), "bution of the paper in detail.", fontsize=10)
+    page.insert_text((72, 174), "More body text follows here to set", fontsize=10)
+    page.insert_text((72, 186), "the dominant font size of the page.", fontsize=10)
+    path = temp_storage_path / "sample.pdf"
+    doc.save(path)
+    return path
+
+
+def test_fast_tier_detects_headings(sample_pdf):
+    """Test that the fast tier turns large text into headings."""
+    markdown = convert_pdf(sample_pdf, "fast")
+    assert "# A Study of Things" in markdown
+    assert "## Introduction" in markdown or "### Introduction" in markdown
+
+
+def test_fast_tier_joins_hyphenation(sample_pdf):
+    """Test that words split across lines are rejoined."""
+    markdown = convert_pdf(sample_pdf, "fast")
+    assert "contribution of the paper" in markdown
+
+
+def test_unknown_tier(sample_pdf):
+    """Test that an unknown tier is rejected."""
+    with pytest.raises(ValueError):
+        convert_pdf(sample_pdf, "medium")
+
+
+def test_converter_versions_differ_by_tier():
+    """Test that cached fast and full conversions never collide."""
+    assert converter_version("fast") != converter_version("full")
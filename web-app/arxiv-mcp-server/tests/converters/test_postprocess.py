@@ -0,0 +1,145 @@
+"""Tests for markdown post-processing."""
+
+import pytest
+from arxiv_mcp_server.converters import (
+    REFERENCES_SUFFIX,
+    convert_pdf,
+    find_running_lines,
+    find_title,
+    join_references,
+    postprocess_markdown,
+    split_references_file,
+)
+from arxiv_mcp_server.converters.postprocess import (
+    REFERENCES_NOTE,
+    dehyphenate,
+    split_references,
+    strip_running_lines,
+)
+
+PAPER = """# A Study of Things
+
+## 1 Introduction
+
+Body text.
+
+## References
+
+[1] A. Author. A paper. 2020.
+
+[2] B. Author. Another paper. 2021.
+
+## A Proofs
+
+Appendix text.
+"""
+
+
+@pytest.fixture
+def paged_pdf(temp_storage_path):
+    """Create a PDF with a running header and page numbers on every page."""
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    for number in range(1, 5):
+        page = doc.new_page()
+        page.insert_text((72, 40), "Preprint. Under review.", fontsize=8)
+        page.insert_text((72, 120), f"Section {number} starts here.", fontsize=10)
+        page.insert_text((300, 800), str(number), fontsize=8)
+    path = temp_storage_path / "paged.pdf"
+    doc.save(path)
+    return path
+
+
+def test_strips_running_headers_and_page_numbers(paged_pdf):
+    """Test that margin lines repeated on every page are removed."""
+    running = find_running_lines(paged_pdf)
+    assert running == {"preprint. under review.": 4, "#": 4}
+
+    markdown = postprocess_markdown(convert_pdf(paged_pdf, "fast"), running)
+    assert "Preprint" not in markdown
+    assert "\n2\n" not in markdown
+    assert "Section 3 starts here." in markdown
+
+
+def test_running_lines_spare_headings_and_body_numbers():
+    """Test that a running title keeps its heading, and numbers in the body."""
+    markdown = "\n".join(
+        [
+            "# Deep Things",
+            "Deep Things",
+            "1",
+            "Results on page one:",
+            "42",
+            "Deep Things",
+            "2",
+            "More text.",
+            "Deep Things",
+        ]
+    )
+    stripped = strip_running_lines(markdown, {"deep things": 2, "#": 2})
+    assert stripped.split("\n") == [
+        "# Deep Things",
+        "Results on page one:",
+        "42",
+        "More text.",
+        # The header ran on two pages only
+        "Deep Things",
+    ]
+    assert find_title(stripped) == "Deep Things"
+
+
+def test_dehyphenates_and_normalizes():
+    """Test that split words are rejoined but suspended hyphens are kept."""
+    markdown = postprocess_markdown(
+        "The conver-\ngence of pre- and post-processing.   \n\n\n\nNext hetero-\ngeneous"
+    )
+    assert markdown == (
+        "The convergence of pre- and post-processing.\n\nNext heterogeneous\n"
+    )
+
+
+def test_dehyphenation_keeps_compounds_code_and_math():
+    """Test that only words broken at line ends in prose are rejoined."""
+    # Hyphens within a line are real
+    assert dehyphenate("long- term memory") == "long- term memory"
+    # Compounds broken after their hyphen keep it
+    assert dehyphenate("a self-\nsupervised model") == "a self-supervised model"
+    assert dehyphenate("fine-tuned, then fine-\ntuned") == (
+        "fine-tuned, then fine-tuned"
+    )
+    # Code and math are left alone
+    assert dehyphenate("call `parse-\nargs` now") == "call `parse-\nargs` now"
+    assert dehyphenate("```\nx = a-\nb\n```\nconver-\ngence") == (
+        "```\nx = a-\nb\n```\nconvergence"
+    )
+    assert dehyphenate("$$\nab-\ncd\n$$ and $x-\ny$") == "$$\nab-\ncd\n$$ and $x-\ny$"
+
+
+def test_split_and_join_references():
+    """Test that references are split up to the appendix and restored."""
+    body, references = split_references(PAPER)
+    assert references.startswith("[1] A. Author")
+    assert "Another paper" not in body
+    assert f"## References\n\n{REFERENCES_NOTE}\n\n## A Proofs" in body
+    assert join_references(body, references) == PAPER
+
+
+def test_split_references_file(temp_storage_path):
+    """Test splitting a stored paper, twice."""
+    md_path = temp_storage_path / "2103.12345.md"
+    md_path.write_text(PAPER, encoding="utf-8")
+
+    stored, references = split_references_file(md_path)
+    references_path = temp_storage_path / f"2103.12345{REFERENCES_SUFFIX}"
+    assert references == references_path.stat().st_size > 0
+    assert stored == md_path.stat().st_size
+
+    assert split_references_file(md_path) == (stored, references)
+    assert references_path.read_text(encoding="utf-8").startswith("[1]")
+
+
+def test_find_title():
+    """Test that a paper's title is its first heading near the top."""
+    assert find_title(PAPER) == "A Study of Things"
+    assert find_title("Preprint\n\n## **Bold Title**\n\nText") == "Bold Title"
+    assert find_title("No headings at all") is None
@@ -0,0 +1,77 @@
+"""Tests for the stored papers served as MCP resources."""
+
+import asyncio
+import pytest
+from arxiv_mcp_server.resources import (
+    ResourceListNotifier,
+    list_paper_resources,
+    read_paper_resource,
+)
+
+
+def test_resources_are_listed_in_pages(paper_store, stored_paper, mocker):
+    """Test that the list comes from local metadata, one page at a time."""
+    results = mocker.patch("arxiv.Client.results")
+    paper_store.backend = mocker.Mock()
+    for number in range(1, 4):
+        stored_paper(f"2401.0000{number}v1", tier="full", title=f"Paper {number}")
+
+    first = list_paper_resources(page_size=2)
+    assert [str(r.uri) for r in first.resources] == [
+        "arxiv://2401.00001v1",
+        "arxiv://2401.00002v1",
+    ]
+    assert first.resources[0].title == "Paper 1"
+    assert first.resources[0].mimeType == "text/markdown"
+
+    second = list_paper_resources(first.nextCursor, page_size=2)
+    assert [r.name for r in second.resources] == ["2401.00003v1"]
+    assert second.nextCursor is None
+    results.assert_not_called()
+    paper_store.backend.list_keys.assert_not_called()
+
+
+def test_read_stored_paper_by_uri(paper_store, stored_paper):
+    """Test that stored papers are read by arxiv:// and file:// URI."""
+    stored_paper("2401.00001v2", tier="full", title="Paper")
+
+    assert read_paper_resource("arxiv://2401.00001v2").startswith("# Paper")
+    # Without a version, the newest stored one is read
+    assert read_paper_resource("arxiv://2401.00001").startswith("# Paper")
+    file_uri = paper_store.path("2401.00001v2").as_uri()
+    assert read_paper_resource(file_uri).startswith("# Paper")
+
+    with pytest.raises(ValueError, match="not stored"):
+        read_paper_resource("arxiv://2401.99999")
+    with pytest.raises(ValueError, match="Unknown resource"):
+        read_paper_resource("https://example.com/paper")
+
+
+class _Session:
+    def __init__(self):
+        self.notified = 0
+
+    async def send_resource_list_changed(self):
+        self.notified += 1
+
+
+async def test_list_changes_are_announced(paper_store, stored_paper):
+    """Test that storing papers sends one list_changed to watching sessions."""
+    notifier = ResourceListNotifier(delay=0.05)
+    notifier.attach(paper_store, asyncio.get_running_loop())
+    session, bystander = _Session(), _Session()
+    notifier.watch(session)
+
+    # Conversions finish in worker threads
+    await asyncio.to_thread(stored_paper, "2401.00001v1", tier="full")
+    await asyncio.to_thread(stored_paper, "2401.00002v1", tier="full")
+    # Rewriting a stored paper does not change the list
+    paper_store.refresh("2401.00001v1")
+    await asyncio.sleep(0.2)
+
+    assert session.notified == 1
+    assert bystander.notified == 0
+
+    paper_store.delete("2401.00001v1", ".md")
+    await asyncio.sleep(0.2)
+    assert session.notified == 2
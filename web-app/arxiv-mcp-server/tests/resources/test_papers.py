@@ -0,0 +1,44 @@
+"""Tests for storing papers through the paper manager."""
+
+import json
+import pytest
+import mcp.types as types
+from arxiv_mcp_server.resources import PaperManager
+from arxiv_mcp_server.resources import papers
+
+
+def _answer(**status):
+    return [types.TextContent(type="text", text=json.dumps(status))]
+
+
+@pytest.mark.asyncio
+async def test_store_paper_goes_through_the_download(mocker):
+    """Test that papers are stored by the download tool, pinned to a version."""
+    download = mocker.patch.object(
+        papers, "handle_download", return_value=_answer(status="success")
+    )
+
+    manager = PaperManager()
+    assert await manager.store_paper(
+        "2401.12345", "http://arxiv.org/pdf/2401.12345v2", prefer_source=True
+    )
+
+    arguments = download.call_args.args[0]
+    assert arguments["paper_id"] == "2401.12345v2"
+    assert arguments["prefer_source"] is True
+    assert arguments["wait"] is True
+
+
+@pytest.mark.asyncio
+async def test_store_paper_reports_failed_conversion(mocker):
+    """Test that a failed download or conversion raises ValueError."""
+    mocker.patch.object(
+        papers,
+        "handle_download",
+        return_value=_answer(
+            status="error", message="Paper conversion error", error="Worker timed out"
+        ),
+    )
+
+    with pytest.raises(ValueError, match="Worker timed out"):
+        await PaperManager().store_paper("2401.12345v1", "")
@@ -0,0 +1,55 @@
+"""Tests for reading papers through the arxiv:// resource template."""
+
+import asyncio
+import pytest
+from arxiv_mcp_server.resources import read_through
+from arxiv_mcp_server.tools import download as download_module
+from arxiv_mcp_server.tools.download import conversion_statuses, conversion_tasks
+
+
+@pytest.fixture
+def slow_conversion(mocker):
+    """Mock the download, and convert papers after ``release`` is set."""
+    release = asyncio.Event()
+    download = mocker.patch.object(download_module, "download_pdf", return_value=1024)
+    mocker.patch.object(download_module, "conversion_cache", None)
+
+    async def convert(pdf_path, md_path, **kwargs):
+        await release.wait()
+        md_path.write_text("# Fetched Paper\n\nBody", encoding="utf-8")
+
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=convert)
+    yield download, release
+    release.set()
+
+
+async def test_readers_share_one_fetch(slow_conversion):
+    """Test that concurrent reads of a missing paper fetch it once."""
+    download, release = slow_conversion
+    readers = [
+        asyncio.create_task(read_through("arxiv://2103.22221v1", 10)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.1)
+    release.set()
+
+    contents = await asyncio.gather(*readers)
+    assert all(content.startswith("# Fetched Paper") for content in contents)
+    assert download.call_count == 1
+    # Now stored, the paper is read without fetching
+    assert (await read_through("arxiv://2103.22221", 10)).startswith("# Fetched")
+    assert download.call_count == 1
+    conversion_statuses.pop("2103.22221v1", None)
+
+
+async def test_read_times_out_without_cancelling(slow_conversion):
+    """Test that a reader gives up waiting while the fetch goes on."""
+    download, release = slow_conversion
+    with pytest.raises(ValueError, match="not ready after"):
+        await read_through("arxiv://2103.22222v1", 0.1)
+
+    task = conversion_tasks["2103.22222v1"]
+    release.set()
+    await task
+    assert (await read_through("arxiv://2103.22222v1", 10)).startswith("# Fetched")
+    assert download.call_count == 1
+    conversion_statuses.pop("2103.22222v1", None)
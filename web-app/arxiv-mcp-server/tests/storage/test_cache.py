@@ -0,0 +1,74 @@
+"""Tests for the content-addressed conversion cache."""
+
+import pytest
+from arxiv_mcp_server.storage import ConversionCache
+from arxiv_mcp_server.storage.cache import hash_file
+from arxiv_mcp_server.tools import download
+from arxiv_mcp_server.tools.download import (
+    convert_pdf_to_markdown,
+    get_paper_path,
+)
+
+
+@pytest.fixture
+def cache(temp_storage_path):
+    return ConversionCache(temp_storage_path / "cache")
+
+
+def test_put_and_restore(cache, temp_storage_path):
+    """Test that stored artifacts are restored byte for byte."""
+    src = temp_storage_path / "paper.md"
+    src.write_text("# Paper\nBody", encoding="utf-8")
+
+    cache.put("ab" * 32, {"paper.md": src})
+    dest = temp_storage_path / "out" / "2103.12345.md"
+    assert cache.restore("ab" * 32, {"paper.md": dest})
+    assert dest.read_text(encoding="utf-8") == "# Paper\nBody"
+
+    # Publishing the same entry twice is harmless
+    cache.put("ab" * 32, {"paper.md": src})
+
+
+def test_miss_for_other_converter(cache, temp_storage_path):
+    """Test that entries are keyed by converter version as well as hash."""
+    src = temp_storage_path / "paper.md"
+    src.write_text("content", encoding="utf-8")
+    cache.put("cd" * 32, {"paper.md": src}, converter="old-converter")
+
+    assert cache.get("cd" * 32) is None
+    assert not cache.restore("cd" * 32, {"paper.md": temp_storage_path / "x.md"})
+
+
+def test_refs_handle_old_style_ids(cache):
+    """Test that paper IDs containing slashes map onto hashes."""
+    cache.link("hep-th/9901001", "ef" * 32)
+    assert cache.lookup("hep-th/9901001") == "ef" * 32
+    assert cache.lookup("hep-th/9901002") is None
+
+
+@pytest.mark.asyncio
+async def test_identical_pdf_converted_once(mocker, cache, temp_storage_path):
+    """Test that version aliases sharing a PDF trigger a single conversion."""
+    mocker.patch.object(download, "conversion_cache", cache)
+
+    async def mock_convert(pdf_path, md_path, **kwargs):
+        md_path.write_text("# Converted", encoding="utf-8")
+
+    worker = mocker.patch.object(
+        download, "convert_in_worker", side_effect=mock_convert
+    )
+
+    pdf_path = temp_storage_path / "paper.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 same bytes")
+    paper_ids = ["2199.00001", "2199.00001v1"]
+    try:
+        for paper_id in paper_ids:
+            await convert_pdf_to_markdown(paper_id, pdf_path)
+            assert get_paper_path(paper_id).read_text(encoding="utf-8") == (
+                "# Converted"
+            )
+        assert worker.call_count == 1
+        assert cache.lookup("2199.00001v1") == hash_file(pdf_path)
+    finally:
+        for paper_id in paper_ids:
+            get_paper_path(paper_id).unlink(missing_ok=True)
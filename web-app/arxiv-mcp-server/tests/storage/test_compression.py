@@ -0,0 +1,87 @@
+"""Tests for framed compression and the paper store."""
+
+import gzip
+import random
+import pytest
+from arxiv_mcp_server.config import Settings
+from arxiv_mcp_server.storage import PaperStore, compression
+from arxiv_mcp_server.storage.cli import main as storage_cli
+
+# Several frames of compressible but not trivially repetitive text
+rng = random.Random(0)
+TEXT = " ".join(
+    rng.choice(["gradient", "noise", "rate", "clipping", "convex", "bound"])
+    for _ in range(150_000)
+).encode("utf-8")
+
+codecs = pytest.mark.parametrize(
+    "codec",
+    [
+        "gzip",
+        pytest.param(
+            "zstd",
+            marks=pytest.mark.skipif(
+                "zstd" not in compression.available_codecs(),
+                reason="zstandard is not installed",
+            ),
+        ),
+    ],
+)
+
+
+@codecs
+def test_roundtrip_and_ranges(codec, temp_storage_path):
+    """Test that whole files and byte ranges read back exactly."""
+    path = compression.write_file(temp_storage_path / "paper.md", TEXT, codec)
+    assert path.name == "paper.md" + compression.SUFFIXES[codec]
+    assert path.stat().st_size < len(TEXT) / 2
+
+    frames = compression.frame_index(path)
+    assert len(frames) == -(-len(TEXT) // compression.FRAME_SIZE)
+    assert compression.read_bytes(path) == TEXT
+
+    start = compression.FRAME_SIZE - 10
+    assert compression.read_range(path, start, 20) == TEXT[start : start + 20]
+    assert compression.read_range(path, len(TEXT) - 5) == TEXT[-5:]
+
+
+def test_gzip_frames_are_standard_gzip(temp_storage_path):
+    """Test that framed gzip files stay readable by the standard library."""
+    path = compression.write_file(temp_storage_path / "paper.md", TEXT, "gzip")
+    assert gzip.decompress(path.read_bytes()) == TEXT
+
+
+def test_compressed_store_reads_transparently(temp_storage_path):
+    """Test that a compressing store serves its files like plain ones."""
+    store = PaperStore(temp_storage_path, "gzip")
+    store.path("2103.12345").write_bytes(TEXT)
+    store.path("2103.12345", ".references.md").write_text("[1] A.", "utf-8")
+
+    stored = store.finalize("2103.12345")
+    store.finalize("2103.12345", ".references.md")
+
+    assert stored.name == "2103.12345.md.gz"
+    assert not store.path("2103.12345").exists()
+    assert store.exists("2103.12345")
+    assert store.read_bytes("2103.12345") == TEXT
+    assert store.read_text("2103.12345", ".references.md") == "[1] A."
+    assert store.paper_ids() == ["2103.12345"]
+
+
+def test_migration_command(temp_storage_path, capsys):
+    """Test that the migration compresses a plain library and back."""
+    store = PaperStore(temp_storage_path, layout=Settings().STORAGE_LAYOUT)
+    store.path("2103.12345").write_bytes(TEXT)
+    store.path("2103.12346", ".pdf").write_bytes(b"%PDF-1.4 " + TEXT)
+
+    args = ["--storage-path", str(temp_storage_path), "compress"]
+    assert storage_cli(args + ["--codec", "gzip"]) == 0
+    assert "saved" in capsys.readouterr().out
+    assert sorted(entry.name for entry in store.walk()) == [
+        "2103.12345.md.gz",
+        "2103.12346.pdf.gz",
+    ]
+
+    assert storage_cli(args + ["--codec", "none"]) == 0
+    assert store.read_bytes("2103.12345") == TEXT
+    assert store.locate("2103.12346", ".pdf") == store.path("2103.12346", ".pdf")
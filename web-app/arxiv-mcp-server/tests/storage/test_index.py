@@ -0,0 +1,73 @@
+"""Tests for the in-memory storage index."""
+
+import os
+from arxiv_mcp_server.storage.store import PaperStore
+
+
+def test_index_answers_without_disk(temp_storage_path, mocker):
+    """Test that an indexed store looks papers up without touching the disk."""
+    store = PaperStore(temp_storage_path, layout="yymm")
+    store.path("2401.00001").write_text("# One", encoding="utf-8")
+    store.path("2401.00002", ".pdf").write_bytes(b"%PDF-")
+    store.load_index()
+
+    exists = mocker.patch("pathlib.Path.exists")
+    scandir = mocker.patch("os.scandir")
+    assert store.exists("2401.00001")
+    assert not store.exists("2401.00002")
+    assert store.exists("2401.00002", ".pdf")
+    assert store.paper_ids() == ["2401.00001"]
+    exists.assert_not_called()
+    scandir.assert_not_called()
+
+
+def test_index_follows_store_writes(temp_storage_path):
+    """Test that publishing, recoding and deleting files keeps the index current."""
+    store = PaperStore(temp_storage_path, "gzip", layout="yymm")
+    store.load_index()
+
+    store.path("2401.00001").write_text("# One", encoding="utf-8")
+    assert not store.exists("2401.00001")
+    store.finalize("2401.00001")
+    assert store.locate("2401.00001").name == "2401.00001.md.gz"
+    assert store.paper_ids() == ["2401.00001"]
+
+    store.recode("2401.00001", ".md", None)
+    assert store.read_text("2401.00001") == "# One"
+
+    store.delete("2401.00001", ".md")
+    assert store.paper_ids() == []
+
+
+def test_rescan_picks_up_outside_changes(temp_storage_path):
+    """Test that files added or removed from outside are found by a rescan."""
+    store = PaperStore(temp_storage_path, layout="yymm")
+    store.path("2401.00001").write_text("# One", encoding="utf-8")
+    store.load_index()
+
+    # Copied in by hand, into a new shard, and removed by hand
+    (temp_storage_path / "2402").mkdir()
+    (temp_storage_path / "2402" / "2402.00002.md").write_text("# Two")
+    os.remove(temp_storage_path / "2401" / "2401.00001.md")
+    for directory in (temp_storage_path, temp_storage_path / "2401"):
+        # Directory timestamps may be coarse; make the change visible
+        stat = directory.stat()
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert store.rescan_changed() == 2
+    assert store.paper_ids() == ["2402.00002"]
+    assert store.rescan_changed() == 0
+
+
+def test_stale_index_entry_is_refreshed_on_read(temp_storage_path):
+    """Test that a read falls back to the disk when the index is out of date."""
+    store = PaperStore(temp_storage_path, layout="yymm")
+    store.path("2401.00001").write_text("# One", encoding="utf-8")
+    store.load_index()
+
+    # Compressed by another process
+    other = PaperStore(temp_storage_path, "gzip", layout="yymm")
+    other.recode("2401.00001", ".md", "gzip")
+
+    assert store.read_text("2401.00001") == "# One"
+    assert store.locate("2401.00001").name == "2401.00001.md.gz"
@@ -0,0 +1,69 @@
+"""Tests for the sharded storage layout and its migration."""
+
+import pytest
+from arxiv_mcp_server.storage import compression
+from arxiv_mcp_server.storage.store import PaperStore, shard_for
+
+
+def test_shard_for():
+    """Test that papers are sharded by arXiv month, or by hash otherwise."""
+    assert shard_for("2401.12345", "flat") is None
+    assert shard_for("2401.12345v2", "yymm") == "2401"
+    assert shard_for("0704.0001", "yymm") == "0704"
+    assert shard_for("hep-th/9901001", "yymm") == shard_for("hep-th/9901001", "hash")
+    assert len(shard_for("2401.12345", "hash")) == 2
+    # All versions of a paper share a shard
+    assert shard_for("2401.12345v2", "hash") == shard_for("2401.12345", "hash")
+
+
+def test_unknown_layout(temp_storage_path):
+    """Test that an unknown layout is rejected."""
+    with pytest.raises(ValueError, match="Unknown layout"):
+        PaperStore(temp_storage_path, layout="by-author")
+
+
+def test_sharded_paths(temp_storage_path):
+    """Test that files are written into their shard."""
+    store = PaperStore(temp_storage_path, layout="yymm")
+    path = store.path("2401.12345", ".pdf")
+    assert path == temp_storage_path / "2401" / "2401.12345.pdf"
+    assert path.parent.is_dir()
+
+    path.with_suffix(".md").write_text("# Paper", encoding="utf-8")
+    (temp_storage_path / "2312.00001.md").write_text("# Flat", encoding="utf-8")
+    assert store.paper_ids() == ["2312.00001", "2401.12345"]
+
+
+def test_flat_files_readable_until_migrated(temp_storage_path):
+    """Test that a store switched to shards reads and migrates flat files."""
+    flat = PaperStore(temp_storage_path, "gzip")
+    flat.path("2401.12345").write_text("# Old", encoding="utf-8")
+    flat.finalize("2401.12345")
+    flat.path("2401.12345", ".meta.json").write_text("{}", encoding="utf-8")
+    flat.path("2401.12345", ".pdf.part").write_bytes(b"%PDF-")
+
+    store = PaperStore(temp_storage_path, "gzip", layout="hash")
+    assert store.read_text("2401.12345") == "# Old"
+    assert store.exists("2401.12345", ".meta.json")
+
+    assert store.migrate() == 2
+    shard = temp_storage_path / shard_for("2401.12345", "hash")
+    assert compression.codec_for(store.locate("2401.12345")) == "gzip"
+    assert store.locate("2401.12345").parent == shard
+    assert (shard / "2401.12345.meta.json").exists()
+    # Partial files are left for garbage collection
+    assert (temp_storage_path / "2401.12345.pdf.part").exists()
+    assert store.read_text("2401.12345") == "# Old"
+    assert store.migrate() == 0
+
+
+def test_finalize_replaces_flat_variant(temp_storage_path):
+    """Test that rewriting a paper removes its copy in the old location."""
+    (temp_storage_path / "2401.12345.md").write_text("# Old", encoding="utf-8")
+    store = PaperStore(temp_storage_path, layout="yymm")
+
+    store.path("2401.12345").write_text("# New", encoding="utf-8")
+    store.finalize("2401.12345")
+
+    assert not (temp_storage_path / "2401.12345.md").exists()
+    assert store.read_text("2401.12345") == "# New"
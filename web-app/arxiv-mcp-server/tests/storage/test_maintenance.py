@@ -0,0 +1,109 @@
+"""Tests for storage quota enforcement and garbage collection."""
+
+import json
+import os
+import time
+import pytest
+from arxiv_mcp_server.storage import store as store_module
+from arxiv_mcp_server.storage.maintenance import (
+    classify,
+    collect_garbage,
+    enforce_quota,
+)
+from arxiv_mcp_server.storage.store import PaperStore
+from arxiv_mcp_server.tools import handle_storage_stats
+
+
+def _write(store, name, size=1000, age=0):
+    path = store.root / name
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_classify():
+    """Test that stored files are attributed to their paper and kind."""
+    assert classify("2103.12345v2.md") == ("markdown", "2103.12345v2")
+    assert classify("2103.12345.md.zst") == ("markdown", "2103.12345")
+    assert classify("2103.12345.references.md.gz") == ("references", "2103.12345")
+    assert classify("2103.12345.meta.json") == ("metadata", "2103.12345")
+    assert classify("2103.12345.pdf.part") == ("partial", "2103.12345")
+    assert classify("2103.12345.pdf.part.json") == ("partial", "2103.12345")
+    assert classify(".2103.12345.meta.json.abc.tmp")[0] == "partial"
+    assert classify("notes.txt") == ("other", None)
+
+
+def test_collect_garbage(temp_storage_path):
+    """Test that only stale leftovers of inactive papers are removed."""
+    store = PaperStore(temp_storage_path)
+    hour = 3600
+    _write(store, "1.md", age=2 * hour)
+    kept_pdf = _write(store, "1.pdf", age=2 * hour)  # converted, kept for upgrades
+    stale_part = _write(store, "2.pdf.part", age=2 * hour)
+    fresh_part = _write(store, "3.pdf.part", age=60)  # download in progress
+    orphan_pdf = _write(store, "4.pdf", age=2 * hour)  # conversion failed
+    orphan_meta = _write(store, "4.meta.json", size=10, age=2 * hour)
+    active_pdf = _write(store, "5.pdf", age=2 * hour)  # being converted
+
+    result = collect_garbage(store, active={"5"}, grace_period=hour)
+
+    assert result == {"files": 3, "bytes": 2010}
+    assert not stale_part.exists()
+    assert not orphan_pdf.exists() and not orphan_meta.exists()
+    assert kept_pdf.exists() and fresh_part.exists() and active_pdf.exists()
+
+
+def test_enforce_quota_evicts_pdfs_before_papers(temp_storage_path):
+    """Test that PDFs go first, then the least recently read papers."""
+    store = PaperStore(temp_storage_path)
+    for number, age in (("1", 300), ("2", 200), ("3", 100)):
+        _write(store, f"{number}.md", age=age)
+        _write(store, f"{number}.meta.json", size=10, age=age)
+        _write(store, f"{number}.pdf", age=age)
+
+    # Evicting every PDF is enough
+    evicted = enforce_quota(store, quota_bytes=4000)
+    assert sorted(file.path.name for file in evicted) == ["1.pdf", "2.pdf", "3.pdf"]
+    assert store.paper_ids() == ["1", "2", "3"]
+
+    # Paper 1 was read recently, so paper 2 is now the coldest
+    store.touch("1")
+    evicted = enforce_quota(store, quota_bytes=2500)
+    assert {file.paper_id for file in evicted} == {"2"}
+    assert store.paper_ids() == ["1", "3"]
+    assert not (temp_storage_path / "2.meta.json").exists()
+
+
+def test_enforce_quota_spares_active_papers(temp_storage_path):
+    """Test that papers being worked on are never evicted."""
+    store = PaperStore(temp_storage_path)
+    _write(store, "1.md", age=300)
+    _write(store, "1.pdf", age=300)
+    _write(store, "2.md", age=100)
+
+    evicted = enforce_quota(store, quota_bytes=1000, active={"1"})
+
+    assert [file.path.name for file in evicted] == ["2.md"]
+    assert store.paper_ids() == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_storage_stats_tool(temp_storage_path, mocker):
+    """Test that the storage_stats tool reports usage by kind."""
+    store = PaperStore(temp_storage_path)
+    mocker.patch.object(store_module, "_default_store", store)
+    _write(store, "1.md", size=300)
+    _write(store, "1.pdf", size=700)
+    _write(store, "2.pdf.part", size=50, age=7200)
+
+    response = json.loads((await handle_storage_stats({}))[0].text)
+    assert response["papers"] == 1
+    assert response["total_bytes"] == 1050
+    assert response["by_kind"]["pdf"] == {"files": 1, "bytes": 700}
+
+    response = json.loads(
+        (await handle_storage_stats({"collect_garbage": True}))[0].text
+    )
+    assert response["maintenance"]["collected"]["files"] == 1
+    assert response["total_bytes"] == 1000
@@ -0,0 +1,112 @@
+"""Tests for sharing converted papers between peer servers."""
+
+import asyncio
+import httpx
+import pytest
+from arxiv_mcp_server.identity import PaperId
+from arxiv_mcp_server.storage import METADATA_SUFFIX
+from arxiv_mcp_server.storage.peers import HashRing, PeerBackend, start_peer_server
+from arxiv_mcp_server.storage.store import PaperStore
+
+
+def test_ring_moves_few_papers_when_a_server_joins():
+    """Adding a server only moves the papers it becomes the home of."""
+    papers = [f"2103.{i:05d}" for i in range(2000)]
+    three = HashRing(["http://a", "http://b", "http://c"])
+    four = HashRing(["http://a", "http://b", "http://c", "http://d"])
+
+    moved = [p for p in papers if three.nodes_for(p) != four.nodes_for(p)]
+    assert all(four.nodes_for(p) == ["http://d"] for p in moved)
+    assert 0.1 < len(moved) / len(papers) < 0.4
+    assert three.nodes_for(papers[0], 5) == three.nodes_for(papers[0], 3)
+    assert len(set(three.nodes_for(papers[0], 3))) == 3
+
+
+def _store(root) -> PaperStore:
+    store = PaperStore(root, None, "yymm")
+    store.load_index()
+    return store
+
+
+@pytest.fixture
+async def fleet(tmp_path):
+    """Two servers answering peers, with a shared token."""
+    stores, runners = [], []
+    for name in ("a", "b"):
+        store = _store(tmp_path / name)
+        runner = await start_peer_server(store, "127.0.0.1", 0, "secret")
+        stores.append(store)
+        runners.append(runner)
+    urls = [f"http://127.0.0.1:{runner.addresses[0][1]}" for runner in runners]
+    yield stores, urls
+    for runner in runners:
+        await runner.cleanup()
+
+
+async def test_converted_paper_reaches_other_servers(fleet, stored_paper, tmp_path):
+    """A paper is pushed to its home and fetched from there by others."""
+    (home_store, other_store), urls = fleet
+    ring = HashRing(urls)
+    paper_id = next(
+        f"2103.{i:05d}v1"
+        for i in range(100)
+        if ring.nodes_for(f"2103.{i:05d}") == [urls[0]]
+    )
+
+    other_store.backend = PeerBackend(urls, own_url=urls[1], token="secret")
+    stored_paper(paper_id, store=other_store, tier="fast")
+    assert await asyncio.to_thread(other_store.publish, paper_id)
+    assert home_store.read_text(paper_id) == "# Paper"
+
+    newcomer = _store(tmp_path / "c")
+    newcomer.backend = PeerBackend(urls, own_url="", token="secret")
+    requested = PaperId.parse(paper_id).at_version(None)
+    assert await asyncio.to_thread(newcomer.resolve, requested) == paper_id
+    assert newcomer.read_text(paper_id) == "# Paper"
+    assert newcomer.path(paper_id, METADATA_SUFFIX).exists()
+
+
+async def test_peers_require_the_token(fleet, stored_paper, tmp_path):
+    """Servers without the shared token get nothing."""
+    (home_store, _), urls = fleet
+    stored_paper("2103.12345v1", store=home_store, tier="fast")
+
+    stranger = _store(tmp_path / "c")
+    stranger.backend = PeerBackend(urls, fanout=2, token="wrong")
+    assert (
+        await asyncio.to_thread(stranger.resolve, PaperId.parse("2103.12345v1")) is None
+    )
+
+    stranger.backend = PeerBackend(urls, fanout=2, token="secret")
+    assert await asyncio.to_thread(stranger.resolve, PaperId.parse("2103.12345v1"))
+
+
+async def test_unauthenticated_writes_are_rejected(fleet, tmp_path):
+    """Papers cannot be pushed without the token, nor served without one."""
+    (home_store, _), urls = fleet
+    url = f"{urls[0]}/papers/2103.12345v1.md"
+
+    async with httpx.AsyncClient() as client:
+        response = await client.put(url, content=b"# Forged")
+        assert response.status_code == 401
+        response = await client.put(
+            url, content=b"# Forged", headers={"Authorization": "Bearer"}
+        )
+        assert response.status_code == 401
+    assert not home_store.path("2103.12345v1").exists()
+
+    with pytest.raises(ValueError, match="PEER_TOKEN"):
+        await start_peer_server(_store(tmp_path / "c"), "127.0.0.1", 0, "")
+
+
+async def test_peers_only_serve_shared_files(fleet, stored_paper):
+    """PDFs and names outside the store are not served."""
+    (home_store, _), urls = fleet
+    stored_paper("2103.12345v1", store=home_store, tier="fast")
+    home_store.path("2103.12345v1", ".pdf").write_bytes(b"%PDF")
+    home_store.refresh("2103.12345v1", ".pdf")
+
+    backend = PeerBackend(urls, fanout=2, token="secret")
+    assert await asyncio.to_thread(backend.get, "2103.12345v1.md") == b"# Paper"
+    assert await asyncio.to_thread(backend.get, "2103.12345v1.pdf") is None
+    assert await asyncio.to_thread(backend.get, "..md") is None
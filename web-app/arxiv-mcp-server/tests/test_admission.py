@@ -0,0 +1,198 @@
+"""Tests for admission control of tool calls."""
+
+import asyncio
+import json
+import pytest
+from arxiv_mcp_server import server as server_module
+from arxiv_mcp_server.admission import (
+    URGENT,
+    AdmissionControl,
+    Busy,
+    QuotaExceeded,
+    current_priority,
+)
+
+
+async def _hold(admission: AdmissionControl, tool: str, release: asyncio.Event):
+    async with admission.slot(tool):
+        await release.wait()
+
+
+async def test_calls_beyond_the_limit_wait_then_are_shed():
+    """Calls wait for a slot while the queue has room, and fail fast after."""
+    admission = AdmissionControl(concurrency=2, queue_size=1)
+    release = asyncio.Event()
+    calls = [asyncio.create_task(_hold(admission, "search", release)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    limiter = admission.limiter("search")
+    assert (limiter.active, limiter.waiting) == (2, 1)
+    with pytest.raises(Busy) as busy:
+        async with admission.slot("search"):
+            pass
+    assert busy.value.retry_after >= 1
+
+    # Other tools have their own slots
+    async with admission.slot("read"):
+        pass
+
+    release.set()
+    await asyncio.gather(*calls)
+    assert limiter.stats()["admitted"] == 3
+    assert limiter.stats()["rejected"] == 1
+    assert (limiter.active, limiter.waiting) == (0, 0)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    """A call cancelled while waiting frees its place in the queue."""
+    admission = AdmissionControl(concurrency=1, queue_size=1)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(admission, "search", release))
+    waiting = asyncio.create_task(_hold(admission, "search", release))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert admission.limiter("search").waiting == 0
+
+    release.set()
+    await running
+    assert admission.limiter("search").active == 0
+
+
+async def test_unlimited_tools_are_always_admitted():
+    """A limit of 0 turns admission control off for a tool."""
+    admission = AdmissionControl(concurrency=1, queue_size=0, limits={"read": 0})
+    release = asyncio.Event()
+    calls = [asyncio.create_task(_hold(admission, "read", release)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert admission.limiter("read") is None
+    release.set()
+    await asyncio.gather(*calls)
+
+
+async def test_busy_tool_answers_with_retry_after(mocker):
+    """call_tool reports a shed call as a structured busy error."""
+    admission = AdmissionControl(concurrency=1, queue_size=0)
+    mocker.patch.object(server_module, "admission", admission)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(admission, "list_papers", release))
+    await asyncio.sleep(0)
+
+    response = await server_module.call_tool("list_papers", {})
+
+    status = json.loads(response[0].text)
+    assert status["status"] == "busy"
+    assert status["retry_after"] >= 1
+    release.set()
+    await running
+
+
+async def _call(admission, tool, client, order, release):
+    async with admission.slot(tool, client):
+        order.append(client)
+        await release.wait()
+
+
+async def _serve_in_turn(admission, tool, clients):
+    """Queue calls behind a running one and record the order they run in."""
+    order, release = [], asyncio.Event()
+    blocker = asyncio.create_task(_call(admission, tool, "blocker", [], release))
+    await asyncio.sleep(0)
+    calls = []
+    for client in clients:
+        calls.append(
+            asyncio.create_task(_call(admission, tool, client, order, release))
+        )
+        await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(blocker, *calls, return_exceptions=True)
+    return order, results[1:]
+
+
+async def test_clients_get_fair_turns():
+    """A client queueing many calls does not hold up another client."""
+    admission = AdmissionControl(concurrency=1, queue_size=10)
+    order, _ = await _serve_in_turn(admission, "download", ["a"] * 4 + ["b"])
+    assert order.index("b") == 1
+
+
+async def test_weights_give_larger_shares():
+    """A client with twice the weight is served twice as often."""
+    admission = AdmissionControl(concurrency=1, queue_size=10, weights={"a": 2})
+    order, _ = await _serve_in_turn(admission, "download", ["a"] * 4 + ["b"] * 4)
+    assert order[:3].count("a") == 2
+
+
+async def test_full_queue_pushes_out_the_greedy_client():
+    """A newcomer to a full queue takes the place of the greediest client."""
+    admission = AdmissionControl(concurrency=1, queue_size=3)
+    order, results = await _serve_in_turn(admission, "download", ["a"] * 3 + ["b"])
+    assert isinstance(results[2], Busy)
+    assert order == ["a", "b", "a"]
+
+    usage = admission.client_stats()
+    assert usage["a"]["download"]["rejected"] == 1
+    assert usage["b"]["download"]["admitted"] == 1
+
+
+async def test_urgent_work_goes_first():
+    """Work queued at a higher priority is served before earlier work."""
+
+    async def urgent_call(*args):
+        current_priority.set(URGENT)
+        await _call(*args)
+
+    admission = AdmissionControl(concurrency=1, queue_size=10)
+    order, release = [], asyncio.Event()
+    blocker = asyncio.create_task(_call(admission, "download", "a", [], release))
+    await asyncio.sleep(0)
+    calls = [
+        asyncio.create_task(_call(admission, "download", "a", order, release)),
+        asyncio.create_task(_call(admission, "download", "b", order, release)),
+        asyncio.create_task(urgent_call(admission, "download", "c", order, release)),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(blocker, *calls)
+    assert order == ["c", "a", "b"]
+
+
+async def test_quota_limits_calls_per_window():
+    """Calls beyond a client's quota are turned away until the window ends."""
+    admission = AdmissionControl(concurrency=1, queue_size=1, quotas={"search": 2})
+    for _ in range(2):
+        async with admission.slot("search", "a"):
+            pass
+    with pytest.raises(QuotaExceeded) as exceeded:
+        async with admission.slot("search", "a"):
+            pass
+    assert 0 < exceeded.value.retry_after <= 3600
+    async with admission.slot("search", "b"):
+        pass
+    assert admission.client_stats()["a"]["search"]["quota_used"] == 2
+
+
+async def test_calls_not_admitted_do_not_use_quota():
+    """Calls turned away or cancelled while waiting are not charged."""
+    admission = AdmissionControl(concurrency=1, queue_size=1, quotas={"search": 2})
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(admission, "search", release))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(_hold(admission, "search", release))
+    await asyncio.sleep(0)
+
+    # The queue is full; retrying does not use up the quota
+    for _ in range(3):
+        with pytest.raises(Busy):
+            async with admission.slot("search"):
+                pass
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    release.set()
+    await running
+
+    assert admission.client_stats()["local"]["search"]["quota_used"] == 1
+    async with admission.slot("search"):
+        pass
@@ -3,7 +3,7 @@
 import os
 import sys
 from pathlib import Path
-from arxiv_mcp_server.config import Settings
+from arxiv_mcp_server.config import Settings, get_settings
 from unittest.mock import patch
 
 
@@ -96,6 +96,19 @@ def test_storage_path_creates_missing_directory():
             assert Path(storage_path).samefile(test_path)
 
 
+def test_settings_are_shared_and_resolved_once(tmp_path):
+    """Test that modules share one settings object, and paths are cached."""
+    assert get_settings() is get_settings()
+
+    with patch.object(sys, "argv", ["program", "--storage-path", str(tmp_path)]):
+        settings = Settings()
+        storage_path = settings.STORAGE_PATH
+    with patch.object(Path, "mkdir") as mkdir:
+        # Neither the arguments nor the file system are looked at again
+        assert settings.STORAGE_PATH == storage_path == tmp_path.resolve()
+    mkdir.assert_not_called()
+
+
 def test_path_normalization_with_windows_paths():
     """Test Windows-specific path handling using string operations only."""
     # Windows-style paths - we'll test the normalization and joining logic
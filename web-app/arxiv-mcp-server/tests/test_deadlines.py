@@ -0,0 +1,61 @@
+"""Tests for the deadlines of tool calls."""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from arxiv_mcp_server import server as server_module
+from arxiv_mcp_server.deadlines import (
+    CallAbandoned,
+    ToolTimeout,
+    check_deadline,
+    deadline,
+    remaining,
+)
+
+
+async def test_slow_tool_times_out(mocker):
+    """A call past its tool's deadline is answered with a timeout status."""
+
+    async def stuck(arguments):
+        await asyncio.sleep(60)
+
+    mocker.patch.dict(server_module.TOOL_HANDLERS, {"list_papers": stuck})
+    mocker.patch.object(server_module.settings, "TOOL_TIMEOUTS", {"list_papers": 0.05})
+
+    started = time.monotonic()
+    response = await server_module.call_tool("list_papers", {})
+
+    assert time.monotonic() - started < 5
+    status = json.loads(response[0].text)
+    assert status["status"] == "timeout"
+    assert status["timeout"] == 0.05
+
+
+async def test_threads_stop_when_the_call_is_given_up():
+    """Blocking work for a timed-out call stops at its next check."""
+    stopped = threading.Event()
+
+    def work():
+        try:
+            while True:
+                time.sleep(0.01)
+                check_deadline()
+        except CallAbandoned:
+            stopped.set()
+
+    with pytest.raises(ToolTimeout):
+        async with deadline("search_papers", 0.05):
+            await asyncio.to_thread(work)
+
+    assert await asyncio.to_thread(stopped.wait, 5)
+
+
+async def test_requests_are_bounded_by_the_deadline():
+    """Blocking requests get no more time than the call has left."""
+    assert remaining(60) == 60
+    async with deadline("search_papers", 5):
+        assert await asyncio.to_thread(remaining, 60) <= 6
+    async with deadline("search_papers", 0):
+        assert remaining(60) == 60
@@ -0,0 +1,128 @@
+"""Tests for streaming, resumable PDF downloads."""
+
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from arxiv_mcp_server import downloads
+from arxiv_mcp_server.downloads import (
+    DownloadError,
+    PaperNotFoundError,
+    download_pdf,
+)
+
+PDF = b"%PDF-1.4\n" + b"x" * 200_000 + b"\n%%EOF\n"
+
+
+class FakeArxiv:
+    """Serve a PDF with Range support, optionally breaking off transfers."""
+
+    def __init__(self, body=PDF, interruptions=0):
+        self.body = body
+        self.interruptions = interruptions
+        self.ranges = []
+
+    async def handle(self, request):
+        if request.match_info["paper_id"] == "missing":
+            raise web.HTTPNotFound()
+        start = 0
+        if "Range" in request.headers:
+            start = int(request.headers["Range"].split("=")[1].rstrip("-"))
+        self.ranges.append(start)
+
+        response = web.StreamResponse(status=206 if start else 200)
+        response.headers["ETag"] = '"v1"'
+        response.content_length = len(self.body) - start
+        if start:
+            response.headers["Content-Range"] = (
+                f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"
+            )
+        await response.prepare(request)
+
+        chunk = self.body[start:]
+        if self.interruptions:
+            self.interruptions -= 1
+            await response.write(chunk[: len(chunk) // 2])
+            # Give the client time to read what was sent before the drop
+            await asyncio.sleep(0.2)
+            request.transport.close()
+            return response
+        await response.write(chunk)
+        return response
+
+
+@pytest.fixture
+async def fake_arxiv():
+    """Start a local server standing in for arxiv.org."""
+
+    async def start(**kwargs):
+        fake = FakeArxiv(**kwargs)
+        app = web.Application()
+        app.router.add_get("/pdf/{paper_id}", fake.handle)
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        return fake, str(server.make_url("/pdf/")) + "{paper_id}"
+
+    servers = []
+    yield start
+    for server in servers:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_after_interruption(
+    fake_arxiv, temp_storage_path, mocker
+):
+    """Test that a broken-off transfer is resumed with a Range request."""
+    mocker.patch.object(downloads, "RETRY_BACKOFF", 0)
+    fake, url = await fake_arxiv(interruptions=2)
+    dest = temp_storage_path / "2103.12345.pdf"
+
+    size = await download_pdf("2103.12345", dest, url=url.format(paper_id="2103.12345"))
+
+    assert size == len(PDF)
+    assert dest.read_bytes() == PDF
+    assert fake.ranges[0] == 0 and fake.ranges[1] > 0
+    assert len(fake.ranges) == 3
+    assert list(temp_storage_path.iterdir()) == [dest]
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_across_calls(fake_arxiv, temp_storage_path, mocker):
+    """Test that a later call picks up a partial file left by an earlier one."""
+    mocker.patch.object(downloads, "RETRY_BACKOFF", 0)
+    fake, url = await fake_arxiv(interruptions=1)
+    url = url.format(paper_id="2103.12345")
+    dest = temp_storage_path / "2103.12345.pdf"
+
+    with pytest.raises(DownloadError):
+        await download_pdf("2103.12345", dest, url=url, retries=0)
+    assert not dest.exists()
+
+    await download_pdf("2103.12345", dest, url=url, retries=0)
+    assert dest.read_bytes() == PDF
+    assert fake.ranges[1] > 0
+
+
+@pytest.mark.asyncio
+async def test_download_rejects_non_pdf(fake_arxiv, temp_storage_path):
+    """Test that a response that is not a complete PDF is never published."""
+    _, url = await fake_arxiv(body=b"<html>PDF is being generated</html>")
+    dest = temp_storage_path / "2103.12345.pdf"
+
+    with pytest.raises(DownloadError, match="not a complete PDF"):
+        await download_pdf("2103.12345", dest, url=url.format(paper_id="2103.12345"))
+    assert list(temp_storage_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_download_missing_paper(fake_arxiv, temp_storage_path):
+    """Test that a 404 is reported as a missing paper."""
+    _, url = await fake_arxiv()
+    with pytest.raises(PaperNotFoundError):
+        await download_pdf(
+            "missing",
+            temp_storage_path / "missing.pdf",
+            url=url.format(paper_id="missing"),
+        )
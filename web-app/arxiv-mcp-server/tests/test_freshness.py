@@ -0,0 +1,150 @@
+"""Tests for the background check for new paper versions."""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import arxiv
+import pytest
+from arxiv_mcp_server import catalog, freshness
+from arxiv_mcp_server.identity import PaperId
+from arxiv_mcp_server.storage import METADATA_SUFFIX, read_metadata
+from arxiv_mcp_server.tools import handle_read_paper
+
+UPDATED = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _catalog(monkeypatch, *entry_ids):
+    """Serve catalog entries for the given versions, recording the queries."""
+    queries = []
+
+    def fetch_results(paper_ids, batch_size=None):
+        queries.append(list(paper_ids))
+        return [
+            SimpleNamespace(
+                entry_id=f"http://arxiv.org/abs/{entry_id}", updated=UPDATED
+            )
+            for entry_id in entry_ids
+        ]
+
+    monkeypatch.setattr(catalog, "fetch_results", fetch_results)
+    return queries
+
+
+@pytest.mark.asyncio
+async def test_newer_versions_are_marked(paper_store, stored_paper, monkeypatch):
+    """Outdated papers are found in one query and reported when read."""
+    stored_paper("2103.12345v1", tier="fast")
+    stored_paper("2104.00001v1")
+    stored_paper("2104.00001v2")
+    queries = _catalog(monkeypatch, "2103.12345v3", "2104.00001v2")
+
+    outdated = freshness.check_freshness(paper_store)
+
+    assert outdated == [("2103.12345v1", PaperId.parse("2103.12345v3"))]
+    assert sorted(queries[0]) == ["2103.12345", "2104.00001"]
+    metadata = read_metadata(paper_store.path("2103.12345v1", METADATA_SUFFIX))
+    assert metadata["newer_version"] == "2103.12345v3"
+    assert metadata["arxiv_updated"] == UPDATED.isoformat()
+    current = read_metadata(paper_store.path("2104.00001v2", METADATA_SUFFIX))
+    assert current["latest_version"] == "2104.00001v2"
+    assert current["newer_version"] is None
+
+    response = json.loads((await handle_read_paper({"paper_id": "2103.12345"}))[0].text)
+    assert response["newer_version"] == "2103.12345v3"
+
+
+def test_unversioned_papers_compared_by_date(paper_store, stored_paper, monkeypatch):
+    """Papers stored without version are outdated if converted before the update."""
+    converted = UPDATED - timedelta(days=1)
+    stored_paper("2105.00002", converted_at=converted.isoformat())
+    stored_paper("2105.00003", converted_at=UPDATED.isoformat())
+    _catalog(monkeypatch, "2105.00002v2", "2105.00003v2")
+
+    outdated = freshness.check_freshness(paper_store)
+
+    assert [key for key, _ in outdated] == ["2105.00002"]
+
+
+def test_only_stale_papers_are_checked(paper_store, stored_paper, monkeypatch):
+    """Papers checked or converted within the interval are left out."""
+    now = datetime.now(timezone.utc)
+    stored_paper("2106.00001v1", checked_at=now.isoformat())
+    stored_paper("2106.00002v1", checked_at=(now - timedelta(days=2)).isoformat())
+    stored_paper("2106.00003v1", converted_at=(now - timedelta(hours=1)).isoformat())
+    stored_paper("2106.00004v1")
+    queries = _catalog(monkeypatch, "2106.00002v1")
+
+    assert freshness.next_check_delay(paper_store, 86400) == 0
+    freshness.check_freshness(paper_store, max_age=86400)
+
+    assert sorted(queries[0]) == ["2106.00002", "2106.00004"]
+    # Papers the catalog does not know are not checked again right away
+    unknown = read_metadata(paper_store.path("2106.00004v1", METADATA_SUFFIX))
+    assert unknown["checked_at"]
+    # Next due is the paper converted an hour ago
+    delay = freshness.next_check_delay(paper_store, 86400)
+    assert 82700 < delay <= 82800
+
+
+@pytest.mark.asyncio
+async def test_due_papers_are_checked_at_startup(
+    paper_store, stored_paper, monkeypatch
+):
+    """The loop checks at once when the last check is older than the interval."""
+    stored_paper("2106.00005v1")
+    checked = asyncio.Event()
+
+    def check(store, batch_size, now, max_age):
+        checked.set()
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(freshness, "check_freshness", check)
+    loop = asyncio.create_task(freshness.freshness_loop(paper_store, 86400))
+    try:
+        await asyncio.wait_for(checked.wait(), 5)
+    finally:
+        loop.cancel()
+
+
+@pytest.mark.asyncio
+async def test_refresh_waits_for_idle_server(paper_store, stored_paper, monkeypatch):
+    """Newer versions are downloaded at the stored tier once nothing else runs."""
+    stored_paper("2103.12345v1", tier="fast")
+    busy = iter([{"2401.00001"}, set()])
+    monkeypatch.setattr(freshness, "active_paper_ids", lambda: next(busy, set()))
+    monkeypatch.setattr(freshness, "IDLE_POLL_INTERVAL", 0)
+    download = AsyncMock()
+    monkeypatch.setattr(freshness, "handle_download", download)
+
+    await freshness.refresh_outdated(
+        paper_store, [("2103.12345v1", PaperId.parse("2103.12345v2"))]
+    )
+
+    download.assert_awaited_once_with({"paper_id": "2103.12345v2", "tier": "fast"})
+    assert next(busy, None) is None
+
+
+def test_catalog_queries_are_batched_and_rate_limited(monkeypatch):
+    """Each batch of IDs is one query, and each query waits for the limiter."""
+    client = MagicMock()
+    client.results.return_value = []
+    monkeypatch.setattr(arxiv, "Client", lambda **kwargs: client)
+    wait = MagicMock()
+    monkeypatch.setattr(catalog.api_limiter, "wait", wait)
+
+    catalog.fetch_results([f"2401.0000{i}" for i in range(5)], batch_size=2)
+
+    assert client.results.call_count == 3
+    assert wait.call_count == 3
+
+
+def test_rate_limiter_spaces_calls():
+    """Calls are spaced at least the interval apart."""
+    limiter = catalog.RateLimiter(0.05)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.1
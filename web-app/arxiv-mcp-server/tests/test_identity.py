@@ -0,0 +1,42 @@
+"""Tests for canonical paper identity."""
+
+import pytest
+from arxiv_mcp_server.identity import PaperId, base_key, version_of
+
+
+@pytest.mark.parametrize(
+    "text, base, version",
+    [
+        ("2103.12345", "2103.12345", None),
+        ("2103.12345v2", "2103.12345", 2),
+        ("arXiv:2103.12345v2", "2103.12345", 2),
+        ("https://arxiv.org/abs/2103.12345", "2103.12345", None),
+        ("http://arxiv.org/pdf/2103.12345v3.pdf", "2103.12345", 3),
+        ("0704.0001", "0704.0001", None),
+        ("hep-th/9901001v1", "hep-th/9901001", 1),
+        ("math.GT/0309136", "math.GT/0309136", None),
+    ],
+)
+def test_parse(text, base, version):
+    """Test that the usual ways of naming a paper parse to the same identity."""
+    paper_id = PaperId.parse(text)
+    assert (paper_id.base, paper_id.version, paper_id.known) == (base, version, True)
+
+
+def test_keys_are_file_names():
+    """Test that storage keys contain no slash and map back to the paper."""
+    paper_id = PaperId.parse("hep-th/9901001v2")
+    assert paper_id.key == "hep-th_9901001v2"
+    assert paper_id.base_key == "hep-th_9901001"
+    assert PaperId.from_key(paper_id.key) == paper_id
+    assert base_key(paper_id.key) == paper_id.base_key
+    assert version_of(paper_id.key) == 2
+    assert version_of("2103.12345") is None
+
+
+def test_unknown_ids_are_kept():
+    """Test that strings that are not arXiv IDs are passed through."""
+    paper_id = PaperId.parse("invalid.12345")
+    assert not paper_id.known
+    assert paper_id.canonical == "invalid.12345"
+    assert PaperId.parse("a/b").key == "a_b"
@@ -0,0 +1,104 @@
+"""Tests for persistent, shared job state and restart recovery."""
+
+from datetime import datetime, timedelta
+import pytest
+from arxiv_mcp_server.jobs import ConversionStatus, JobTable
+from arxiv_mcp_server.tools import download as download_module
+
+
+def _status(paper_id, status="downloading", **fields):
+    # Recorded by an earlier run of the server, i.e. another process
+    return ConversionStatus(
+        paper_id=paper_id,
+        status=status,
+        started_at=datetime.now(),
+        owner="host:1",
+        **fields,
+    )
+
+
+def test_jobs_survive_restart(tmp_path):
+    """Statuses are reloaded, and active ones reported as interrupted."""
+    jobs = JobTable()
+    jobs.open(tmp_path / "jobs.sqlite3")
+    jobs["2103.00001v1"] = _status("2103.00001v1", tier="fast")
+    jobs["2103.00002v1"] = _status("2103.00002v1")
+    jobs.update_status("2103.00002v1", status="success")
+    assert list(jobs) == ["2103.00001v1", "2103.00002v1"]
+    jobs.close()
+
+    reopened = JobTable()
+    interrupted = reopened.open(tmp_path / "jobs.sqlite3")
+
+    assert [status.paper_id for status in interrupted] == ["2103.00001v1"]
+    assert interrupted[0].tier == "fast"
+    assert reopened["2103.00002v1"].status == "success"
+    assert reopened["2103.00002v1"].completed_at is not None
+
+
+def test_finished_jobs_expire(tmp_path):
+    """Finished jobs are dropped after the TTL, in memory and on disk."""
+    jobs = JobTable(ttl=60)
+    jobs.open(tmp_path / "jobs.sqlite3")
+    old = _status("2103.00001v1", "success")
+    old.completed_at = datetime.now() - timedelta(seconds=120)
+    jobs["2103.00001v1"] = old
+    jobs["2103.00002v1"] = _status("2103.00002v1")
+    jobs.close()
+
+    reopened = JobTable(ttl=60)
+    reopened.open(tmp_path / "jobs.sqlite3")
+    assert "2103.00001v1" not in reopened
+    assert "2103.00002v1" in reopened
+
+
+@pytest.mark.asyncio
+async def test_recovery_resumes_interrupted_and_orphaned_work(
+    paper_store, tmp_path, mocker
+):
+    """Interrupted jobs and PDFs without markdown are converted after a restart."""
+    jobs = JobTable()
+    jobs.open(tmp_path / "jobs.sqlite3")
+    jobs["2103.00001v1"] = _status("2103.00001v1", "converting", tier="fast")
+    jobs.close()
+    for paper_id in ("2103.00001v1", "2103.00002v1"):
+        paper_store.path(paper_id, ".pdf").write_bytes(b"%PDF-1.4")
+        paper_store.refresh(paper_id, ".pdf")
+
+    restarted = JobTable()
+    mocker.patch.object(download_module, "conversion_statuses", restarted)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+
+    async def mock_convert(pdf_path, md_path, **kwargs):
+        md_path.write_text("# Recovered", encoding="utf-8")
+
+    worker = mocker.patch.object(
+        download_module, "convert_in_worker", side_effect=mock_convert
+    )
+
+    interrupted = restarted.open(tmp_path / "jobs.sqlite3")
+    plan = download_module.plan_recovery(interrupted)
+    # Spared by garbage collection until resumed
+    assert download_module.active_paper_ids() == {"2103.00001v1", "2103.00002v1"}
+
+    assert await download_module.recover(plan) == 2
+
+    download_pdf.assert_not_called()
+    assert worker.call_args_list[0].kwargs["tier"] == "fast"
+    assert paper_store.paper_ids() == ["2103.00001v1", "2103.00002v1"]
+    assert restarted["2103.00001v1"].status == "success"
+    assert download_module.active_paper_ids() == set()
+
+
+def test_jobs_are_shared_between_processes(tmp_path):
+    """A job of another process is found, but not listed as this process's own."""
+    ours, theirs = JobTable(), JobTable()
+    ours.open(tmp_path / "jobs.sqlite3")
+    theirs.open(tmp_path / "jobs.sqlite3")
+    theirs["2103.00001v1"] = _status("2103.00001v1", "converting")
+
+    assert ours["2103.00001v1"].status == "converting"
+    assert list(ours) == []
+    assert ours.active_ids() == ["2103.00001v1"]
+    assert ours.update_status("2103.00001v1", status="error") is None
@@ -0,0 +1,62 @@
+"""Tests for the per-paper locks shared between server processes."""
+
+import json
+import subprocess
+import sys
+import pytest
+from arxiv_mcp_server.locks import PaperLocks
+from arxiv_mcp_server.tools import download as download_module
+from arxiv_mcp_server.tools.download import handle_download, paper_locks
+
+HOLD_LOCK = """
+import sys
+from arxiv_mcp_server.locks import PaperLocks
+assert PaperLocks(sys.argv[1]).acquire("2103.12345v1")
+print("locked", flush=True)
+sys.stdin.read()
+"""
+
+
+def test_lock_is_exclusive(tmp_path):
+    """A held lock cannot be taken again until it is released."""
+    ours, theirs = PaperLocks(tmp_path), PaperLocks(tmp_path)
+    assert ours.acquire("2103.12345v1")
+    assert not ours.acquire("2103.12345v1")
+    assert not theirs.acquire("2103.12345v1")
+    assert theirs.locked("2103.12345v1")
+
+    ours.release("2103.12345v1")
+    assert not theirs.locked("2103.12345v1")
+    assert theirs.acquire("2103.12345v1")
+
+
+def test_lock_held_by_another_process(tmp_path):
+    """A lock held by another process is seen, and freed when it exits."""
+    holder = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK, str(tmp_path)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        locks = PaperLocks(tmp_path)
+        assert locks.locked("2103.12345v1")
+        assert not locks.acquire("2103.12345v1")
+    finally:
+        holder.communicate("")
+    assert locks.acquire("2103.12345v1")
+
+
+@pytest.mark.asyncio
+async def test_paper_locked_elsewhere_is_not_downloaded(mocker, tmp_path):
+    """A paper another server is working on is left to that server."""
+    other_server = PaperLocks(paper_locks().root)
+    assert other_server.acquire("2103.12345v1")
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+
+    response = await handle_download({"paper_id": "2103.12345v1"})
+
+    assert json.loads(response[0].text)["message"] == "Paper is already being processed"
+    download_pdf.assert_not_called()
+    other_server.release("2103.12345v1")
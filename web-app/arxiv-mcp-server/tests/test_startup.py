@@ -0,0 +1,28 @@
+"""Tests for the startup cost of the server."""
+
+import subprocess
+import sys
+
+# Loaded on first use only: the PDF converters, the arXiv API client and
+# the HTTP client for downloads
+HEAVY_MODULES = ("pymupdf", "pymupdf4llm", "fitz", "arxiv", "aiohttp", "requests")
+
+
+def _loaded_after(statement: str) -> set:
+    """Run a statement in a fresh interpreter; get the heavy modules it loaded."""
+    check = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split()) & set(HEAVY_MODULES)
+
+
+def test_server_starts_without_heavy_dependencies():
+    """Test that importing the server loads no converter or API client."""
+    assert _loaded_after("import arxiv_mcp_server.server") == set()
+
+
+def test_worker_starts_without_the_server():
+    """Test that conversion workers do not import the MCP server."""
+    check = "import arxiv_mcp_server.worker; assert 'mcp' not in sys.modules"
+    assert _loaded_after(check) == set()
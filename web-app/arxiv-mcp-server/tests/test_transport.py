@@ -0,0 +1,101 @@
+"""Tests for serving clients over the network."""
+
+import asyncio
+import json
+import socket
+import pytest
+import uvicorn
+from mcp import ClientSession, types
+from mcp.client.sse import sse_client
+from arxiv_mcp_server.server import resource_notifier, sse_app
+from arxiv_mcp_server.tools import download as download_module
+
+
+@pytest.fixture
+async def sse_url():
+    """Serve the SSE application on a free local port."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(sse_app(), host="127.0.0.1", port=port, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/sse"
+    server.should_exit = True
+    await task
+
+
+async def test_clients_share_one_server(sse_url):
+    """Several clients hold sessions with the same server at once."""
+
+    async def list_tools():
+        async with sse_client(sse_url) as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                return [tool.name for tool in (await session.list_tools()).tools]
+
+    first, second = await asyncio.gather(list_tools(), list_tools())
+    assert "download_paper" in first
+    assert first == second
+
+
+async def test_download_progress_reaches_the_client(sse_url, mocker):
+    """A waiting download sends progress notifications to its client."""
+
+    async def mock_convert(pdf_path, md_path, on_page=None, **kwargs):
+        on_page(1, 1)
+        md_path.write_text("# Test Paper", encoding="utf-8")
+
+    mocker.patch.object(download_module, "download_pdf", return_value=1024)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=mock_convert)
+    notifications = []
+
+    async def on_progress(progress, total, message):
+        notifications.append((progress, total, message))
+
+    async with sse_client(sse_url) as streams:
+        async with ClientSession(*streams) as session:
+            await session.initialize()
+            result = await session.call_tool(
+                "download_paper",
+                {"paper_id": "2103.22222", "wait": True},
+                progress_callback=on_progress,
+            )
+
+    assert json.loads(result.content[0].text)["status"] == "success"
+    assert (100, 100, "Paper is ready") in notifications
+    assert any(message == "Converting page 1 of 1" for _, _, message in notifications)
+    download_module.conversion_statuses.pop("2103.22222", None)
+
+
+async def test_clients_are_told_of_new_resources(sse_url, paper_store):
+    """A client that listed the resources hears when a paper is stored."""
+    resource_notifier.attach(paper_store, asyncio.get_running_loop())
+    changed = asyncio.Event()
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ResourceListChangedNotification
+        ):
+            changed.set()
+
+    async with sse_client(sse_url) as streams:
+        async with ClientSession(*streams, message_handler=on_message) as session:
+            await session.initialize()
+            assert (await session.list_resources()).resources == []
+            templates = (await session.list_resource_templates()).resourceTemplates
+            assert [t.uriTemplate for t in templates] == ["arxiv://{paper_id}"]
+
+            paper_store.path("2401.00001v1").write_text("# Paper", encoding="utf-8")
+            paper_store.refresh("2401.00001v1")
+            await asyncio.wait_for(changed.wait(), 5)
+
+            listed = await session.list_resources()
+            assert [str(r.uri) for r in listed.resources] == ["arxiv://2401.00001v1"]
+            read = await session.read_resource(listed.resources[0].uri)
+            assert read.contents[0].text == "# Paper"
+    paper_store.listeners.clear()
@@ -0,0 +1,107 @@
+"""Tests for the isolated conversion worker."""
+
+import asyncio
+import sys
+import time
+import pytest
+from arxiv_mcp_server import worker
+from arxiv_mcp_server.worker import (
+    ConversionError,
+    ConversionTimeoutError,
+    convert_in_worker,
+)
+
+
+def _python_command(code):
+    return lambda *args: [sys.executable, "-c", code]
+
+
+@pytest.mark.asyncio
+async def test_worker_timeout_kills_process(mocker, temp_storage_path):
+    """Test that a hanging conversion is killed once its timeout expires."""
+    mocker.patch.object(
+        worker, "_worker_command", _python_command("import time; time.sleep(60)")
+    )
+
+    started = time.monotonic()
+    with pytest.raises(ConversionTimeoutError):
+        await convert_in_worker(
+            temp_storage_path / "a.pdf", temp_storage_path / "a.md", timeout=0.5
+        )
+    assert time.monotonic() - started < 10
+
+
+@pytest.mark.asyncio
+async def test_worker_failure_reports_error(mocker, temp_storage_path):
+    """Test that a crashing worker surfaces its last error line."""
+    mocker.patch.object(
+        worker, "_worker_command", _python_command("raise RuntimeError('bad pdf')")
+    )
+
+    with pytest.raises(ConversionError, match="bad pdf"):
+        await convert_in_worker(
+            temp_storage_path / "a.pdf", temp_storage_path / "a.md", timeout=30
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == "win32", reason="RLIMIT_AS is POSIX only")
+async def test_worker_memory_ceiling(mocker, temp_storage_path):
+    """Test that a worker allocating past its memory ceiling fails cleanly."""
+    mocker.patch.object(
+        worker,
+        "_worker_command",
+        _python_command("x = bytearray(512 * 1024 * 1024)"),
+    )
+
+    with pytest.raises(ConversionError, match="MemoryError"):
+        await convert_in_worker(
+            temp_storage_path / "a.pdf",
+            temp_storage_path / "a.md",
+            timeout=30,
+            memory_limit_mb=256,
+        )
+
+
+@pytest.mark.asyncio
+async def test_worker_cancellation(mocker, temp_storage_path):
+    """Test that cancelling the awaiting task propagates to the worker."""
+    mocker.patch.object(
+        worker, "_worker_command", _python_command("import time; time.sleep(60)")
+    )
+
+    task = asyncio.create_task(
+        convert_in_worker(temp_storage_path / "a.pdf", temp_storage_path / "a.md")
+    )
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_postprocessing_stats(temp_storage_path):
+    """Test that a real conversion reports its size before and after cleanup."""
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    for number in range(1, 4):
+        page = doc.new_page()
+        page.insert_text((72, 40), "Preprint. Under review.", fontsize=8)
+        page.insert_text((72, 120), "Body text of the page.", fontsize=10)
+    pdf_path = temp_storage_path / "a.pdf"
+    doc.save(pdf_path)
+    md_path = temp_storage_path / "a.md"
+
+    pages = []
+    stats = await convert_in_worker(
+        pdf_path,
+        md_path,
+        tier="fast",
+        timeout=60,
+        on_page=lambda page, total: pages.append((page, total)),
+    )
+
+    assert pages == [(1, 3), (2, 3), (3, 3)]
+    assert stats["bytes"] == md_path.stat().st_size
+    assert stats["raw_bytes"] > stats["bytes"]
+    assert "Preprint" not in md_path.read_text(encoding="utf-8")
@@ -2,11 +2,17 @@
 
 import pytest
 import json
+import asyncio
 from datetime import datetime
+from arxiv_mcp_server.downloads import PaperNotFoundError
+from arxiv_mcp_server.storage import default_store
+from arxiv_mcp_server.tools import download as download_module
 from arxiv_mcp_server.tools.download import (
     handle_download,
     get_paper_path,
     conversion_statuses,
+    conversion_tasks,
+    ConversionStatus,
 )
 
 
@@ -14,22 +20,17 @@ from arxiv_mcp_server.tools.download import (
 async def test_download_paper_lifecycle(mocker, temp_storage_path):
     """Test the complete lifecycle of downloading and converting a paper."""
     paper_id = "2103.12345"
-    # Mock arxiv client and PDF download
-    mocker.patch("arxiv.Client.results")
-    mocker.patch("arxiv.Result.download_pdf")
+    # Mock the PDF download
+    mocker.patch.object(download_module, "download_pdf", return_value=1024)
 
-    # Mock PDF to markdown conversion to happen immediately
-    async def mock_convert(paper_id, pdf_path):
-        md_path = get_paper_path(paper_id, ".md")
+    # Mock the conversion worker to finish immediately
+    async def mock_convert(pdf_path, md_path, **kwargs):
         with open(md_path, "w", encoding="utf-8") as f:
             f.write("# Test Paper\nConverted content")
-        if paper_id in conversion_statuses:
-            status = conversion_statuses[paper_id]
-            status.status = "success"
-            status.completed_at = datetime.now()
-        pdf_path.unlink()  # Cleanup PDF
 
-    mocker.patch("asyncio.to_thread", side_effect=mock_convert)
+    mocker.patch(
+        "arxiv_mcp_server.tools.download.convert_in_worker", side_effect=mock_convert
+    )
 
     # Initial download request
     response = await handle_download({"paper_id": paper_id})
@@ -56,6 +57,8 @@ async def test_download_existing_paper(temp_storage_path):
     md_path.parent.mkdir(parents=True, exist_ok=True)
     with open(md_path, "w", encoding="utf-8") as f:
         f.write("# Existing Paper\nTest content")
+    # Written behind the store's back, so the index needs a refresh
+    default_store().refresh(paper_id)
 
     response = await handle_download({"paper_id": paper_id})
     status = json.loads(response[0].text)
@@ -65,13 +68,20 @@ async def test_download_existing_paper(temp_storage_path):
 @pytest.mark.asyncio
 async def test_download_nonexistent_paper(mocker):
     """Test downloading a paper that doesn't exist."""
-    mocker.patch("arxiv.Client.results", side_effect=StopIteration())
+    mocker.patch.object(
+        download_module,
+        "download_pdf",
+        side_effect=PaperNotFoundError("https://arxiv.org/pdf/invalid.12345"),
+    )
 
     response = await handle_download({"paper_id": "invalid.12345"})
     status = json.loads(response[0].text)
     assert status["status"] == "error"
     assert "not found on arXiv" in status["message"]
 
+    # The failed download does not block a later attempt
+    assert conversion_statuses.pop("invalid.12345").status == "error"
+
 
 @pytest.mark.asyncio
 async def test_check_unknown_status():
@@ -79,3 +89,357 @@ async def test_check_unknown_status():
     response = await handle_download({"paper_id": "2103.99999", "check_status": True})
     status = json.loads(response[0].text)
     assert status["status"] == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_cancel_conversion(mocker):
+    """Test cancelling an in-progress conversion through the tool API."""
+    paper_id = "2103.54321"
+    mocker.patch.object(download_module, "download_pdf", return_value=1024)
+
+    async def hanging_convert(pdf_path, md_path, **kwargs):
+        await asyncio.sleep(60)
+
+    mocker.patch(
+        "arxiv_mcp_server.tools.download.convert_in_worker",
+        side_effect=hanging_convert,
+    )
+
+    response = await handle_download({"paper_id": paper_id})
+    assert json.loads(response[0].text)["status"] == "converting"
+    task = conversion_tasks[paper_id]
+    await asyncio.sleep(0)
+
+    response = await handle_download({"paper_id": paper_id, "cancel": True})
+    assert json.loads(response[0].text)["status"] == "cancelled"
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    response = await handle_download({"paper_id": paper_id, "check_status": True})
+    status = json.loads(response[0].text)
+    assert status["status"] == "cancelled"
+    assert paper_id not in conversion_tasks
+    conversion_statuses.pop(paper_id, None)
+
+
+@pytest.mark.asyncio
+async def test_failed_conversion_records_error(mocker):
+    """Test that a failing worker leaves an error status instead of hanging."""
+    from arxiv_mcp_server.worker import ConversionTimeoutError
+
+    paper_id = "2103.54322"
+    mocker.patch(
+        "arxiv_mcp_server.tools.download.convert_in_worker",
+        side_effect=ConversionTimeoutError("Conversion timed out after 1 seconds"),
+    )
+    conversion_statuses[paper_id] = ConversionStatus(
+        paper_id=paper_id, status="converting", started_at=datetime.now()
+    )
+
+    from arxiv_mcp_server.tools.download import convert_pdf_to_markdown
+
+    await convert_pdf_to_markdown(paper_id, get_paper_path(paper_id, ".pdf"))
+
+    status = conversion_statuses.pop(paper_id)
+    assert status.status == "error"
+    assert "timed out" in status.error
+
+
+@pytest.mark.asyncio
+async def test_upgrade_fast_paper_to_full(mocker):
+    """Test that a fast conversion is upgraded from the local PDF on request."""
+    from arxiv_mcp_server.storage import METADATA_SUFFIX, update_metadata
+
+    paper_id = "2103.54323"
+    md_path = get_paper_path(paper_id, ".md")
+    pdf_path = get_paper_path(paper_id, ".pdf")
+    meta_path = get_paper_path(paper_id, METADATA_SUFFIX)
+    md_path.write_text("# Fast text", encoding="utf-8")
+    pdf_path.write_bytes(b"%PDF-1.4")
+    update_metadata(meta_path, tier="fast")
+    for suffix in (".md", ".pdf"):
+        default_store().refresh(paper_id, suffix)
+
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+    mocker.patch.object(download_module, "conversion_cache", None)
+
+    async def mock_convert(pdf_path, md_path, **kwargs):
+        md_path.write_text("# Full text", encoding="utf-8")
+
+    worker = mocker.patch.object(
+        download_module, "convert_in_worker", side_effect=mock_convert
+    )
+    try:
+        response = await handle_download({"paper_id": paper_id, "tier": "fast"})
+        assert json.loads(response[0].text)["tier"] == "fast"
+
+        response = await handle_download({"paper_id": paper_id, "tier": "full"})
+        status = json.loads(response[0].text)
+        assert status["status"] == "converting"
+        assert status["tier"] == "full"
+        await conversion_tasks[paper_id]
+
+        download_pdf.assert_not_called()
+        assert worker.call_args.kwargs["tier"] == "full"
+        response = await handle_download({"paper_id": paper_id, "check_status": True})
+        assert json.loads(response[0].text)["tier"] == "full"
+        assert md_path.read_text(encoding="utf-8") == "# Full text"
+    finally:
+        conversion_statuses.pop(paper_id, None)
+        for path in (md_path, pdf_path, meta_path):
+            path.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_source_first_download(mocker):
+    """Test that source-first mode converts the e-print without the PDF."""
+    paper_id = "2103.54324"
+
+    async def mock_fetch(paper_id, dest, timeout):
+        dest.write_bytes(b"\\documentclass{article}")
+        return True
+
+    async def mock_convert(input_path, md_path, **kwargs):
+        md_path.write_text("# From source", encoding="utf-8")
+
+    mocker.patch.object(download_module, "fetch_eprint", side_effect=mock_fetch)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+    worker = mocker.patch.object(
+        download_module, "convert_in_worker", side_effect=mock_convert
+    )
+    try:
+        response = await handle_download({"paper_id": paper_id, "prefer_source": True})
+        assert "LaTeX" in json.loads(response[0].text)["message"]
+        await conversion_tasks[paper_id]
+
+        download_pdf.assert_not_called()
+        assert worker.call_args.kwargs["source"] == "latex"
+        assert conversion_statuses[paper_id].status == "success"
+    finally:
+        conversion_statuses.pop(paper_id, None)
+        for suffix in (".md", ".src", ".meta.json"):
+            get_paper_path(paper_id, suffix).unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_source_first_falls_back_to_pdf(mocker):
+    """Test that a failed LaTeX conversion falls back to the PDF."""
+    from arxiv_mcp_server.worker import ConversionError
+
+    paper_id = "2103.54325"
+
+    async def mock_fetch(paper_id, dest, timeout):
+        dest.write_bytes(b"not really tex")
+        return True
+
+    async def mock_convert(input_path, md_path, source="pdf", **kwargs):
+        if source == "latex":
+            raise ConversionError("No TeX files found in e-print")
+        md_path.write_text("# From PDF", encoding="utf-8")
+
+    mocker.patch.object(download_module, "fetch_eprint", side_effect=mock_fetch)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    download_pdf = mocker.patch.object(
+        download_module, "download_pdf", return_value=1024
+    )
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=mock_convert)
+    try:
+        await handle_download({"paper_id": paper_id, "prefer_source": True})
+        await conversion_tasks[paper_id]
+
+        download_pdf.assert_called_once()
+        assert conversion_statuses[paper_id].status == "success"
+        assert get_paper_path(paper_id).read_text(encoding="utf-8") == "# From PDF"
+    finally:
+        conversion_statuses.pop(paper_id, None)
+        for suffix in (".md", ".src", ".meta.json"):
+            get_paper_path(paper_id, suffix).unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_compressed_storage(mocker, temp_storage_path):
+    """Test that converted papers are stored compressed and read back."""
+    from arxiv_mcp_server.storage import PaperStore
+    from arxiv_mcp_server.storage import store as store_module
+    from arxiv_mcp_server.tools import handle_read_paper
+
+    store = PaperStore(temp_storage_path, "gzip")
+    mocker.patch.object(store_module, "_default_store", store)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    paper_id = "2103.54326"
+
+    async def mock_download(paper_id, pdf_path, **kwargs):
+        pdf_path.write_bytes(b"%PDF-1.4 ... %%EOF")
+        return pdf_path.stat().st_size
+
+    async def mock_convert(pdf_path, md_path, **kwargs):
+        md_path.write_text("# Paper\n\n" + "Body text. " * 1000, encoding="utf-8")
+
+    mocker.patch.object(download_module, "download_pdf", side_effect=mock_download)
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=mock_convert)
+    try:
+        await handle_download({"paper_id": paper_id})
+        await conversion_tasks[paper_id]
+
+        assert sorted(p.name for p in temp_storage_path.glob(f"{paper_id}*")) == [
+            f"{paper_id}.md.gz",
+            f"{paper_id}.meta.json",
+            f"{paper_id}.pdf.gz",
+        ]
+        response = await handle_download({"paper_id": paper_id, "check_status": True})
+        size = json.loads(response[0].text)["size"]
+        assert size["disk_bytes"] < size["stored_bytes"] / 10
+
+        response = await handle_read_paper({"paper_id": paper_id})
+        assert json.loads(response[0].text)["content"].startswith("# Paper")
+    finally:
+        conversion_statuses.pop(paper_id, None)
+
+
+@pytest.mark.asyncio
+async def test_stored_versions_served_without_download(mocker):
+    """Test that requests for a stored version, or for no version, skip arXiv."""
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+    latest = mocker.patch("arxiv_mcp_server.catalog.latest_versions")
+    get_paper_path("2103.12345v2").write_text("# Version 2", encoding="utf-8")
+    default_store().refresh("2103.12345v2")
+
+    for requested in ("2103.12345", "2103.12345v2", "arXiv:2103.12345v2"):
+        response = await handle_download({"paper_id": requested})
+        status = json.loads(response[0].text)
+        assert status["message"] == "Paper already available"
+        assert status["paper_id"] == "2103.12345v2"
+
+    download_pdf.assert_not_called()
+    latest.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_latest_version_pinned_through_catalog(mocker):
+    """Test that a request without version downloads the latest version."""
+    from arxiv_mcp_server.identity import PaperId
+
+    mocker.patch(
+        "arxiv_mcp_server.catalog.latest_versions",
+        return_value={"hep-th/9901001": PaperId("hep-th/9901001", 3)},
+    )
+    download_pdf = mocker.patch.object(download_module, "download_pdf")
+
+    async def mock_convert(pdf_path, md_path, **kwargs):
+        md_path.write_text("# Old-style paper", encoding="utf-8")
+
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=mock_convert)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    try:
+        response = await handle_download({"paper_id": "hep-th/9901001"})
+        assert json.loads(response[0].text)["paper_id"] == "hep-th/9901001v3"
+        await conversion_tasks["hep-th_9901001v3"]
+
+        assert download_pdf.call_args.args[0] == "hep-th/9901001v3"
+        assert download_pdf.call_args.args[1].name == "hep-th_9901001v3.pdf"
+        response = await handle_download(
+            {"paper_id": "hep-th/9901001", "check_status": True}
+        )
+        assert json.loads(response[0].text)["status"] == "success"
+    finally:
+        conversion_statuses.pop("hep-th_9901001v3", None)
+
+
+async def _convert_in_pages(pdf_path, md_path, on_page=None, **kwargs):
+    for page in (1, 2):
+        await asyncio.sleep(0.05)
+        on_page(page, 2)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("# Test Paper\nConverted content")
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_ready_paper_with_progress(mocker):
+    """Test that a waiting call returns the converted paper, reporting progress."""
+    from arxiv_mcp_server.progress import current_progress
+
+    async def mock_download(paper_id, dest, on_progress=None, **kwargs):
+        on_progress(512_000, 1_024_000)
+        on_progress(1_024_000, 1_024_000)
+        dest.write_bytes(b"%PDF-1.4 %%EOF")
+        return 1024
+
+    mocker.patch.object(download_module, "download_pdf", side_effect=mock_download)
+    mocker.patch.object(download_module, "conversion_cache", None)
+    mocker.patch.object(
+        download_module, "convert_in_worker", side_effect=_convert_in_pages
+    )
+    notifications = []
+
+    async def notify(progress, total, message):
+        notifications.append((progress, message))
+
+    current_progress.set(notify)
+    try:
+        response = await handle_download({"paper_id": "2103.11111", "wait": True})
+    finally:
+        current_progress.set(None)
+
+    status = json.loads(response[0].text)
+    assert status["status"] == "success"
+    assert status["message"] == "Paper is ready"
+    messages = [message for _, message in notifications]
+    assert "Downloading PDF: 1.0 of 1.0 MB" in messages
+    assert "Converting page 1 of 2" in messages
+    progress = [progress for progress, _ in notifications]
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+    conversion_statuses.pop("2103.11111", None)
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_without_cancelling(mocker):
+    """Test that a wait that times out leaves the conversion running."""
+    paper_id = "2103.11112"
+    mocker.patch.object(download_module, "download_pdf", return_value=1024)
+    mocker.patch.object(download_module, "conversion_cache", None)
+
+    async def slow_convert(pdf_path, md_path, **kwargs):
+        await asyncio.sleep(60)
+
+    mocker.patch.object(download_module, "convert_in_worker", side_effect=slow_convert)
+
+    response = await handle_download(
+        {"paper_id": paper_id, "wait": True, "timeout": 0.1}
+    )
+
+    status = json.loads(response[0].text)
+    assert status["status"] == "converting"
+    assert "not ready" in status["message"]
+    task = conversion_tasks[paper_id]
+    assert not task.done()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    conversion_statuses.pop(paper_id, None)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_download_can_be_started_again(mocker):
+    """Test that a download cancelled by its deadline does not stay stuck."""
+    paper_id = "2103.11113v1"
+    mocker.patch.object(download_module, "conversion_cache", None)
+
+    async def hanging_download(paper_id, dest, **kwargs):
+        await asyncio.sleep(60)
+
+    mocker.patch.object(download_module, "download_pdf", side_effect=hanging_download)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(handle_download({"paper_id": paper_id}), 0.1)
+
+    assert conversion_statuses[paper_id].status == "cancelled"
+    assert not download_module.paper_locks().locked(paper_id)
+
+    mocker.patch.object(download_module, "download_pdf", return_value=1024)
+    mocker.patch.object(
+        download_module, "convert_in_worker", side_effect=_convert_in_pages
+    )
+    response = await handle_download({"paper_id": paper_id, "wait": True, "timeout": 5})
+
+    assert json.loads(response[0].text)["status"] == "success"
+    conversion_statuses.pop(paper_id, None)
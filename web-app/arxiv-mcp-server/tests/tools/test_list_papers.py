@@ -0,0 +1,20 @@
+"""Tests for the list_papers tool."""
+
+import json
+import pytest
+from arxiv_mcp_server.tools import handle_list_papers
+from arxiv_mcp_server.tools import list_papers as list_module
+
+
+@pytest.mark.asyncio
+async def test_list_papers_lists_the_local_store(paper_store, stored_paper, mocker):
+    """Test that only locally stored papers are listed and looked up."""
+    stored_paper("2103.12345v1")
+    paper_store.backend = mocker.Mock()
+    fetch_results = mocker.patch.object(list_module, "fetch_results", return_value=[])
+
+    response = json.loads((await handle_list_papers())[0].text)
+
+    assert response["total_papers"] == 1
+    fetch_results.assert_called_once_with(["2103.12345v1"])
+    paper_store.backend.list_keys.assert_not_called()
@@ -0,0 +1,36 @@
+"""Tests for the read_paper tool."""
+
+import json
+import pytest
+from arxiv_mcp_server.tools import handle_read_paper
+from arxiv_mcp_server.storage import store as store_module
+from arxiv_mcp_server.storage.store import PaperStore
+from arxiv_mcp_server.tools.list_papers import list_papers
+from arxiv_mcp_server.converters import REFERENCES_SUFFIX, split_references_file
+
+
+@pytest.mark.asyncio
+async def test_read_paper_with_split_references(temp_storage_path, mocker):
+    """Test that split references are only returned when asked for."""
+    mocker.patch.object(store_module, "_default_store", PaperStore(temp_storage_path))
+    md_path = temp_storage_path / "2103.12345.md"
+    md_path.write_text(
+        "# Paper\n\nBody.\n\n## References\n\n[1] A. Author. 2020.\n",
+        encoding="utf-8",
+    )
+    split_references_file(md_path)
+    assert list_papers() == ["2103.12345"]
+
+    response = json.loads((await handle_read_paper({"paper_id": "2103.12345"}))[0].text)
+    assert response["references_stored_separately"] is True
+    assert "A. Author" not in response["content"]
+
+    response = json.loads(
+        (
+            await handle_read_paper(
+                {"paper_id": "2103.12345", "include_references": True}
+            )
+        )[0].text
+    )
+    assert "[1] A. Author. 2020." in response["content"]
+    assert (temp_storage_path / f"2103.12345{REFERENCES_SUFFIX}").exists()
@@ -187,3 +187,45 @@ async def test_search_no_query_optimization(mock_client):
     bool_query = "machine learning AND deep learning"
     optimized = _optimize_query(bool_query)
     assert optimized == bool_query
+
+
+@pytest.mark.asyncio
+async def test_search_streams_result_batches(mock_client, mock_paper, mocker):
+    """Test that a streamed search sends its results in batches as they arrive."""
+    from arxiv_mcp_server.progress import current_progress
+    from arxiv_mcp_server.tools import search as search_module
+
+    mock_client.results.return_value = [mock_paper] * 25
+    mocker.patch.object(search_module.settings, "STREAM_BATCH_SIZE", 10)
+    notifications = []
+
+    async def notify(progress, total, message):
+        notifications.append((progress, total, json.loads(message)))
+
+    current_progress.set(notify)
+    try:
+        with patch("arxiv.Client", return_value=mock_client):
+            result = await handle_search(
+                {"query": "test", "max_results": 25, "stream": True}
+            )
+    finally:
+        current_progress.set(None)
+
+    assert [progress for progress, _, _ in notifications] == [10, 20, 25]
+    assert [len(batch["papers"]) for _, _, batch in notifications] == [10, 10, 5]
+    assert notifications[0][2]["papers"][0]["abstract"]
+    content = json.loads(result[0].text)
+    assert content["streamed"] is True
+    assert content["total_results"] == 25
+    assert content["papers"][0] == {"id": "2103.12345", "title": "Test Paper"}
+
+
+@pytest.mark.asyncio
+async def test_search_without_progress_token_is_not_streamed(mock_client):
+    """Test that streaming needs a client listening for progress."""
+    with patch("arxiv.Client", return_value=mock_client):
+        result = await handle_search({"query": "test", "stream": True})
+
+    content = json.loads(result[0].text)
+    assert "streamed" not in content
+    assert "abstract" in content["papers"][0]